@@ -5,63 +5,129 @@ Purpose:
     - Initializes the application
     - Configures the menu
     - Starts the main program loop
+    - Runs single commands without the menu (see core/commands.py)
+
+Modules are imported inside the functions that need them: the commands do not
+pay for rich and the menu, the menu does not pay for the templates and findler.
+`python __main__.py --profile-startup` prints where the startup time goes.
 """
 
 # Regular imports
-from rich.console import Console
-from core.menu import Menu
+import sys
+import time
+from typing import Any, Callable
 
-from core.utilits.opener_json import open_json
-from core.utilits.cleaner import clean
-from core.utilits.installer import install
-from core.utilits.error_catcher import error_print
+START = time.perf_counter()  # Time-to-first-menu is measured from here
 
-# The logic for connecting user modules
 from core import loader
-if loader.ALLOWED_MODULES.get("actions", False):
-    from user.actions import MyCLI
-    cli = MyCLI()
-else:
-    from core.lib.actions import CLI
-    cli = CLI()
+from core.utilits.startup_profiler import StartupProfiler
 
-if loader.ALLOWED_MODULES.get("prompts", False):
-    from user import prompts as p
-else:
-    from core.lib.prompts import prompts_menu as p
+PROFILE_FLAG = "--profile-startup"
 
 
 ###-$ BOTTOM UP $-###
 
 
-def welcome() -> None:
+def create_cli():
+    """Creates MyCLI from the "user" directory if it exists, otherwise CLI."""
+    if loader.ALLOWED_MODULES.get("actions", False):
+        from user.actions import MyCLI
+        return MyCLI()
+    from core.lib.actions import CLI
+    return CLI()
+
+
+def welcome(profiler: StartupProfiler | None = None) -> None:
     """Clears and colors the terminal. Displays the program title."""
+    profiler = profiler or StartupProfiler()
+    from core.utilits.cleaner import clean
+    from core.utilits.installer import install
+
+    install()  # Before clean(): on old Windows consoles it enables the ANSI sequences
     clean()
-    install()
+    with profiler.phase("import rich"):
+        from rich.console import Console
+    with profiler.phase("import prompts"):
+        # The logic for connecting user modules
+        if loader.ALLOWED_MODULES.get("prompts", False):
+            from user import prompts as p
+        else:
+            from core.lib.prompts import prompts_menu as p
+    with profiler.phase("render welcome"):
+        console = Console()
+        welcome = p.UserPrompts()
+        console.print(welcome.welcome)
+
+
+def watch_configs(menu: Any, cli: Any, pm: Any) -> Callable[[], None]:
+    """Returns a function that applies the edited menu.json, actions.json and colors.json to the running menu."""
+    from rich.console import Console
+    from core.lib.prompts import prompts_system as ps
+    from core.menu import bind_actions
+    from core.utilits.config_watcher import ConfigWatcher
+
     console = Console()
-    welcome = p.UserPrompts()
-    console.print(welcome.welcome)
+    watcher = ConfigWatcher(
+        {"actions": pm.actions_path, "colors": pm.color_path, "menu": pm.menu_path}
+    )
 
+    def apply_changes() -> None:
+        for name in sorted(watcher.changed()):  # The actions before the menu that uses them
+            try:
+                if name == "actions":
+                    menu.reload(actions=bind_actions(cli, pm.get_actions()))
+                elif name == "colors":
+                    menu.reload(colors=True)
+                else:
+                    menu.reload(structure=pm.get_menu())
+            except (ValueError, OSError) as e:  # MenuConfigError, JSONDecodeError
+                # The previous settings keep working until the file is fixed
+                from core.utilits.error_catcher import error_print
+                error_print(e)
+            else:
+                console.print(ps.PromptsMenu.reloaded, f"({name}.json)")
 
-def set_menu_cli(menu_name: str) -> None:
+    return apply_changes
+
+
+def set_menu_cli(menu_name: str, profiler: StartupProfiler | None = None) -> None:
     """Sets the menu - settings, structure and functions"""
-    actions_config: dict[str, str] = open_json(cli.actions_path)
-    ACTIONS = {
-        key: getattr(cli, method_name) for key, method_name in actions_config.items()
-    }
+    profiler = profiler or StartupProfiler()
+    with profiler.phase("import menu"):
+        from core.menu import Menu, MenuConfigError
+        from core.lib.path_manager import PathManager
+    with profiler.phase("init cli"):
+        cli = create_cli()
+    with profiler.phase("load menu configs"):
+        pm = PathManager.shared()
+        try:
+            # Every broken item is reported here, before the menu is drawn
+            menu = Menu.from_config(menu_name, pm.get_menu(), cli, pm.get_actions())
+        except MenuConfigError as e:
+            from core.utilits.error_catcher import error_print
+            error_print(e)
+            return
+    menu.start(on_ready=profiler.report, on_iteration=watch_configs(menu, cli, pm))
+
 
-    menu_structure = open_json(cli.menu_path)
-    menu = Menu(menu_name, menu_structure, ACTIONS)
-    menu.start()
+def main(argv: list[str] | None = None) -> None:
+    """Entry point into the program
 
+    With arguments runs one command and exits, without them starts the menu.
+    """
+    argv = sys.argv[1:] if argv is None else argv
+    profiler = StartupProfiler(enabled=PROFILE_FLAG in argv, start=START)
+    argv = [arg for arg in argv if arg != PROFILE_FLAG]
+    if argv:
+        from core import commands
+        sys.exit(commands.run(argv, create_cli))
 
-def main() -> None:
-    """Entry point into the program"""
     menu_name = "МЕНЮ"
-    welcome()
+    welcome(profiler)
     try:
-        set_menu_cli(menu_name)
+        set_menu_cli(menu_name, profiler)
     except AttributeError as e:
+        from core.utilits.error_catcher import error_print
         error_print(e)
 
 if __name__ == "__main__":
@@ -0,0 +1,141 @@
+"""
+Compares the dictionary loading with the old readlines()/split() parser.
+
+    python benchmarks/dictionary_load.py [WORDS]
+
+A dictionary of WORDS random words (50 000 by default) is written to a
+temporary file in the save_to_md format and loaded three ways: by the old
+parser, by parse_md alone, and by Dictionary.load_from_md, which also pauses
+the cyclic garbage collector while the words are created. The parsers
+themselves run at about the same speed; most of the gain is the collector,
+which otherwise walks over all the loaded words again and again.
+"""
+
+import os
+import random
+import string
+import sys
+import tempfile
+import time
+import tracemalloc
+from io import StringIO
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from rich.console import Console
+
+from core.lib.dictionary import Dictionary, Word, parse_md
+
+LANGS = ("en", "de", "fr", "es")
+CYRILLIC = "абвгдежзийклмнопрстуфхцчшщъыьэюя"
+
+
+def legacy_load(filename: str) -> dict[str, Word]:
+    """The parser that Dictionary.load_from_md used before, kept as is for the comparison."""
+    words: dict[str, Word] = {}
+    with open(filename, "r", encoding="utf-8") as f:
+        lines = f.readlines()
+
+    word: Word | None = None
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        if line.startswith("Слово:"):
+            base = line[len("Слово:"):].strip()
+            if base:
+                word = Word(base)
+                words[base] = word
+            else:
+                word = None
+        elif word and line.startswith(">**") and "**:" in line and "`[" in line:
+            try:
+                lang = line.split("**")[1].split(":")[0].strip()
+                translation = line.split("*")[1].strip()
+                transcription = line.split("`[")[1].split("]`")[0].strip()
+                word.add_translation(lang, translation)
+                word.add_transcription(lang, transcription)
+            except IndexError:
+                continue
+        elif word and line.startswith("> - "):
+            word.add_context(line[4:].strip())
+    return words
+
+
+def make_dictionary(path: str, count: int) -> None:
+    rng = random.Random(42)
+
+    def text(alphabet: str, low: int, high: int) -> str:
+        return "".join(rng.choice(alphabet) for _ in range(rng.randint(low, high)))
+
+    with open(path, "w", encoding="utf-8") as f:
+        for number in range(count):
+            word = Word(f"{text(CYRILLIC, 3, 10)}{number}")
+            for lang in rng.sample(LANGS, rng.randint(1, 3)):
+                word.add_translation(lang, text(string.ascii_lowercase, 3, 10))
+                word.add_transcription(lang, text(string.ascii_lowercase, 3, 10))
+            for _ in range(rng.randint(0, 2)):
+                word.add_context(" ".join(text(CYRILLIC, 2, 8) for _ in range(6)))
+            f.write(word.__str__(show_context=True) + "\n\n")
+
+
+def best_of(runs: int, function, *args):
+    best = float("inf")
+    result = None
+    for _ in range(runs):
+        result = None  # The previous result would slow down the garbage collector
+        start = time.perf_counter()
+        result = function(*args)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def peak_memory(function, *args) -> float:
+    """The peak of the memory allocated by the call, in MB."""
+    tracemalloc.start()
+    try:
+        function(*args)
+        return tracemalloc.get_traced_memory()[1] / 1024**2
+    finally:
+        tracemalloc.stop()
+
+
+def parse_only(path: str) -> dict[str, Word]:
+    with open(path, "r", encoding="utf-8") as f:
+        return {word.base: word for word in parse_md(f)}
+
+
+def load_streaming(path: str) -> Dictionary:
+    dictionary = Dictionary()
+    dictionary.console = Console(file=StringIO())
+    dictionary.load_from_md(path)
+    return dictionary
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "dictionary.md")
+        make_dictionary(path, count)
+        size = os.path.getsize(path) / 1024**2
+
+        legacy_time, legacy_words = best_of(3, legacy_load, path)
+        parse_time, _ = best_of(3, parse_only, path)
+        streaming_time, dictionary = best_of(3, load_streaming, path)
+        legacy_peak = peak_memory(legacy_load, path)
+        streaming_peak = peak_memory(load_streaming, path)
+
+    lost = sum(
+        1 for word in legacy_words.values()
+        if word.translations != dictionary.words[word.base].translations
+    )
+    print(f"{count} words, {size:.1f} MB")
+    print(f"legacy    {legacy_time:.3f} s, peak {legacy_peak:.1f} MB")
+    print(f"parse_md  {parse_time:.3f} s  ({legacy_time / parse_time:.1f}x)")
+    print(f"load      {streaming_time:.3f} s, peak {streaming_peak:.1f} MB  ({legacy_time / streaming_time:.1f}x)")
+    print(f"words with different translations: {lost} (the legacy parser loses them)")
+    print(f"unparsed lines: {len(dictionary.load_issues)}")
+
+
+if __name__ == "__main__":
+    main()
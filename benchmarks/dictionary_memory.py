@@ -0,0 +1,88 @@
+"""
+Measures the memory the loaded words take, with tracemalloc.
+
+    python benchmarks/dictionary_memory.py [WORDS]
+
+A dictionary of WORDS random words (150 000 by default) is loaded twice:
+into the current `Word` and into `DictWord`, a copy of the `Word` without
+__slots__ and with a separate language string in every entry, as the
+dictionary kept them before.
+"""
+
+import gc
+import os
+import sys
+import tempfile
+import tracemalloc
+from typing import Callable
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.lib.dictionary import Word, parse_md
+from dictionary_load import make_dictionary
+
+
+class DictWord:
+    """The Word as it was: a __dict__ per instance."""
+
+    def __init__(self, base: str) -> None:
+        self.base = base
+        self.translations: dict[str, str] = {}
+        self.transcriptions: dict[str, str] = {}
+        self.contexts: list[str] = []
+
+
+def _fresh(text: str) -> str:
+    """A new string object equal to the text, as the old parser created one per line."""
+    return "".join(list(text)) if len(text) > 1 else text
+
+
+def load_current(path: str) -> dict[str, Word]:
+    with open(path, "r", encoding="utf-8") as f:
+        return {word.base: word for word in parse_md(f)}
+
+
+def load_before(path: str) -> dict[str, DictWord]:
+    words: dict[str, DictWord] = {}
+    with open(path, "r", encoding="utf-8") as f:
+        for word in parse_md(f):
+            old = DictWord(word.base)
+            for lang in word.translations.keys() | word.transcriptions.keys():
+                key = _fresh(lang)  # One object per translation line, shared by both dicts
+                if lang in word.translations:
+                    old.translations[key] = word.translations[lang]
+                if lang in word.transcriptions:
+                    old.transcriptions[key] = word.transcriptions[lang]
+            old.contexts = word.contexts
+            words[old.base] = old
+    return words
+
+
+def retained_memory(load: Callable[[str], dict], path: str) -> tuple[float, int]:
+    """The memory still allocated after the load, in MB, and the number of words."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        words = load(path)
+        gc.collect()
+        return tracemalloc.get_traced_memory()[0] / 1024**2, len(words)
+    finally:
+        tracemalloc.stop()
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 150_000
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "dictionary.md")
+        make_dictionary(path, count)
+        size = os.path.getsize(path) / 1024**2
+        before, _ = retained_memory(load_before, path)
+        after, loaded = retained_memory(load_current, path)
+
+    print(f"{loaded} words, {size:.1f} MB file")
+    print(f"before  {before:.1f} MB ({before * 1024**2 / loaded:.0f} bytes per word)")
+    print(f"after   {after:.1f} MB ({after * 1024**2 / loaded:.0f} bytes per word)  -{(1 - after / before) * 100:.0f}%")
+
+
+if __name__ == "__main__":
+    main()
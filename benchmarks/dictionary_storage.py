@@ -0,0 +1,59 @@
+"""
+Compares the markdown and the SQLite storage of the dictionary.
+
+    python benchmarks/dictionary_storage.py [WORDS]
+
+The same generated dictionary (50 000 words by default) is opened from a
+markdown file and from an SQLite database, then one word is edited and saved.
+"""
+
+import os
+import sys
+import tempfile
+import time
+from io import StringIO
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from rich.console import Console
+
+from core.lib.dictionary import Dictionary
+from dictionary_load import best_of, make_dictionary
+
+
+def open_quiet(path: str) -> Dictionary:
+    dictionary = Dictionary()
+    dictionary.console = Console(file=StringIO())
+    dictionary.open(path)
+    return dictionary
+
+
+def edit_and_save(dictionary: Dictionary, number: int) -> float:
+    base = next(iter(dictionary.words))
+    start = time.perf_counter()
+    dictionary.edit_word(base, translation=("en", f"edited{number}"))
+    dictionary.save()
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    with tempfile.TemporaryDirectory() as directory:
+        markdown = os.path.join(directory, "dictionary.md")
+        database = os.path.join(directory, "dictionary.db")
+        make_dictionary(markdown, count)
+        importer = open_quiet(database)
+        importer.import_md(markdown)
+        importer.close()
+
+        print(f"{count} words")
+        for name, path in (("markdown", markdown), ("sqlite", database)):
+            load_time, dictionary = best_of(3, open_quiet, path)
+            save_time = min(edit_and_save(dictionary, number) for number in range(5))
+            dictionary.close()
+            size = os.path.getsize(path) / 1024**2
+            print(f"{name:9} open {load_time:.3f} s, one edit saved in {save_time * 1000:.1f} ms, file {size:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,243 @@
+"""
+A module containing the non-interactive command line interface.
+
+The subcommands call the same `CLI` methods as the menu, but take the data
+from the arguments instead of asking for it. Nothing is cleared or printed
+before the command runs, so the program can be used from cron or shell loops.
+
+Examples:
+    python __main__.py create-topic --title "Генераторы" --tags python iterators
+    python __main__.py create-law --title "Гражданский кодекс" --year 1994 --law-type civil
+    python __main__.py create-bulk laws.csv --type law --workers 8
+    python __main__.py find --pattern "*.log size>100M" --top 100 --format csv --output logs.csv
+    python __main__.py rebuild-index
+    python __main__.py dict add --word кошка --translation en=cat --transcription en=kæt
+    python __main__.py dict find кошка
+    python __main__.py dict remove кошка
+    python __main__.py dict --file Storage/Dictionary/dictionary.db import dictionary.md
+    python __main__.py dict --file Storage/Dictionary/dictionary.db export dictionary.md
+"""
+
+import argparse
+import sys
+from typing import Any, Callable
+
+UNITS = {"KB": 1, "MB": 2, "GB": 3}
+
+CliFactory = Callable[[], Any]  # Returns CLI or the user's MyCLI
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Describes all subcommands and their arguments."""
+    parser = argparse.ArgumentParser(
+        prog="prometheus",
+        description="Runs Prometheus actions without the interactive menu.",
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    topic = subparsers.add_parser("create-topic", help="create a programming topic note")
+    topic.add_argument("--title", required=True)
+    topic.add_argument("--tags", nargs="*", default=None)
+    topic.add_argument("--path", help="directory or .md file, defaults to config.json")
+    topic.set_defaults(handler=_create_topic)
+
+    law = subparsers.add_parser("create-law", help="create a law note")
+    law.add_argument("--title", required=True)
+    law.add_argument("--tags", nargs="*", default=None)
+    law.add_argument("--path", help="directory or .md file, defaults to config.json")
+    law.add_argument("--doc-number")
+    law.add_argument("--short-name")
+    law.add_argument("--year")
+    law.add_argument("--law-type")
+    law.set_defaults(handler=_create_law)
+
+    bulk = subparsers.add_parser("create-bulk", help="create notes from a CSV, JSON or JSONL manifest")
+    bulk.add_argument("manifest")
+    bulk.add_argument("--type", default="topic", help="template of the rows without a type column")
+    bulk.add_argument("--workers", type=int, help="number of threads writing the files")
+    bulk.add_argument("--overwrite", action="store_true", help="replace the existing notes")
+    bulk.set_defaults(handler=_create_bulk)
+
+    find = subparsers.add_parser("find", help="search files and save them by size")
+    find.add_argument("--pattern", default="README", help='findler query, e.g. "*.py size>1M"')
+    find.add_argument("--top", type=int, default=0, help="keep only the N largest files")
+    find.add_argument("--unit", choices=UNITS, default="KB", help="size unit of the txt format")
+    find.add_argument("--output", help="output file, defaults to config.json")
+    find.add_argument("--format", help="txt, csv, jsonl or columnar, defaults to config.json")
+    find.add_argument("--no-index", action="store_true", help="walk the disk instead of the index")
+    find.set_defaults(handler=_find)
+
+    index = subparsers.add_parser("rebuild-index", help="rebuild the findler file index")
+    index.set_defaults(handler=_rebuild_index)
+
+    dictionary = subparsers.add_parser("dict", help="work with the dictionary")
+    dictionary.add_argument("--file", help="dictionary file: .md, .db or .sqlite, defaults to config.json")
+    dict_commands = dictionary.add_subparsers(dest="dict_command", required=True)
+
+    add = dict_commands.add_parser("add", help="add a word")
+    add.add_argument("--word", required=True)
+    add.add_argument("--translation", action="append", default=[], metavar="LANG=WORD")
+    add.add_argument("--transcription", action="append", default=[], metavar="LANG=TEXT")
+    add.add_argument("--context", action="append", default=[])
+    add.set_defaults(handler=_dict_add)
+
+    find_word = dict_commands.add_parser("find", help="find a word or its translation")
+    find_word.add_argument("query")
+    find_word.set_defaults(handler=_dict_find)
+
+    remove = dict_commands.add_parser("remove", help="remove a word")
+    remove.add_argument("word")
+    remove.set_defaults(handler=_dict_remove)
+
+    import_md = dict_commands.add_parser("import", help="add the words of a markdown file to the dictionary")
+    import_md.add_argument("markdown")
+    import_md.set_defaults(handler=_dict_import)
+
+    export_md = dict_commands.add_parser("export", help="write the dictionary to a markdown file")
+    export_md.add_argument("markdown")
+    export_md.set_defaults(handler=_dict_export)
+
+    return parser
+
+
+def run(argv: list[str], cli_factory: CliFactory) -> int:
+    """Parses the arguments and runs the command.
+
+    Args:
+        argv (list[str]): Command line arguments without the program name.
+        cli_factory (CliFactory): Creates the CLI object. Called only by the commands that need it.
+
+    Returns:
+        int: Exit code. 0 - success.
+    """
+    args = build_parser().parse_args(argv)
+    try:
+        return args.handler(cli_factory, args) or 0
+    except (ValueError, KeyError, OSError) as e:
+        print(f"{args.command}: {e}", file=sys.stderr)
+        return 1
+
+
+def _create_topic(cli_factory: CliFactory, args: argparse.Namespace) -> int:
+    cli_factory().create_topic(title=args.title, tags=args.tags, path=args.path)
+    return 0
+
+
+def _create_law(cli_factory: CliFactory, args: argparse.Namespace) -> int:
+    cli_factory().law_topic(
+        title=args.title,
+        tags=args.tags,
+        path=args.path,
+        doc_number=args.doc_number,
+        short_name=args.short_name,
+        year=args.year,
+        law_type=args.law_type,
+    )
+    return 0
+
+
+def _create_bulk(cli_factory: CliFactory, args: argparse.Namespace) -> int:
+    results = cli_factory().create_from_manifest(
+        args.manifest,
+        default_type=args.type,
+        workers=args.workers,
+        overwrite=args.overwrite,
+    )
+    failed = 0
+    for result in results:
+        if result.ok:
+            print(f"OK    {result.line}: {result.path}")
+        else:
+            failed += 1
+            print(f"FAIL  {result.line}: {result.title or '-'}: {result.error}", file=sys.stderr)
+    print(f"{len(results) - failed} created, {failed} failed")
+    return 1 if failed else 0
+
+
+def _find(cli_factory: CliFactory, args: argparse.Namespace) -> int:
+    cli_factory().find_file(
+        args.pattern,
+        top=args.top,
+        unit=UNITS[args.unit],
+        output_file=args.output,
+        output_format=args.format,
+        use_index=not args.no_index,
+    )
+    return 0
+
+
+def _rebuild_index(cli_factory: CliFactory, args: argparse.Namespace) -> int:
+    cli_factory().rebuild_file_index()
+    return 0
+
+
+def _split_pairs(values: list[str], option: str) -> list[tuple[str, str]]:
+    """Turns ["en=cat"] into [("en", "cat")]."""
+    pairs = []
+    for value in values:
+        lang, sep, text = value.partition("=")
+        if not sep or not lang.strip() or not text.strip():
+            raise ValueError(f"{option} must look like LANG=TEXT, got {value!r}")
+        pairs.append((lang.strip(), text.strip()))
+    return pairs
+
+
+def _open_dictionary(args: argparse.Namespace) -> Any:
+    """Opens the dictionary file. The module is imported only for dict commands."""
+    from core.lib.dictionary import Dictionary
+    from core.lib.path_manager import PathManager
+
+    dictionary = Dictionary()
+    dictionary.open(args.file or PathManager.shared().get_dictionary_path())
+    return dictionary
+
+
+def _dict_add(cli_factory: CliFactory, args: argparse.Namespace) -> int:
+    from core.lib.dictionary import Word
+
+    word = Word(args.word.strip())
+    for lang, translation in _split_pairs(args.translation, "--translation"):
+        word.add_translation(lang, translation)
+    for lang, transcription in _split_pairs(args.transcription, "--transcription"):
+        word.add_transcription(lang, transcription)
+    for context in args.context:
+        word.add_context(context)
+
+    dictionary = _open_dictionary(args)
+    if dictionary.word_exists(word):
+        dictionary.add_word(word)  # Prints that the word already exists
+        return 1
+    dictionary.add_word(word)
+    dictionary.save()
+    return 0
+
+
+def _dict_find(cli_factory: CliFactory, args: argparse.Namespace) -> int:
+    dictionary = _open_dictionary(args)
+    exact = dictionary.find_exact(args.query)
+    words = [exact] if exact else dictionary.find(args.query)
+    for word in words:
+        print(word.__str__(show_context=True))
+    return 0 if words else 1
+
+
+def _dict_remove(cli_factory: CliFactory, args: argparse.Namespace) -> int:
+    dictionary = _open_dictionary(args)
+    if not dictionary.remove_word(args.word):
+        return 1
+    dictionary.save()
+    return 0
+
+
+def _dict_import(cli_factory: CliFactory, args: argparse.Namespace) -> int:
+    dictionary = _open_dictionary(args)
+    count = dictionary.import_md(args.markdown)
+    dictionary.save()
+    print(f"{count} words imported from {args.markdown}")
+    return 0
+
+
+def _dict_export(cli_factory: CliFactory, args: argparse.Namespace) -> int:
+    dictionary = _open_dictionary(args)
+    dictionary.save_to_md(args.markdown, show_context=True)
+    return 0
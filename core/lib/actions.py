@@ -3,12 +3,18 @@
 A module that stores the main functions of the entire program.
 """
 
+from typing import TYPE_CHECKING, Any
+
 from core.lib.path_manager import PathManager
 from core.lib.prompts.prompts_system import Prompts, PromptsLaw
-from core.lib.templates.templates import *
-from core.lib.system_apps.findler import findler
-from core.lib.support_actions.settings_actions import SettingsActions
-from core.lib.support_actions.browser_actions import BrowserActions
+
+# The heavy modules (templates, helpers, findler) are imported on first use,
+# so that the menu appears without waiting for them.
+if TYPE_CHECKING:
+    from core.lib.templates.bulk import BulkResult
+    from core.lib.templates.templates import TemplatesHandler
+    from core.lib.support_actions.settings_actions import SettingsActions
+    from core.lib.support_actions.browser_actions import BrowserActions
 
 
 class CLI:
@@ -18,32 +24,97 @@ class CLI:
     Inherit from this class in the "custom" module "actions.py ".
 
     `templates` is a field that supports the functionality of templates.
+    It is created when it is used for the first time.
     """
 
     def __init__(self) -> None:
-        __pm = PathManager()
+        __pm = PathManager.shared()
         self.menu_path = __pm.menu_path
         self.actions_path = __pm.actions_path
 
-        self.__ba = BrowserActions()
-        self.__sa = SettingsActions()
-        self.templates = TemplatesHandler()
+        self.__browser_actions: "BrowserActions | None" = None
+        self.__settings_actions: "SettingsActions | None" = None
+        self.__templates: "TemplatesHandler | None" = None
+
+    @property
+    def templates(self) -> "TemplatesHandler":
+        """Supports the functionality of templates."""
+        if self.__templates is None:
+            from core.lib.templates.templates import TemplatesHandler
+
+            self.__templates = TemplatesHandler()
+        return self.__templates
+
+    @property
+    def __ba(self) -> "BrowserActions":
+        if self.__browser_actions is None:
+            from core.lib.support_actions.browser_actions import BrowserActions
+
+            self.__browser_actions = BrowserActions()
+        return self.__browser_actions
+
+    @property
+    def __sa(self) -> "SettingsActions":
+        if self.__settings_actions is None:
+            from core.lib.support_actions.settings_actions import SettingsActions
+
+            self.__settings_actions = SettingsActions()
+        return self.__settings_actions
 
     ###########################################################
     ###_________________Templates methods___________________###
     ###########################################################
-    def create_topic(self) -> None:
-        """Creates a template for programming topics (python)"""
+    def create_topic(
+        self,
+        title: str | None = None,
+        tags: list[str] | None = None,
+        path: str | None = None,
+    ) -> None:
+        """Creates a template for programming topics (python)
+
+        Without `title` the data is requested interactively.
+        """
+        from core.lib.templates.patterns import Topic
+
+        if title is not None:
+            self.templates.build_item(
+                cls=Topic, path_key="topic", title=title, tags=tags, path=path
+            )
+            return
         self.templates.create_item(
             cls=Topic, title_prompt=Prompts.theme, path_key="topic"
         )
 
     def look_topic(self) -> None:
         """Shows a list of created programming templates (python)"""
+        from core.lib.templates.patterns import Topic
+
         self.templates.look_item(cls=Topic, path_key="topic")
 
-    def law_topic(self) -> None:
-        """Creates templates on "law" (About the documents)."""
+    def law_topic(
+        self,
+        title: str | None = None,
+        tags: list[str] | None = None,
+        path: str | None = None,
+        **extra_arguments: str | None,
+    ) -> None:
+        """Creates templates on "law" (About the documents).
+
+        Without `title` the data is requested interactively.
+        `extra_arguments` are doc_number, short_name, year and law_type.
+        """
+        from core.lib.templates.patterns import LawTopic
+
+        if title is not None:
+            self.templates.build_item(
+                cls=LawTopic,
+                path_key="law",
+                title=title,
+                tags=tags,
+                path=path,
+                **extra_arguments,
+            )
+            return
         extra = [
             ("doc_number", PromptsLaw.doc_number),
             ("short_name", PromptsLaw.short_name),
@@ -59,8 +130,26 @@ class CLI:
 
     def look_law(self) -> None:
         """Shows a list of created law templates"""
+        from core.lib.templates.patterns import LawTopic
+
         self.templates.look_item(cls=LawTopic, path_key="law")
 
+    def create_from_manifest(self, manifest: str, **options: Any) -> list["BulkResult"]:
+        """Creates many notes at once from a CSV, JSON or JSONL manifest
+
+        `options` are passed to `TemplatesHandler.create_from_manifest` (default_type, workers, overwrite).
+        To use your own template in the manifests, call `bulk.register_template` before this method.
+        """
+        return self.templates.create_from_manifest(manifest, **options)
+
+    def search_notes(self) -> None:
+        """Full-text search over all the notes"""
+        self.templates.search_notes()
+
+    def search_tags(self) -> None:
+        """Search for the notes by tags (#python AND #async NOT #draft)"""
+        self.templates.search_tags()
+
     ###########################################################
     ###___________________Browser methods___________________###
     ###########################################################
@@ -81,9 +170,24 @@ class CLI:
     ###########################################################
     ###____________________System methods___________________###
     ###########################################################
-    def find_file(self) -> None:
-        """Search for files (README) and save by size"""
+    def find_file(self, pattern: str | None = None, **options: Any) -> int | None:
+        """Search for files (README) and save by size
+
+        Without `pattern` the search is interactive.
+        `options` are passed to `findler.find` (top, unit, output_file, output_format, use_index).
+        """
+        from core.lib.system_apps.findler import find, findler
+
+        if pattern is not None:
+            return find(pattern, **options)
         findler()
+        return None
+
+    def rebuild_file_index(self) -> None:
+        """Rebuilds the findler file index from scratch"""
+        from core.lib.system_apps.findler import rebuild_index
+
+        rebuild_index()
 
     ###########################################################
     ###_______________Configuration methods_________________###
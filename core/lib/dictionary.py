@@ -11,16 +11,30 @@
 
 Этот модуль можно использовать интерактивно через основную программу или "напрямую", работая с классами, приведенными в модуле.
 """
+import gc
 import os
-from typing import Dict, List, Optional, Any
+import re
+import threading
+from contextlib import contextmanager
+from sys import intern
+from typing import TYPE_CHECKING, Dict, Iterator, List, NamedTuple, Optional, TextIO, Any
 
 from rich.console import Console
 from rich.text import Text
 from rich.markdown import Markdown
 
 from core.lib.prompts import Prompts, PromptsDict, support_color
+from core.lib.dictionary_index import WordIndex
+from core.utilits.atomic_write import atomic_write
+
+if TYPE_CHECKING:
+    from core.lib.dictionary_journal import DictionaryJournal
+    from core.lib.dictionary_storage import DictionaryStorage
 
 class Word:
+    # Без __dict__ у каждого слова: в словаре на сотни тысяч слов это заметная часть памяти
+    __slots__ = ("base", "translations", "transcriptions", "contexts")
+
     def __init__(self, base: str) -> None:
         """Создает объект с основным словом, переводами, транскрипцией и контекстом"""
         self.base = base  # Поле с основным словом. То есть на русском, если родной русский
@@ -30,11 +44,12 @@ class Word:
 
     def add_translation(self, lang: str, word: str) -> None:
         """Добавить перевод в словарь. Язык - ключ, значение - перевод"""
-        self.translations[lang] = word
+        # Коды языков повторяются в каждом слове, intern хранит одну строку "en" на весь словарь
+        self.translations[intern(lang)] = word
 
     def add_transcription(self, lang: str, transcription: str) -> None:
         """Добавить транскрипцию в словарь. Язык - ключ, значение - транскрипция"""
-        self.transcriptions[lang] = transcription
+        self.transcriptions[intern(lang)] = transcription
     
     def add_context(self, sentence: str) -> None:
         """Добавить транскрипцию в список. Просто добавляем аргумент в список"""
@@ -82,50 +97,341 @@ class Word:
         return "\n".join(lines)
 
 
+# Строки формата, который пишет save_to_md (см. Word.__str__)
+WORD_PREFIX = "Слово:"
+CONTEXT_TITLE = ">**Контекст**:"
+EMPTY_CONTEXT = "> -"
+MISSING = "-"  # Так __str__ показывает отсутствующий перевод или транскрипцию
+# Одна непустая строка файла, группы:
+# 1 - слово; 2, 3, 4 - язык, перевод и транскрипция; 5 - контекст; 6 - любая другая строка.
+# Перевод может содержать звёздочки, поэтому он берётся до последней "* `[".
+LINE = re.compile(
+    r"^[ \t]*(?:"
+    r"Слово:[ \t]*(\S[^\n]*)"
+    r"|>\*\*([^*\n]+)\*\*:[ \t]*\*(.*)\*[ \t]*`\[(.*)\]`[ \t]*$"
+    r"|> - ([^\n]*)"
+    r"|(\S[^\n]*)"
+    r")",
+    re.MULTILINE,
+)
+BLOCK_SIZE = 1 << 20  # Сколько символов читать из файла за раз
+
+
+class ParseIssue(NamedTuple):
+    """Строка файла словаря, которую не удалось разобрать"""
+
+    line: int  # Номер строки, с 1
+    text: str
+    reason: str
+
+
+def parse_md(f: TextIO, issues: Optional[List[ParseIssue]] = None) -> Iterator[Word]:
+    """Разбирает словарь в формате save_to_md за один проход и отдаёт слова по одному.
+
+    Файл читается блоками, строки блока разбираются одним регулярным выражением (findall),
+    так что весь файл в памяти не держится.
+
+    Args:
+        f (TextIO): Открытый файл (или io.StringIO).
+        issues (Optional[List[ParseIssue]], optional): Сюда добавляются строки, которые не удалось разобрать.
+
+    Yields:
+        Word: Слово, как только прочитаны все его строки.
+    """
+    word: Optional[Word] = None
+    in_bad_word = False  # Строки слова без названия не разбираем, о нём уже сообщили
+    first_line = 1  # Номер первой строки блока
+    tail = ""  # Недочитанная последняя строка предыдущего блока
+
+    while True:
+        chunk = f.read(BLOCK_SIZE)
+        block = tail + chunk
+        if chunk:
+            # Разбираем только целые строки, хвост ждёт следующего блока
+            end = block.rfind("\n") + 1
+            block, tail = block[:end], block[end:]
+        # (номер совпадения в блоке, причина) - номера строк считаются потом, только если что-то не так
+        bad: List[tuple[int, str]] = []
+
+        for index, (base, lang, translation, transcription, context, other) in enumerate(LINE.findall(block)):
+            if lang:
+                if word is not None:
+                    lang = intern(lang.strip())
+                    translation = translation.strip()
+                    transcription = transcription.strip()
+                    # Напрямую, без add_translation: на больших словарях это заметно быстрее
+                    if translation and translation != MISSING:
+                        word.translations[lang] = translation
+                    if transcription and transcription != MISSING:
+                        word.transcriptions[lang] = transcription
+                elif not in_bad_word:
+                    bad.append((index, "строка не относится ни к одному слову"))
+            elif context:
+                if word is not None:
+                    word.contexts.append(context.strip())
+                elif not in_bad_word:
+                    bad.append((index, "строка не относится ни к одному слову"))
+            elif base:
+                if word is not None:
+                    yield word
+                word = Word(base.rstrip())
+                in_bad_word = False
+            elif other:
+                other = other.rstrip()
+                if other == WORD_PREFIX:
+                    if word is not None:
+                        yield word
+                    word = None
+                    in_bad_word = True
+                    bad.append((index, "нет слова после 'Слово:'"))
+                elif in_bad_word or (word is not None and other in (CONTEXT_TITLE, EMPTY_CONTEXT)):
+                    continue
+                elif word is None:
+                    bad.append((index, "строка не относится ни к одному слову"))
+                elif other.startswith(">**"):
+                    bad.append((index, "ожидался перевод вида >**en**: *перевод* `[транскрипция]`"))
+                else:
+                    bad.append((index, "неизвестная строка"))
+
+        if bad and issues is not None:
+            issues.extend(_locate(block, first_line, bad))
+        if not chunk:
+            break
+        first_line += block.count("\n")
+
+    if word is not None:
+        yield word
+
+
+@contextmanager
+def _gc_paused() -> Iterator[None]:
+    """Отключает сборщик циклических ссылок, пока загружаются слова.
+
+    Каждое слово - это четыре новых объекта (Word, два словаря и список), и сборщик
+    запускается снова и снова, каждый раз обходя все уже загруженные слова. Циклов
+    среди них нет, так что собирать нечего: на больших словарях это треть времени загрузки.
+    """
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def _locate(block: str, first_line: int, bad: List[tuple[int, str]]) -> Iterator[ParseIssue]:
+    """Находит номера плохих строк блока. Совпадения finditer идут в том же порядке, что и у findall."""
+    pending = iter(bad)
+    index, reason = next(pending)
+    line, counted_to = first_line, 0
+    for number, match in enumerate(LINE.finditer(block)):
+        if number != index:
+            continue
+        line += block.count("\n", counted_to, match.start())
+        counted_to = match.start()
+        yield ParseIssue(line, match.group().strip(), reason)
+        try:
+            index, reason = next(pending)
+        except StopIteration:
+            return
+
+
 class Dictionary:
+    # Сколько плохих строк показывать при загрузке, остальные только считаются
+    SHOWN_ISSUES = 10
+    # Размер журнала изменений в байтах, после которого он переносится в markdown-файл в фоне
+    JOURNAL_LIMIT = 1 << 20
+
     def __init__(self) -> None:
         self.console = Console()
         self.words: Dict[str, Word] = {}  # Ключ - базовое слово, значение объект Word
         self.filename: Optional[str] = None  # Путь к файлу словаря
+        self.load_issues: List[ParseIssue] = []  # Строки, которые не удалось прочитать при загрузке
+        # Где хранятся слова (см. dictionary_storage), задаётся в open.
+        # Без хранилища словарь работает как раньше: load_from_md и save_to_md
+        self.storage: Optional["DictionaryStorage"] = None
+        # Журнал изменений markdown-словаря (см. dictionary_journal): каждое изменение
+        # сразу дописывается в него, и после сбоя ничего не теряется
+        self.__journal: Optional["DictionaryJournal"] = None
+        self.__compaction: Optional[threading.Thread] = None
+        # Индекс для find и find_exact. Строится при первом поиске,
+        # дальше его обновляют add_word, edit_word и remove_word
+        self.__index: Optional[WordIndex] = None
+
+    @property
+    def index(self) -> WordIndex:
+        """Поисковый индекс по словам и переводам"""
+        if self.__index is None:
+            index = WordIndex()
+            for word in self.words.values():
+                index.add(word.base, word.translations.values())
+            self.__index = index
+        return self.__index
+
+    def reindex_word(self, base: str) -> None:
+        """Обновляет индекс слова, если его переводы изменили напрямую, минуя edit_word"""
+        if self.__index is not None and base in self.words:
+            self.__index.update(base, self.words[base].translations.values())
 
     def load_from_md(self, filename: str) -> None:
-        """Загружает слова из markdown-файла"""
+        """Загружает слова из markdown-файла.
+
+        Файл разбирается за один проход функцией parse_md. Строки, которые не удалось разобрать, сохраняются
+        в `load_issues` и выводятся с номерами строк.
+        """
+        self.__close_journal()
         self.filename = filename
-        if not os.path.exists(filename):
+        self.__index = None  # Слова меняются, индекс построится заново при поиске
+        self.load_issues = []
+        if os.path.exists(filename):
+            words = self.words
+            with open(filename, "r", encoding="utf-8") as f, _gc_paused():
+                for word in parse_md(f, self.load_issues):
+                    words[word.base] = word
+
+        if self.load_issues:
+            self.__print_issues(filename)
+        self.__open_journal(filename)
+
+    def open(self, filename: str) -> None:
+        """Открывает словарь: .md - markdown-файл, .db или .sqlite - база SQLite.
+
+        Изменения в базе сохраняются сразу, по одному слову. Markdown-файл
+        записывается целиком при вызове save.
+        """
+        from core.lib.dictionary_storage import MarkdownStorage, open_storage
+
+        self.close()
+        storage = open_storage(filename)
+        self.storage = storage
+        # save_to_md без имени файла пишет в self.filename, базу им перезаписывать нельзя
+        self.filename = filename if isinstance(storage, MarkdownStorage) else None
+        self.words = {}
+        self.__index = None
+        self.load_issues = []
+        words = self.words
+        with _gc_paused():
+            for word in storage.load(self.load_issues):
+                words[word.base] = word
+
+        if self.load_issues:
+            self.__print_issues(filename)
+        if not storage.incremental:
+            self.__open_journal(filename)
+
+    def import_md(self, filename: str) -> int:
+        """Добавляет в словарь слова из markdown-файла, слова с тем же названием заменяются.
+
+        Returns:
+            int: Сколько слов прочитано.
+        """
+        self.load_issues = []
+        with open(filename, "r", encoding="utf-8") as f, _gc_paused():
+            imported = list(parse_md(f, self.load_issues))
+        for word in imported:
+            # Заменённое слово встаёт в конец; write_words переносит его в конец и в хранилище
+            self.words.pop(word.base, None)
+            self.words[word.base] = word
+        self.__index = None
+        if self.storage is not None:
+            self.storage.write_words(imported)
+        if self.__journal is not None:
+            self.__journal.add(imported)
+            self.__compact_if_needed()
+        if self.load_issues:
+            self.__print_issues(filename)
+        return len(imported)
+
+    def save(self) -> None:
+        """Сохраняет словарь туда, откуда он открыт"""
+        if self.storage is None:
+            self.save_to_md(show_context=True)
             return
-
-        with open(filename, "r", encoding="utf-8") as f:
-            lines = f.readlines()
-
-        word: Word | None = None
-
-        for line in lines:
-            line = line.strip()
-            if not line:
-                continue
-
-            if line.startswith("Слово:"):
-                base = line[len("Слово:"):].strip()
-                if base:
-                    word = Word(base)
-                    self.words[base] = word
-                else:
-                    word = None
-
-            elif word and line.startswith(">**") and "**:" in line and "`[" in line:
-                try:
-                    lang = line.split("**")[1].split(":")[0].strip()
-                    translation = line.split("*")[1].strip()
-                    transcription = line.split("`[")[1].split("]`")[0].strip()
-                    word.add_translation(lang, translation)
-                    word.add_transcription(lang, transcription)
-                except IndexError:
-                    continue
-            # Контекст
-            elif word and line.startswith("> - "):
-                context = line[4:].strip()
-                word.add_context(context)
-
+        if not self.storage.incremental:
+            self.wait_compaction()
+            self.storage.save_all(self.words.values())
+            self.__clear_journal(self.storage.path)
+        self.console.print(PromptsDict.saved_dict, f"{self.storage.path}")
+
+    def close(self) -> None:
+        """Закрывает хранилище и журнал. Изменения markdown-словаря остаются в журнале до следующего save"""
+        self.__close_journal()
+        if self.storage is not None:
+            self.storage.close()
+            self.storage = None
+
+    def discard(self) -> None:
+        """Отказ от сохранения: несохранённые изменения markdown-словаря удаляются из журнала, словарь закрывается.
+
+        Если журнал успел вырасти до JOURNAL_LIMIT, фоновый перенос уже записал изменения в файл, они там и останутся.
+        """
+        self.wait_compaction()
+        if self.__journal is not None:
+            self.__journal.clear()
+        self.close()
+
+    def wait_compaction(self) -> None:
+        """Ждёт, пока фоновая запись журнала в markdown-файл закончится"""
+        if self.__compaction is not None:
+            self.__compaction.join()
+            self.__compaction = None
+
+    def __open_journal(self, filename: str) -> None:
+        """Применяет изменения, оставшиеся в журнале от прошлого запуска, и начинает записывать новые"""
+        from core.lib.dictionary_journal import DictionaryJournal
+
+        self.__journal = DictionaryJournal(filename)
+        replayed = self.__journal.replay(self.words)
+        if replayed:
+            self.__index = None
+            self.console.print(PromptsDict.journal_replayed, replayed)
+
+    def __close_journal(self) -> None:
+        self.wait_compaction()
+        if self.__journal is not None:
+            self.__journal.close()
+            self.__journal = None
+
+    def __clear_journal(self, filename: str) -> None:
+        """Журнал больше не нужен, если словарь целиком записан в его файл"""
+        if self.__journal is not None and os.path.abspath(filename) == os.path.abspath(self.__journal.target):
+            self.__journal.clear()
+
+    def __compact_if_needed(self) -> None:
+        """Переносит большой журнал в markdown-файл в отдельном потоке"""
+        journal = self.__journal
+        if journal is None or journal.size < self.JOURNAL_LIMIT:
+            return
+        if self.__compaction is not None and self.__compaction.is_alive():
+            return
+        if not journal.rotate():  # Прошлый перенос не удался, журнал останется до save
+            return
+        # Новые изменения идут уже в новый журнал. Слова переводятся в текст здесь же:
+        # поток не должен видеть слов, которые меняются (и переименовываются) во время записи
+        snapshot = [word.__str__(show_context=True) + "\n\n" for word in self.words.values()]
+        self.__compaction = threading.Thread(
+            target=self.__compact, args=(journal, snapshot), name="dictionary-compaction"
+        )
+        self.__compaction.start()
+
+    @staticmethod
+    def __compact(journal: "DictionaryJournal", snapshot: List[str]) -> None:
+        try:
+            with atomic_write(journal.target) as f:
+                f.writelines(snapshot)
+        except OSError:
+            return  # Старый журнал остаётся и применится при следующей загрузке
+        journal.drop_old()
+
+    def __print_issues(self, filename: str) -> None:
+        """Показывает строки, которые не удалось прочитать"""
+        self.console.print(PromptsDict.bad_lines, filename)
+        for issue in self.load_issues[:self.SHOWN_ISSUES]:
+            self.console.print(PromptsDict.line + Text(f" {issue.line}: {issue.reason}: {issue.text}"))
+        hidden = len(self.load_issues) - self.SHOWN_ISSUES
+        if hidden > 0:
+            self.console.print(PromptsDict.more_bad_lines, hidden)
 
     def word_exists(self, word: Word) -> bool:
         """Проверяет существование слова"""
@@ -137,6 +443,13 @@ class Dictionary:
         # Если слова нет в словаре, добавляем его
         if not self.word_exists(word):
             self.words[word.base] = word
+            if self.__index is not None:
+                self.__index.add(word.base, word.translations.values())
+            if self.storage is not None:
+                self.storage.write_word(word)
+            if self.__journal is not None:
+                self.__journal.add([word])
+                self.__compact_if_needed()
             self.console.print(f"{PromptsDict.word} '{word.base}' {PromptsDict.added}")
         else:
             self.console.print(f"{PromptsDict.word} '{word.base}' {PromptsDict.already_have}")
@@ -147,6 +460,13 @@ class Dictionary:
         if base in self.words:
             # Удаляем слово из словаря
             del self.words[base]
+            if self.__index is not None:
+                self.__index.remove(base)
+            if self.storage is not None:
+                self.storage.delete_word(base)
+            if self.__journal is not None:
+                self.__journal.remove(base)
+                self.__compact_if_needed()
             self.console.print(PromptsDict.word + Text(f" '{base}' ") + PromptsDict.deleted)
             return True
         # Если не существует
@@ -199,6 +519,19 @@ class Dictionary:
         if 'remove_context' in kwargs:
             index = kwargs['remove_context']
             word.remove_context(index)
+
+        # Обновляем индекс: переименованное слово теперь в конце словаря, как и в self.words
+        if self.__index is not None:
+            if word.base != base:
+                self.__index.remove(base)
+                self.__index.add(word.base, word.translations.values())
+            elif 'translation' in kwargs:
+                self.__index.update(base, word.translations.values())
+        if self.storage is not None:
+            self.storage.write_word(word, old_base=base)
+        if self.__journal is not None:
+            self.__journal.edit(word, base)
+            self.__compact_if_needed()
             
         self.console.print(PromptsDict.word + Text(f" '{base}' ") + PromptsDict.edited)
         return True
@@ -212,45 +545,28 @@ class Dictionary:
                 return
             filename = self.filename
         
-        # Создаём папки, если их нет
-        os.makedirs(os.path.dirname(filename), exist_ok=True)
-        # Полностью перезаписываем файл
-        with open(filename, "w", encoding="utf-8") as f:
+        # Фоновый перенос журнала не должен записать старые слова поверх новых
+        self.wait_compaction()
+        # Пишем во временный файл рядом и подменяем им словарь (папки создаются, если их нет):
+        # если запись прервётся, старый словарь останется целым
+        with atomic_write(filename) as f:
             # Для каждого слова в словаре
             for word in self.words.values():
                 # Преобразуем слово в строку и записываем в файл
                 f.write(word.__str__(show_context=show_context) + "\n\n")
+        self.__clear_journal(filename)
                 
         self.console.print(PromptsDict.saved_dict, f"{filename}")
 
     def find(self, query: str) -> List[Word]:
-        """Ищет схожие слова"""
-        results: List[Word] = []
-        # Приводим запрос к нижнему регистру
-        queries = query.lower().split()
-        
-        # Для каждого слова в словаре
-        for word in self.words.values():
-            # Если запрос содержится в базовом слове или в любом из переводов
-            if any(q in word.base.lower() or any(q in trans.lower() for trans in word.translations.values()) for q in queries):
-                # Добавляем слово в результаты
-                results.append(word)
-                
-        return results
+        """Ищет схожие слова: любое слово запроса содержится в базовом слове или в одном из переводов"""
+        # Индекс по триграммам находит кандидатов без перебора всего словаря
+        return [self.words[base] for base in self.index.find(query)]
         
     def find_exact(self, query: str) -> Optional[Word]:
-        """Ищет точные совпадения"""
-        # Приводим запрос к нижнему регистру
-        query = query.lower()
-        # Для каждого слова в словаре
-        for word in self.words.values():
-            # Если запрос точно совпадает с базовым словом или с любым из переводов
-            if (query == word.base.lower() or 
-                any(query == trans.lower() for trans in word.translations.values())):
-                 # Возвращаем найденное слово
-                return word
-        # Если ничего не найдено, возвращаем None
-        return None
+        """Ищет точные совпадения с базовым словом или переводом (без учёта регистра)"""
+        base = self.index.find_exact(query)
+        return self.words[base] if base is not None else None
         
     def list_words(self, limit: int = 20, offset: int = 0) -> List[Word]:
         # Преобразуем значения словаря в список
@@ -494,7 +810,7 @@ def show_words(console: Console, dictionary: Dictionary) -> None:
 
 def save_words(dictionary: Dictionary) -> None:
     """Сохраняет слова"""
-    dictionary.save_to_md(show_context=True)
+    dictionary.save()
 
 
 def exit(console: Console, dictionary: Dictionary) -> bool:
@@ -502,5 +818,9 @@ def exit(console: Console, dictionary: Dictionary) -> bool:
     console.print(PromptsDict.save_edits)
     save = console.input(Prompts.arrows).strip().lower()
     if save == 'д':
-        dictionary.save_to_md(show_context=True)
+        dictionary.save()
+        dictionary.close()
+    else:
+        # Иначе журнал применил бы изменения при следующем открытии
+        dictionary.discard()
     return True
@@ -0,0 +1,172 @@
+"""
+A module containing the search index of the dictionary.
+
+`Dictionary.find_exact` and `Dictionary.find` compare the query with the base
+word and the translations of every word. The index answers them without the scan:
+
+    exact       casefolded text -> the word, one dict lookup
+    substring   trigram -> the ids of the words whose texts contain it;
+                the words having all the trigrams of the query are checked
+
+Every word gets an id in the order it was added, so the results come in the
+order of the dictionary. Removed words leave stale ids in the trigram lists;
+they are skipped and dropped when the index is rebuilt.
+"""
+
+from array import array
+from collections import defaultdict
+from typing import Iterable
+
+_SEPARATOR = "\x00"  # Joins the texts of a word, never occurs in a query
+GRAM = 3
+
+
+def _grams(text: str) -> set[str]:
+    return {text[i : i + GRAM] for i in range(len(text) - GRAM + 1)}
+
+
+def _new_ids() -> array:
+    return array("I")
+
+
+class WordIndex:
+    """The exact and the substring index over the base words and their translations."""
+
+    def __init__(self) -> None:
+        self.__ids: dict[str, int] = {}  # base -> id
+        self.__bases: list[str | None] = []  # id -> base, None - removed
+        self.__texts: list[str | None] = []  # id -> casefolded texts joined with _SEPARATOR
+        # casefolded text -> id, or a list of ids if several words share it
+        self.__exact: dict[str, int | list[int]] = {}
+        # trigram -> ids, may contain removed ids. Read it with .get, indexing adds the trigram
+        self.__grams: defaultdict[str, array] = defaultdict(_new_ids)
+        self.__stale = 0  # Removed ids still in __grams
+
+    def __len__(self) -> int:
+        return len(self.__ids)
+
+    def add(self, base: str, translations: Iterable[str]) -> None:
+        """Indexes a new word. It goes after all the indexed words."""
+        if base in self.__ids:
+            self.remove(base)
+        word_id = len(self.__bases)
+        texts = self.__texts_of(base, translations)
+        self.__ids[base] = word_id
+        self.__bases.append(base)
+        joined = _SEPARATOR.join(texts)
+        self.__texts.append(joined)
+        for text in texts:
+            self.__add_exact(text, word_id)
+        self.__add_grams(_grams(joined), word_id)
+
+    def update(self, base: str, translations: Iterable[str]) -> None:
+        """Reindexes the translations of a word, keeping its place in the order."""
+        word_id = self.__ids.get(base)
+        if word_id is None:
+            self.add(base, translations)
+            return
+        old_texts = self.__texts[word_id].split(_SEPARATOR)  # type: ignore[union-attr]
+        texts = self.__texts_of(base, translations)
+        for text in set(old_texts) - set(texts):
+            self.__remove_exact(text, word_id)
+        for text in set(texts) - set(old_texts):
+            self.__add_exact(text, word_id)
+        self.__texts[word_id] = _SEPARATOR.join(texts)
+        # The trigrams of the old texts stay, the check of the candidates skips them
+        grams: set[str] = set()
+        for text in texts:
+            if text not in old_texts:
+                grams.update(_grams(text))
+        self.__add_grams(grams, word_id)
+
+    def remove(self, base: str) -> None:
+        """Forgets a word"""
+        word_id = self.__ids.pop(base, None)
+        if word_id is None:
+            return
+        for text in set(self.__texts[word_id].split(_SEPARATOR)):  # type: ignore[union-attr]
+            self.__remove_exact(text, word_id)
+        self.__bases[word_id] = None
+        self.__texts[word_id] = None
+        self.__stale += 1
+        if self.__stale > 1000 and self.__stale > len(self.__ids):
+            self.__compact()
+
+    def find_exact(self, query: str) -> str | None:
+        """The first word whose base or translation equals the query, ignoring case."""
+        found = self.__exact.get(query.casefold())
+        if found is None:
+            return None
+        return self.__bases[found if isinstance(found, int) else found[0]]
+
+    def find(self, query: str) -> list[str]:
+        """The words whose base or a translation contains any word of the query, in the dictionary order."""
+        found: set[int] = set()
+        for term in query.casefold().split():
+            found.update(self.__find_term(term))
+        return [self.__bases[word_id] for word_id in sorted(found)]  # type: ignore[misc]
+
+    def __find_term(self, term: str) -> Iterable[int]:
+        texts = self.__texts
+        if len(term) < GRAM:
+            # Too short for the trigrams: a scan of the prepared texts, still without casefolding them again
+            return [word_id for word_id, text in enumerate(texts) if text is not None and term in text]
+        postings = []
+        for gram in _grams(term):
+            ids = self.__grams.get(gram)
+            if ids is None:
+                return ()
+            postings.append(ids)
+        postings.sort(key=len)
+        candidates = set(postings[0])
+        for ids in postings[1:]:
+            if len(candidates) < 32:  # Checking the few candidates is cheaper than another intersection
+                break
+            candidates.intersection_update(ids)
+        return [word_id for word_id in candidates if texts[word_id] is not None and term in texts[word_id]]  # type: ignore[operator]
+
+    @staticmethod
+    def __texts_of(base: str, translations: Iterable[str]) -> list[str]:
+        texts = [base.casefold()]
+        for translation in translations:
+            text = translation.casefold()
+            if text not in texts:
+                texts.append(text)
+        return texts
+
+    def __add_exact(self, text: str, word_id: int) -> None:
+        current = self.__exact.get(text)
+        if current is None:
+            self.__exact[text] = word_id
+        elif isinstance(current, int):
+            if current != word_id:
+                self.__exact[text] = sorted((current, word_id))
+        elif word_id not in current:
+            current.append(word_id)
+            current.sort()
+
+    def __remove_exact(self, text: str, word_id: int) -> None:
+        current = self.__exact.get(text)
+        if current == word_id:
+            del self.__exact[text]
+        elif isinstance(current, list) and word_id in current:
+            current.remove(word_id)
+            if len(current) == 1:
+                self.__exact[text] = current[0]
+
+    def __add_grams(self, grams: set[str], word_id: int) -> None:
+        # The grams across the separator are indexed too, no query can contain them
+        index = self.__grams
+        for gram in grams:
+            index[gram].append(word_id)
+
+    def __compact(self) -> None:
+        """Rebuilds the index without the removed words, the order is kept."""
+        words = [
+            (base, text.split(_SEPARATOR)[1:])
+            for base, text in zip(self.__bases, self.__texts)
+            if base is not None and text is not None
+        ]
+        self.__init__()  # type: ignore[misc]
+        for base, translations in words:
+            self.add(base, translations)
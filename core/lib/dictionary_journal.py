@@ -0,0 +1,188 @@
+"""
+A module containing the write-ahead journal of a markdown dictionary.
+
+Rewriting a big markdown file after every change is slow, and keeping the
+changes only in memory loses them on a crash. The journal sits next to the
+dictionary file (`dictionary.md.journal`) and gets one JSON line per change,
+fsynced before the change is reported as done:
+
+    {"op": "add", "word": {"base": "кошка", "translations": {"en": "cat"}, ...}}
+    {"op": "edit", "word": {...}, "old": "кот"}      "old" - the word was renamed
+    {"op": "remove", "base": "кошка"}
+
+A record holds the whole new state of the word, so replaying it twice gives
+the same result. That is what makes the compaction safe: the journal is renamed
+to `dictionary.md.journal.old`, a new one is started, and the main file is
+written from a snapshot of the words in the background. The old journal is
+removed when the main file is in place; until then it is replayed after the
+main file and before the new journal.
+"""
+
+import json
+import os
+from sys import intern
+from typing import IO, Any, Iterable
+
+from core.lib.dictionary import Word
+from core.utilits.atomic_write import fsync_directory
+
+JOURNAL_SUFFIX = ".journal"
+OLD_SUFFIX = ".old"
+
+
+def word_to_record(word: Word) -> dict[str, Any]:
+    return {
+        "base": word.base,
+        "translations": word.translations,
+        "transcriptions": word.transcriptions,
+        "contexts": word.contexts,
+    }
+
+
+def record_to_word(record: dict[str, Any]) -> Word:
+    word = Word(record["base"])
+    word.translations = {intern(lang): text for lang, text in (record.get("translations") or {}).items()}
+    word.transcriptions = {intern(lang): text for lang, text in (record.get("transcriptions") or {}).items()}
+    word.contexts = list(record.get("contexts") or [])
+    return word
+
+
+def apply_record(words: dict[str, Word], record: dict[str, Any]) -> None:
+    """Repeats a change on the words, the same way Dictionary does it."""
+    op = record["op"]
+    if op == "remove":
+        words.pop(record["base"], None)
+        return
+    if op not in ("add", "edit"):
+        raise ValueError(f"Unknown journal operation {op!r}")
+    word = record_to_word(record["word"])
+    old = record.get("old")
+    if op == "add" or (old is not None and old != word.base):
+        # An added or renamed word goes to the end, import_md replaces words this way.
+        # The main file may already have the word under its new name, if it was
+        # written after the change: it is moved to the end too.
+        words.pop(old, None)
+        words.pop(word.base, None)
+    words[word.base] = word
+
+
+class DictionaryJournal:
+    """The journal of the changes of one dictionary file.
+
+    Args:
+        path (str): The dictionary file, the journal is `path + ".journal"`.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.target = path
+        self.path = path + JOURNAL_SUFFIX
+        self.old_path = self.path + OLD_SUFFIX
+        self.__file: IO[bytes] | None = None
+        self.size = 0  # Bytes in the current journal
+
+    def replay(self, words: dict[str, Word]) -> int:
+        """Applies the journals left by the previous runs to the words read from the main file.
+
+        Returns:
+            int: The number of the applied records.
+        """
+        applied = 0
+        for path in (self.old_path, self.path):
+            try:
+                with open(path, "rb") as f:
+                    data = f.read()
+            except FileNotFoundError:
+                continue
+            end = data.rfind(b"\n") + 1
+            if end != len(data) and path == self.path:
+                # A record torn by a crash: it was never reported as saved, drop it
+                # so that the next record does not continue the broken line
+                with open(path, "r+b") as f:
+                    f.truncate(end)
+            for line in data[:end].splitlines():
+                try:
+                    apply_record(words, json.loads(line))
+                except (ValueError, KeyError, TypeError, AttributeError):
+                    continue  # Not a record of this journal, skip it
+                applied += 1
+        return applied
+
+    def add(self, words: Iterable[Word]) -> None:
+        """Records new words, or words replaced as a whole"""
+        self.append({"op": "add", "word": word_to_record(word)} for word in words)
+
+    def edit(self, word: Word, old_base: str) -> None:
+        """Records a changed word"""
+        record: dict[str, Any] = {"op": "edit", "word": word_to_record(word)}
+        if old_base != word.base:
+            record["old"] = old_base
+        self.append([record])
+
+    def remove(self, base: str) -> None:
+        """Records a removed word"""
+        self.append([{"op": "remove", "base": base}])
+
+    def append(self, records: Iterable[dict[str, Any]]) -> None:
+        """Writes the records and waits until they are on the disk."""
+        data = b"".join(
+            json.dumps(record, ensure_ascii=False, separators=(",", ":")).encode("utf-8") + b"\n"
+            for record in records
+        )
+        if not data:
+            return
+        f = self.__open()
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+        self.size += len(data)
+
+    def rotate(self) -> bool:
+        """Starts a new journal, the current one becomes the old journal.
+
+        Returns:
+            bool: False if the old journal of an unfinished compaction is still there.
+        """
+        if os.path.exists(self.old_path):
+            return False
+        self.__close()
+        if os.path.exists(self.path):
+            os.replace(self.path, self.old_path)
+            fsync_directory(os.path.dirname(os.path.abspath(self.path)))
+        self.size = 0
+        return True
+
+    def drop_old(self) -> None:
+        """Removes the old journal once the main file contains its changes."""
+        try:
+            os.unlink(self.old_path)
+        except FileNotFoundError:
+            pass
+
+    def clear(self) -> None:
+        """Empties the journal once the main file contains all the changes."""
+        self.__close()
+        for path in (self.path, self.old_path):
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+        self.size = 0
+
+    def close(self) -> None:
+        self.__close()
+
+    def __open(self) -> IO[bytes]:
+        if self.__file is None:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            created = not os.path.exists(self.path)
+            self.__file = open(self.path, "ab")
+            self.size = self.__file.tell()
+            if created:
+                fsync_directory(os.path.dirname(os.path.abspath(self.path)))
+        return self.__file
+
+    def __close(self) -> None:
+        if self.__file is not None:
+            self.__file.close()
+            self.__file = None
+
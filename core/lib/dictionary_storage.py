@@ -0,0 +1,233 @@
+"""
+A module containing the storage backends of the dictionary.
+
+A `Dictionary` keeps its words in memory; the storage decides how they get to
+the disk. The backend is chosen by the extension of the dictionary file:
+
+    .md               MarkdownStorage - the save_to_md format, the whole file
+                      is written again on every save
+    .db, .sqlite      SQLiteStorage - one row per word and per translation,
+                      every change is written at once
+
+Markdown stays the format for people: `Dictionary.import_md` reads a markdown
+file into any storage and `Dictionary.save_to_md` exports the words to one.
+"""
+
+import json
+import os
+import sqlite3
+from abc import ABC, abstractmethod
+from sys import intern
+from typing import Iterable, Iterator
+
+from core.lib.dictionary import ParseIssue, Word, parse_md
+from core.utilits.atomic_write import atomic_write
+
+
+class DictionaryStorage(ABC):
+    """The base class of the storages.
+
+    Args:
+        path (str): The dictionary file.
+    """
+
+    # True - write_word and delete_word save the change at once and save_all is not needed
+    incremental = False
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+
+    @abstractmethod
+    def load(self, issues: list[ParseIssue] | None = None) -> Iterator[Word]:
+        """Reads the words in the dictionary order.
+
+        Args:
+            issues (list[ParseIssue] | None, optional): Receives the parts of the file that could not be read.
+        """
+
+    def write_word(self, word: Word, old_base: str | None = None) -> None:
+        """Saves a new or changed word.
+
+        Args:
+            word (Word): The word.
+            old_base (str | None, optional): The previous base of a renamed word, it is removed.
+        """
+
+    def write_words(self, words: Iterable[Word]) -> None:
+        """Saves many words. A word with the base of an existing one replaces it and goes to the end."""
+        for word in words:
+            self.delete_word(word.base)
+            self.write_word(word)
+
+    def delete_word(self, base: str) -> None:
+        """Removes a word."""
+
+    @abstractmethod
+    def save_all(self, words: Iterable[Word]) -> None:
+        """Replaces the whole content of the storage with the words."""
+
+    def close(self) -> None:
+        """Releases the file."""
+
+
+class MarkdownStorage(DictionaryStorage):
+    """The dictionary as a markdown file (see Word.__str__).
+
+    The changes are kept in memory until `save_all`, which writes the whole file.
+    """
+
+    def __init__(self, path: str, show_context: bool = True) -> None:
+        super().__init__(path)
+        self.show_context = show_context
+
+    def load(self, issues: list[ParseIssue] | None = None) -> Iterator[Word]:
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "r", encoding="utf-8") as f:
+            yield from parse_md(f, issues)
+
+    def save_all(self, words: Iterable[Word]) -> None:
+        with atomic_write(self.path) as f:
+            for word in words:
+                f.write(word.__str__(show_context=self.show_context) + "\n\n")
+
+
+class SQLiteStorage(DictionaryStorage):
+    """The dictionary in an SQLite database.
+
+    A word is a row of `words` (its contexts are a JSON list in the same row) and
+    a row of `translations` per language. Changing a word rewrites only its rows.
+    The database is in WAL mode, so a write does not rewrite the database file
+    and readers are not blocked.
+
+    Args:
+        path (str): The database file, created if it does not exist.
+    """
+
+    incremental = True
+    # Increase when the tables change. Unlike the note and file indexes, this is
+    # the data itself, so a different version is an error and not a rebuild.
+    SCHEMA_VERSION = 1
+
+    def __init__(self, path: str) -> None:
+        super().__init__(path)
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.__db = sqlite3.connect(path)
+        try:
+            self.__db.execute("PRAGMA journal_mode = WAL")
+            # In WAL mode NORMAL never corrupts the database, at worst the last
+            # transactions are lost on a power failure
+            self.__db.execute("PRAGMA synchronous = NORMAL")
+            self.__db.execute("PRAGMA foreign_keys = ON")
+            self.__create_tables()
+        except BaseException:
+            self.__db.close()
+            raise
+
+    def __create_tables(self) -> None:
+        (version,) = self.__db.execute("PRAGMA user_version").fetchone()
+        if version not in (0, self.SCHEMA_VERSION):
+            raise ValueError(f"{self.path}: unsupported dictionary version {version}")
+        self.__db.executescript(
+            """
+            -- id keeps the order the words were added in
+            CREATE TABLE IF NOT EXISTS words (
+                id INTEGER PRIMARY KEY, base TEXT NOT NULL UNIQUE, contexts TEXT NOT NULL DEFAULT '[]'
+            );
+            -- A language may have only a translation or only a transcription
+            CREATE TABLE IF NOT EXISTS translations (
+                word_id INTEGER NOT NULL REFERENCES words (id) ON DELETE CASCADE,
+                lang TEXT NOT NULL, translation TEXT, transcription TEXT,
+                PRIMARY KEY (word_id, lang)
+            );
+            CREATE INDEX IF NOT EXISTS translations_translation ON translations (translation);
+            """
+        )
+        # The UNIQUE constraint is the index on words.base
+        self.__db.execute(f"PRAGMA user_version = {self.SCHEMA_VERSION}")
+
+    def load(self, issues: list[ParseIssue] | None = None) -> Iterator[Word]:
+        # Three plain scans are faster than a JOIN or a query per word
+        words: dict[int, Word] = {}
+        for word_id, base in self.__db.execute("SELECT id, base FROM words ORDER BY id"):
+            words[word_id] = Word(base)
+        rows = self.__db.execute("SELECT word_id, lang, translation, transcription FROM translations")
+        for word_id, lang, translation, transcription in rows:
+            word = words[word_id]
+            lang = intern(lang)
+            if translation is not None:
+                word.translations[lang] = translation
+            if transcription is not None:
+                word.transcriptions[lang] = transcription
+        for word_id, contexts in self.__db.execute("SELECT id, contexts FROM words WHERE contexts != '[]'"):
+            words[word_id].contexts = json.loads(contexts)
+        return iter(words.values())
+
+    def write_word(self, word: Word, old_base: str | None = None) -> None:
+        with self.__db:
+            if old_base is not None and old_base != word.base:
+                self.__db.execute("DELETE FROM words WHERE base = ?", (old_base,))
+            self.__upsert(word)
+
+    def delete_word(self, base: str) -> None:
+        with self.__db:
+            self.__db.execute("DELETE FROM words WHERE base = ?", (base,))
+
+    def save_all(self, words: Iterable[Word]) -> None:
+        with self.__db:
+            self.__db.execute("DELETE FROM words")
+            for word in words:
+                self.__upsert(word)
+
+    def write_words(self, words: Iterable[Word]) -> None:
+        """Saves the words in one transaction. A replaced word gets a new id, so it goes to the end."""
+        with self.__db:
+            for word in words:
+                self.__db.execute("DELETE FROM words WHERE base = ?", (word.base,))
+                self.__upsert(word)
+
+    def __upsert(self, word: Word) -> None:
+        """Writes the word row and the rows of its languages. Call inside a transaction."""
+        contexts = json.dumps(word.contexts, ensure_ascii=False)
+        self.__db.execute(
+            "INSERT INTO words (base, contexts) VALUES (?, ?) "
+            "ON CONFLICT (base) DO UPDATE SET contexts = excluded.contexts",
+            (word.base, contexts),
+        )
+        (word_id,) = self.__db.execute("SELECT id FROM words WHERE base = ?", (word.base,)).fetchone()
+        langs = word.translations.keys() | word.transcriptions.keys()
+        self.__db.execute(
+            f"DELETE FROM translations WHERE word_id = ? AND lang NOT IN ({', '.join('?' * len(langs))})",
+            (word_id, *langs),
+        )
+        self.__db.executemany(
+            "INSERT INTO translations (word_id, lang, translation, transcription) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT (word_id, lang) DO UPDATE SET "
+            "translation = excluded.translation, transcription = excluded.transcription",
+            [(word_id, lang, word.translations.get(lang), word.transcriptions.get(lang)) for lang in langs],
+        )
+
+    def close(self) -> None:
+        self.__db.close()
+
+
+# The extension of the dictionary file -> the storage
+STORAGES: dict[str, type[DictionaryStorage]] = {
+    ".md": MarkdownStorage,
+    ".db": SQLiteStorage,
+    ".sqlite": SQLiteStorage,
+}
+
+
+def open_storage(path: str) -> DictionaryStorage:
+    """Creates the storage for the dictionary file.
+
+    Raises:
+        ValueError: If the extension of the file is unknown.
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in STORAGES:
+        raise ValueError(f"Unknown dictionary format {extension!r}, use one of: {', '.join(STORAGES)}")
+    return STORAGES[extension](path)
@@ -1,10 +1,37 @@
 """
 The module responsible for the paths.
 
+Use `PathManager.shared()`: the configs are resolved and the storage
+directories are created once per process, and the JSON files are parsed
+again only after they change on disk.
 """
 
 import os
 import json
+from typing import Any
+
+# path -> ((st_mtime_ns, st_size), parsed JSON)
+_json_cache: dict[str, tuple[tuple[int, int], Any]] = {}
+
+
+def read_json(path: str) -> Any:
+    """Reads a .json file. The parsed data is reused until the file changes.
+
+    The returned object is shared by all callers, do not modify it.
+
+    Raises:
+        OSError: If the file cannot be read.
+        json.JSONDecodeError: If the file is not valid JSON.
+    """
+    st = os.stat(path)
+    stamp = (st.st_mtime_ns, st.st_size)
+    cached = _json_cache.get(path)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+    with open(path, "r", encoding="UTF-8") as f:
+        data = json.load(f)
+    _json_cache[path] = (stamp, data)
+    return data
 
 
 class PathManager:
@@ -14,6 +41,9 @@ class PathManager:
     2. It has default paths for Storage/Topics and Storage/Law.
     3. Loads custom paths from config.json, if any.
     4. Creates directories.
+
+    config.json is checked on every access to `config` and `paths`
+    and is read again only if its mtime has changed.
     """
 
     # If there are no configs in user/configs or in core/configs,
@@ -23,6 +53,19 @@ class PathManager:
         "topic": os.path.join("Storage", "Topics"),
         "law": os.path.join("Storage", "Law"),
     }
+    # The dictionary is a file, not a directory, so it is kept out of "paths".
+    DEFAULT_DICTIONARY = os.path.join("Storage", "Dictionary", "dictionary.md")
+
+    __shared: "PathManager | None" = None
+    # Directories that already exist, shared by all instances
+    __created_dirs: set[str] = set()
+
+    @classmethod
+    def shared(cls) -> "PathManager":
+        """Returns the process-wide instance, creating it on the first call."""
+        if PathManager.__shared is None:
+            PathManager.__shared = cls()
+        return PathManager.__shared
 
     def __init__(self):
         self.current_file = os.path.abspath(__file__)
@@ -39,15 +82,35 @@ class PathManager:
         self.config_path = self._get_config_file_path("config.json")
 
         self.config_exists = os.path.exists(self.config_path)
-
-        # Uploading the user's configuration
-        self.config = self._load_config()
-
-        # Final paths
-        self.paths = self.__final_paths()
-
-        # Creating directories
-        self.__ensure_storage_dirs()
+        self.__empty_config: dict[str, Any] = {"paths": {}}
+
+        # Uploading the user's configuration, the final paths and the directories
+        self.__config: dict[str, Any] | None = None
+        # A config.json without "paths": the dict from read_json and its copy with "paths"
+        self.__raw_config: dict[str, Any] | None = None
+        self.__config_copy: dict[str, Any] = {}
+        self.__paths: dict[str, str] = {}
+        self.__reload()
+
+    @property
+    def config(self) -> dict[str, Any]:
+        """The user's configuration (config.json). Do not modify it."""
+        return self.__reload()
+
+    @property
+    def paths(self) -> dict[str, str]:
+        """The final paths of the "paths" section."""
+        self.__reload()
+        return self.__paths
+
+    def __reload(self) -> dict[str, Any]:
+        """Recalculates the paths if config.json has changed."""
+        config = self._load_config()
+        if config is not self.__config:
+            self.__config = config
+            self.__paths = self.__final_paths()
+            self.__ensure_storage_dirs()
+        return config
 
     def _get_user_configs_dir(self) -> str:
         """Returns the path to user/configs"""
@@ -74,29 +137,33 @@ class PathManager:
         # If the file is nowhere to be found, return the path to user/configs.
         return user_path
 
-    def _load_config(self) -> dict[str, dict[str, str]]:
+    def _load_config(self) -> dict[str, Any]:
         """
         Loads config.json.
 
         First it checks user/configs, if not, core/configs.
         """
         if not self.config_exists:
-            return {"paths": {}}
+            return self.__empty_config
 
         try:
-            with open(self.config_path, "r", encoding="UTF-8") as f:
-                data = json.load(f)
-                if "paths" not in data:
-                    data["paths"] = {}
-                return data
-        except (json.JSONDecodeError, UnicodeDecodeError):
-            return {"paths": {}}
+            data = read_json(self.config_path)
+        except (OSError, json.JSONDecodeError, UnicodeDecodeError):
+            return self.__empty_config
+        if "paths" in data:
+            return data
+        # read_json returns its cached dict, so it is copied and not changed.
+        # The same copy is returned until the file changes, __reload relies on it
+        if data is not self.__raw_config:
+            self.__raw_config = data
+            self.__config_copy = {**data, "paths": {}}
+        return self.__config_copy
 
     def __final_paths(self) -> dict[str, str]:
         """Generates the full paths to the files specified in the config."""
         final: dict[str, str] = {}
         if self.config_exists:
-            user_paths = self.config.get("paths", {})
+            user_paths = self.__config.get("paths", {})
             for key, path in user_paths.items():
                 if os.path.isabs(path):
                     final[key] = path
@@ -109,8 +176,10 @@ class PathManager:
 
     def __ensure_storage_dirs(self):
         """Creates directories according to the specified paths in the config."""
-        for path in self.paths.values():
-            os.makedirs(path, exist_ok=True)
+        for path in self.__paths.values():
+            if path not in PathManager.__created_dirs:
+                os.makedirs(path, exist_ok=True)
+                PathManager.__created_dirs.add(path)
 
     def get_menu_path(self) -> str:
         """Get the path to menu.json"""
@@ -128,6 +197,42 @@ class PathManager:
         """Get the path to config.json"""
         return self.config_path
 
+    def get_menu(self) -> dict[str, Any]:
+        """Get the parsed menu.json"""
+        return read_json(self.menu_path)
+
+    def get_actions(self) -> dict[str, str]:
+        """Get the parsed actions.json"""
+        return read_json(self.actions_path)
+
+    def get_colors(self) -> dict[str, str]:
+        """Get the parsed colors.json"""
+        return read_json(self.color_path)
+
+    def get_settings(self, section: str) -> dict[str, Any]:
+        """Get a top-level section of config.json, e.g. "findler". Empty if it is missing."""
+        settings = self.config.get(section)
+        return settings if isinstance(settings, dict) else {}
+
+    def get_template_path(self, name: str) -> str | None:
+        """Get the definition of a template (templates/<name>.json), None if there is none"""
+        path = self._get_config_file_path(os.path.join("templates", f"{name}.json"))
+        return path if os.path.exists(path) else None
+
+    def get_template_dirs(self) -> list[str]:
+        """Get the directories with template definitions, the user's one first"""
+        return [
+            os.path.join(self.__user_configs_dir, "templates"),
+            os.path.join(self.__core_configs_dir, "templates"),
+        ]
+
+    def get_dictionary_path(self) -> str:
+        """Get the path to the dictionary file ("dictionary" in config.json)"""
+        path = self.config.get("dictionary") or self.DEFAULT_DICTIONARY
+        if os.path.isabs(path):
+            return path
+        return os.path.join(self.base_path, path)
+
     def get_path(self, key: str | None = None):
         """Get all the paths in the config.json"""
         if key:
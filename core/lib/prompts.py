@@ -184,6 +184,10 @@ class PromptsDict:
 
     must_be_str = Text("Ошибка: new_base должен быть строкой", style=third_color)
     no_file_save = Text("Не указан файл для сохранения.", style=third_color)
+    bad_lines = Text("Строки словаря, которые не удалось прочитать:", style=second_color)
+    line = Text("строка", style=second_color)
+    more_bad_lines = Text("и ещё строк:", style=second_color)
+    journal_replayed = Text("Восстановлено несохранённых изменений из журнала:", style=second_color)
 
     next_page = Text("- следующая страница", style=main_color)
     back_page = Text("- предыдущая страница", style=main_color)
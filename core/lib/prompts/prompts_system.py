@@ -5,12 +5,11 @@ Contains colored prompta for `print` and `input'.
 
 
 from rich.text import Text
-from core.utilits.opener_json import open_json
 
 
 from core.lib.path_manager import PathManager as pm
 
-path = pm()
+path = pm.shared()
 
 class Default:
 
@@ -20,21 +19,46 @@ class Default:
     colour_4 : str
     colour_5 : str
 
-colors: dict[str, str] = open_json(path.get_color_path())
+colors: dict[str, str] = path.get_colors()
 
 for key, value in colors.items():
     setattr(Default, key, value)
 
-main_color = Default.colour_1 + " bold"
-second_color = Default.colour_2 + " bold"
-third_color = Default.colour_3 + " bold"
-additional_color = Default.colour_4 + " bold"
-support_color = Default.colour_5 + " bold"
+
+class ColorStyle(str):
+    """The style of a prompt made from a color of colors.json.
+
+    It is an ordinary style string that also remembers the key of its color, so
+    reload_colors restyles the prompt by the key even if several colors had the
+    same value. Adding a string keeps the key: `third_color + " blink"`.
+    """
+
+    key: str
+    extra: str
+
+    def __new__(cls, key: str, extra: str = "bold") -> "ColorStyle":
+        style = super().__new__(cls, f"{getattr(Default, key)} {extra}")
+        style.key = key
+        style.extra = extra
+        return style
+
+    def __add__(self, other: str) -> "ColorStyle":
+        return ColorStyle(self.key, self.extra + other)
+
+
+main_color = ColorStyle("colour_1")
+second_color = ColorStyle("colour_2")
+third_color = ColorStyle("colour_3")
+additional_color = ColorStyle("colour_4")
+support_color = ColorStyle("colour_5")
+
+# Increased by reload_colors, so the cached colored output can be invalidated
+colors_version = 0
 
 
 class Prompts:
    
-    arrows = Text(">>> ", style=f"{third_color} blink")
+    arrows = Text(">>> ", style=third_color + " blink")
     theme = Text("Введите название: ", style=main_color)
     author = Text("Введите имя автора: ", style=main_color)
     save = Text("\nПример сохранения: ", style=main_color)
@@ -44,6 +68,13 @@ class Prompts:
     default = Text("для установки по умолчанию", style=main_color)
     file_saved = Text("Файл сохранен: ", style=main_color)
     tags = Text('Введите теги. "Пустой ввод" - завершить.', style=main_color)
+    search_query = Text("Введите слова для поиска по заметкам: ", style=main_color)
+    tag_query = Text("Введите теги, например: #python AND #async NOT #draft", style=main_color)
+    notes_pages = Text(
+        "\nНомер - открыть, 'n' - вперед, 'p' - назад, 's' - сортировка, 'f' - фильтр, 'q' - выход",
+        style=third_color,
+    )
+    notes_filter = Text("Введите часть названия или Enter, чтобы убрать фильтр:", style=main_color)
 
 
 class PromptsLaw:
@@ -69,6 +100,10 @@ class PromptsMenu:
     exit = Text("[q] - выход", style=third_color)
     back = Text("[b] - назад", style=third_color)
     perform_action = Text("Выполняем действие: ", style=main_color)
+    reloaded = Text("Настройки обновлены", style=support_color)
+    search = Text("[/текст] - поиск", style=third_color)
+    search_choice = Text("Введите номер или Enter для отмены", style=main_color)
+    not_found = Text("Ничего не найдено", style=third_color)
 
 
 class PromptSite:
@@ -87,3 +122,41 @@ class PromptsHelper:
     manual = Text(". Ввести свой вручную", style=main_color)
     err_number = Text("Ошибка: введите число", style=third_color)
     redactor_name = Text("Введите имя или полный путь редактора: ", style=main_color)
+
+
+def reload_colors(*owners: object) -> bool:
+    """Applies the edited colors.json without restarting the program.
+
+    The `Text` prompts (and panels) with a ColorStyle are restyled in place, so
+    the ones that were imported by other modules or used as default arguments
+    get the new colors too.
+
+    Args:
+        *owners (object): Other objects with prompts to restyle, e.g. UserPrompts.
+
+    Returns:
+        bool: True if the colors have changed.
+    """
+    global colors, colors_version, main_color, second_color, third_color, additional_color, support_color
+
+    new_colors: dict[str, str] = path.get_colors()
+    if all(getattr(Default, key, None) == value for key, value in new_colors.items()):
+        return False
+
+    colors = new_colors
+    colors_version += 1
+    for key, value in new_colors.items():
+        setattr(Default, key, value)
+    main_color = ColorStyle("colour_1")
+    second_color = ColorStyle("colour_2")
+    third_color = ColorStyle("colour_3")
+    additional_color = ColorStyle("colour_4")
+    support_color = ColorStyle("colour_5")
+
+    for owner in (Prompts, PromptsLaw, PromptsMenu, PromptSite, PromptsHelper, *owners):
+        for value in vars(owner).values():
+            for attribute in ("style", "border_style"):  # Text has style, Panel has both
+                style = getattr(value, attribute, None)
+                if isinstance(style, ColorStyle):
+                    setattr(value, attribute, ColorStyle(style.key, style.extra))
+    return True
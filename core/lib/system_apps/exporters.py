@@ -0,0 +1,245 @@
+"""
+A module containing the streaming writers for findler results.
+
+Every writer takes `(path, size)` pairs one by one, so the results never have
+to be collected in memory:
+
+    txt       the human-readable "path — size UNIT" lines (the old format)
+    csv       "path,size" with a header row, size in bytes
+    jsonl     one {"path": ..., "size": ...} object per line
+    columnar  a compact binary file with one column per field (see ColumnarWriter)
+
+The output is written to a temporary file and replaces the old one only when
+the writer is closed, so an interrupted search keeps the previous results.
+"""
+
+import csv
+import json
+import shutil
+import struct
+import sys
+import tempfile
+from abc import ABC, abstractmethod
+from array import array
+from typing import IO, Iterable, Iterator
+
+from core.utilits.atomic_write import AtomicFile
+
+# Unit number from findler.choise() -> (divider, name)
+SIZE_UNITS: dict[int, tuple[int, str]] = {1: (1024, "KB"), 2: (1024**2, "MB"), 3: (1024**3, "GB")}
+
+
+class ResultWriter(ABC):
+    """The base class of the writers. Use it as a context manager.
+
+    Args:
+        path (str): The output file.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.count = 0
+        self.__output: AtomicFile | None = None
+
+    def __enter__(self) -> "ResultWriter":
+        return self
+
+    def __exit__(self, exc_type: type[BaseException] | None, *exc: object) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.discard()
+
+    @abstractmethod
+    def write(self, path: str, size: int) -> None:
+        """Writes one result."""
+
+    def write_all(self, results: Iterable[tuple[str, int]]) -> int:
+        """Writes all the results and returns their number."""
+        for path, size in results:
+            self.write(path, size)
+        return self.count
+
+    @abstractmethod
+    def close(self) -> None:
+        """Finishes the file."""
+
+    def discard(self) -> None:
+        """Drops what was written, the old output file stays as it was."""
+        if self.__output is not None:
+            self.__output.discard()
+
+    def _open_text(self) -> IO[str]:
+        # surrogateescape keeps file names that are not valid UTF-8
+        self.__output = AtomicFile(self.path, "w", encoding="utf-8", errors="surrogateescape", newline="")
+        return self.__output.file
+
+    def _open_binary(self) -> IO[bytes]:
+        self.__output = AtomicFile(self.path, "wb")
+        return self.__output.file
+
+    def _commit(self) -> None:
+        """Puts the written file in place of the output file."""
+        if self.__output is not None:
+            self.__output.commit()
+
+
+class TextWriter(ResultWriter):
+    """Writes "path — size UNIT" lines.
+
+    Args:
+        path (str): The output file.
+        unit (int, optional): 1 - KB, 2 - MB, 3 - GB. Defaults to 1.
+    """
+
+    def __init__(self, path: str, unit: int = 1) -> None:
+        super().__init__(path)
+        self.__scale, self.__unit = SIZE_UNITS[unit]
+        self.__file = self._open_text()
+
+    def write(self, path: str, size: int) -> None:
+        self.__file.write(f"{path} — {round(size / self.__scale, 2)} {self.__unit}\n")
+        self.count += 1
+
+    def close(self) -> None:
+        self._commit()
+
+
+class CsvWriter(ResultWriter):
+    """Writes a CSV file with the "path" and "size" (bytes) columns."""
+
+    def __init__(self, path: str) -> None:
+        super().__init__(path)
+        self.__file = self._open_text()
+        self.__writer = csv.writer(self.__file)
+        self.__writer.writerow(("path", "size"))
+
+    def write(self, path: str, size: int) -> None:
+        self.__writer.writerow((path, size))
+        self.count += 1
+
+    def close(self) -> None:
+        self._commit()
+
+
+class JsonLinesWriter(ResultWriter):
+    """Writes one JSON object per line: {"path": ..., "size": ...}."""
+
+    def __init__(self, path: str) -> None:
+        super().__init__(path)
+        self.__file = self._open_text()
+        self.__dumps = json.JSONEncoder(ensure_ascii=False).encode
+
+    def write(self, path: str, size: int) -> None:
+        self.__file.write(self.__dumps({"path": path, "size": size}))
+        self.__file.write("\n")
+        self.count += 1
+
+    def close(self) -> None:
+        self._commit()
+
+
+class ColumnarWriter(ResultWriter):
+    """Writes the results column by column into one binary file.
+
+    Layout (all integers are little-endian uint64):
+
+        b"FNDLCOL1"          magic
+        rows                 number of rows
+        size[rows]           file sizes in bytes
+        offset[rows + 1]     offsets of the paths in the blob
+        blob                 UTF-8 paths, one after another
+
+    While writing, every column goes to its own temporary file; `close`
+    concatenates them, so memory use does not depend on the number of rows.
+    """
+
+    MAGIC = b"FNDLCOL1"
+
+    def __init__(self, path: str) -> None:
+        super().__init__(path)
+        self.__sizes = tempfile.TemporaryFile()
+        self.__offsets = tempfile.TemporaryFile()
+        self.__blob = tempfile.TemporaryFile()
+        self.__offset = 0
+        self.__offsets.write(struct.pack("<Q", 0))
+
+    def write(self, path: str, size: int) -> None:
+        raw = path.encode("utf-8", "surrogateescape")
+        self.__blob.write(raw)
+        self.__offset += len(raw)
+        self.__sizes.write(struct.pack("<Q", size))
+        self.__offsets.write(struct.pack("<Q", self.__offset))
+        self.count += 1
+
+    def close(self) -> None:
+        try:
+            out = self._open_binary()
+            out.write(self.MAGIC)
+            out.write(struct.pack("<Q", self.count))
+            for column in (self.__sizes, self.__offsets, self.__blob):
+                column.seek(0)
+                shutil.copyfileobj(column, out, 1024 * 1024)
+        except BaseException:
+            self.discard()
+            raise
+        finally:
+            for column in (self.__sizes, self.__offsets, self.__blob):
+                column.close()
+        self._commit()
+
+    def discard(self) -> None:
+        super().discard()
+        for column in (self.__sizes, self.__offsets, self.__blob):
+            column.close()
+
+
+def read_columnar(path: str) -> tuple[array, Iterator[str]]:
+    """Loads a file written by ColumnarWriter.
+
+    Returns:
+        tuple[array, Iterator[str]]: The sizes as an `array("Q")` and a lazy iterator over the paths.
+    """
+    with open(path, "rb") as f:
+        if f.read(8) != ColumnarWriter.MAGIC:
+            raise ValueError(f"{path} is not a findler columnar file")
+        (rows,) = struct.unpack("<Q", f.read(8))
+        sizes = array("Q")
+        sizes.frombytes(f.read(8 * rows))
+        offsets = array("Q")
+        offsets.frombytes(f.read(8 * (rows + 1)))
+        blob_start = f.tell()
+    if sys.byteorder == "big":  # The file is little-endian
+        sizes.byteswap()
+        offsets.byteswap()
+
+    def paths() -> Iterator[str]:
+        with open(path, "rb") as f:
+            f.seek(blob_start)
+            for i in range(rows):
+                yield f.read(offsets[i + 1] - offsets[i]).decode("utf-8", "surrogateescape")
+
+    return sizes, paths()
+
+
+EXPORT_FORMATS: dict[str, type[ResultWriter]] = {
+    "txt": TextWriter,
+    "csv": CsvWriter,
+    "jsonl": JsonLinesWriter,
+    "columnar": ColumnarWriter,
+}
+
+
+def open_writer(output_format: str, path: str, unit: int = 1) -> ResultWriter:
+    """Creates the writer for the format.
+
+    Raises:
+        ValueError: If the format is unknown.
+    """
+    if output_format not in EXPORT_FORMATS:
+        raise ValueError(
+            f"Unknown output format {output_format!r}, use one of: {', '.join(EXPORT_FORMATS)}"
+        )
+    if output_format == "txt":
+        return TextWriter(path, unit)
+    return EXPORT_FORMATS[output_format](path)
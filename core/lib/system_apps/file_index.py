@@ -0,0 +1,297 @@
+"""
+A module containing the persistent file name index used by findler.
+
+Works like `locate`: paths, sizes and modification times under a root are kept
+in an SQLite database. A refresh only re-reads the directories whose mtime has
+changed since the previous run, so repeat searches become a database lookup.
+"""
+
+import os
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Iterator
+
+from core.lib.path_manager import PathManager
+from core.lib.system_apps.query import Query
+from core.lib.system_apps.scanner import PSEUDO_FILESYSTEMS, ScanStats
+
+
+class FileIndex:
+    """On-disk index of the files under `root`.
+
+    Args:
+        db_path (str): Path to the SQLite database file.
+        root (str, optional): The indexed directory. Defaults to "/".
+        stale_after (float, optional): Age in seconds after which the index is refreshed before a search. Defaults to 600.
+        skip_paths (tuple[str, ...], optional): Directories that are never indexed. Defaults to PSEUDO_FILESYSTEMS.
+        same_filesystem (bool, optional): Do not cross mount points. Defaults to False.
+    """
+
+    DEFAULT_SETTINGS: dict[str, Any] = {
+        "index_root": "/",
+        "index_file": os.path.join("Storage", "Index", "files.db"),
+        "stale_after": 600,
+        "same_filesystem": False,
+    }
+
+    def __init__(
+        self,
+        db_path: str,
+        root: str = "/",
+        *,
+        stale_after: float = 600,
+        skip_paths: tuple[str, ...] = PSEUDO_FILESYSTEMS,
+        same_filesystem: bool = False,
+        workers: int | None = None,
+    ) -> None:
+        self.db_path = db_path
+        self.root = os.path.abspath(root)
+        self.stale_after = stale_after
+        self.skip_paths = frozenset(
+            os.path.abspath(path) for path in skip_paths
+        ) - {self.root}
+        self.same_filesystem = same_filesystem
+        self.workers = workers or min(32, (os.cpu_count() or 1) + 4)
+        self.stats = ScanStats()
+
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.__db = sqlite3.connect(db_path)
+        self.__create_tables()
+        if self.__get_meta("root") not in (None, self.root):
+            # The root was changed in config.json, the old data is useless.
+            self.clear()
+        self.__root_dev: int | None = None
+
+    @classmethod
+    def from_config(cls) -> "FileIndex":
+        """Creates the index using the "findler" section of config.json."""
+        pm = PathManager.shared()
+        settings = {**cls.DEFAULT_SETTINGS, **pm.get_settings("findler")}
+        db_path = settings["index_file"]
+        if not os.path.isabs(db_path):
+            db_path = os.path.join(pm.base_path, db_path)
+        return cls(
+            db_path,
+            settings["index_root"],
+            stale_after=float(settings["stale_after"]),
+            same_filesystem=bool(settings["same_filesystem"]),
+        )
+
+    def __create_tables(self) -> None:
+        """Creates the database schema if it does not exist yet."""
+        self.__db.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+            CREATE TABLE IF NOT EXISTS dirs (
+                path TEXT PRIMARY KEY, parent TEXT, mtime_ns INTEGER
+            );
+            CREATE TABLE IF NOT EXISTS files (
+                path TEXT PRIMARY KEY, dir TEXT, name TEXT, size INTEGER, mtime REAL
+            );
+            CREATE INDEX IF NOT EXISTS dirs_parent ON dirs (parent);
+            CREATE INDEX IF NOT EXISTS files_dir ON files (dir);
+            """
+        )
+
+    def __get_meta(self, key: str) -> str | None:
+        row = self.__db.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def __set_meta(self, key: str, value: object) -> None:
+        self.__db.execute(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, str(value))
+        )
+
+    def age(self) -> float | None:
+        """Seconds since the last refresh. None if the index was never built."""
+        updated = self.__get_meta("updated_at")
+        return time.time() - float(updated) if updated else None
+
+    def is_stale(self) -> bool:
+        """Checks whether the index is older than `stale_after`."""
+        age = self.age()
+        return age is None or age > self.stale_after
+
+    def clear(self) -> None:
+        """Deletes all indexed data."""
+        with self.__db:
+            self.__db.execute("DELETE FROM files")
+            self.__db.execute("DELETE FROM dirs")
+            self.__db.execute("DELETE FROM meta")
+
+    def rebuild(self) -> ScanStats:
+        """Builds the index from scratch."""
+        self.clear()
+        return self.refresh()
+
+    def refresh(self) -> ScanStats:
+        """Brings the index up to date.
+
+        Directories are visited level by level. The directories of one level are
+        inspected in parallel, the database is written from the calling thread.
+        A directory whose mtime did not change is not listed again: its files
+        are kept and its subdirectories are taken from the index.
+        """
+        self.stats = ScanStats()
+        start = time.perf_counter()
+        self.__root_dev = os.stat(self.root).st_dev if self.same_filesystem else None
+
+        frontier = [self.root]
+        with self.__db, ThreadPoolExecutor(max_workers=self.workers) as executor:
+            while frontier:
+                known = {
+                    path: self.__known_dir(path) for path in frontier
+                }
+                inspected = executor.map(
+                    lambda path: self.__inspect(path, *known[path]), frontier
+                )
+                frontier = []
+                for path, mtime_ns, listing, subdirs in inspected:
+                    self.stats.directories += 1
+                    if mtime_ns is None:  # The directory disappeared or is not readable
+                        self.stats.errors += 1
+                        self.__forget(path)
+                        continue
+                    if listing is not None:
+                        self.__store(path, mtime_ns, listing, subdirs, known[path][1])
+                    frontier.extend(subdirs)
+
+            self.__set_meta("root", self.root)
+            self.__set_meta("updated_at", time.time())
+            files = self.__db.execute("SELECT COUNT(*) FROM files").fetchone()[0]
+            self.__set_meta("files", files)
+
+        self.stats.elapsed = time.perf_counter() - start
+        return self.stats
+
+    def __known_dir(self, path: str) -> tuple[int | None, list[str]]:
+        """Returns the stored mtime and subdirectories of the directory."""
+        row = self.__db.execute("SELECT mtime_ns FROM dirs WHERE path = ?", (path,)).fetchone()
+        if row is None:
+            return None, []
+        children = [
+            child for (child,) in self.__db.execute("SELECT path FROM dirs WHERE parent = ?", (path,))
+        ]
+        return row[0], children
+
+    def __inspect(
+        self, path: str, known_mtime: int | None, known_subdirs: list[str]
+    ) -> tuple[str, int | None, list[tuple[str, int, float]] | None, list[str]]:
+        """Reads the directory if it has changed. Runs in a worker thread.
+
+        Returns:
+            tuple: The path, its mtime (None on error), the file listing (None if unchanged) and the subdirectories.
+        """
+        try:
+            mtime_ns = os.stat(path).st_mtime_ns
+        except OSError:
+            return path, None, None, []
+        if mtime_ns == known_mtime:
+            return path, mtime_ns, None, known_subdirs
+
+        listing: list[tuple[str, int, float]] = []
+        subdirs: list[str] = []
+        try:
+            with os.scandir(path) as it:
+                for entry in it:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if self.__descend(entry):
+                                subdirs.append(entry.path)
+                        elif entry.is_file(follow_symlinks=False):
+                            st = entry.stat(follow_symlinks=False)
+                            listing.append((entry.name, st.st_size, st.st_mtime))
+                    except OSError:
+                        continue
+        except OSError:
+            return path, None, None, []
+        return path, mtime_ns, listing, subdirs
+
+    def __descend(self, entry: os.DirEntry[str]) -> bool:
+        """Checks whether the directory should be indexed."""
+        if entry.path in self.skip_paths:
+            return False
+        if self.__root_dev is not None:
+            return entry.stat(follow_symlinks=False).st_dev == self.__root_dev
+        return True
+
+    def __store(
+        self,
+        path: str,
+        mtime_ns: int,
+        listing: list[tuple[str, int, float]],
+        subdirs: list[str],
+        known_subdirs: list[str],
+    ) -> None:
+        """Replaces the stored contents of one directory."""
+        self.stats.entries += len(listing) + len(subdirs)
+        for removed in set(known_subdirs) - set(subdirs):
+            self.__forget(removed)
+
+        parent = os.path.dirname(path) if path != self.root else None
+        self.__db.execute(
+            "INSERT OR REPLACE INTO dirs (path, parent, mtime_ns) VALUES (?, ?, ?)",
+            (path, parent, mtime_ns),
+        )
+        self.__db.execute("DELETE FROM files WHERE dir = ?", (path,))
+        self.__db.executemany(
+            "INSERT OR REPLACE INTO files (path, dir, name, size, mtime) VALUES (?, ?, ?, ?, ?)",
+            (
+                (os.path.join(path, name), path, name.lower(), size, mtime)
+                for name, size, mtime in listing
+            ),
+        )
+        # New subdirectories get a row without mtime, so they are read on this pass.
+        self.__db.executemany(
+            "INSERT OR IGNORE INTO dirs (path, parent, mtime_ns) VALUES (?, ?, NULL)",
+            ((subdir, path) for subdir in subdirs),
+        )
+
+    def __forget(self, path: str) -> None:
+        """Removes the directory and its whole subtree from the index."""
+        prefix = path.rstrip(os.sep) + os.sep
+        # Comparing with the range [prefix, prefix + max char) uses the primary key index.
+        upper = prefix + "\U0010ffff"
+        self.__db.execute("DELETE FROM dirs WHERE path = ? OR (path >= ? AND path < ?)", (path, prefix, upper))
+        self.__db.execute("DELETE FROM files WHERE dir = ? OR (dir >= ? AND dir < ?)", (path, prefix, upper))
+
+    def search(self, query: Query | str) -> Iterator[tuple[str, int]]:
+        """Yields `(path, size)` of the indexed files matching the query.
+
+        The substring and the size/mtime filters are evaluated by SQLite,
+        the remaining name filters of the query are applied to its rows.
+
+        Args:
+            query (Query | str): A compiled query or a case-insensitive part of the file name.
+        """
+        if isinstance(query, str):
+            query = Query(substrings=(query,))
+        start = time.perf_counter()
+        self.stats = ScanStats()
+        self.stats.entries = int(self.__get_meta("files") or 0)
+
+        conditions = ["instr(name, ?) > 0"] * len(query.substrings)
+        parameters: list[object] = list(query.substrings)
+        for condition, value in (
+            ("size >= ?", query.min_size),
+            ("size <= ?", query.max_size),
+            ("mtime >= ?", query.modified_since),
+        ):
+            if value is not None:
+                conditions.append(condition)
+                parameters.append(value)
+        where = " WHERE " + " AND ".join(conditions) if conditions else ""
+
+        cursor = self.__db.execute(f"SELECT path, name, size FROM files{where}", parameters)
+        for path, name, size in cursor:
+            if query.match_name(name):
+                self.stats.matches += 1
+                yield path, size
+        self.stats.elapsed = time.perf_counter() - start
+
+    def close(self) -> None:
+        """Closes the database."""
+        self.__db.close()
@@ -5,26 +5,78 @@
 # https://en.wikipedia.org/wiki/ANSI_escape_code
 
 # Импортирую модули
-import os
 import time
+from typing import Iterable
+
+from core.lib.system_apps.scanner import Scanner, ScanStats
+from core.lib.system_apps.file_index import FileIndex
+from core.lib.system_apps.sorter import ExternalSorter, TopN
+from core.lib.system_apps.query import Query
+from core.lib.system_apps.exporters import EXPORT_FORMATS, open_writer
+from core.lib.path_manager import PathManager
+
+# Куда и в каком формате сохранять результат. Меняется в config.json, раздел "findler":
+# "output_file" - путь к файлу, "output_format" - txt, csv, jsonl или columnar
+DEFAULT_OUTPUT = {"output_file": "saved_path.txt", "output_format": "txt"}
 # Создаю главную функцию
 def findler() -> None:
-# Создаю пустой список, в который добавлю кортежи из двух элементов
-    base_path: list[tuple[str, int]] = []
 # Вызываю функции. Пометил цифрами, чтобы было видно где какая
     welcome() # 1
+    output = {**DEFAULT_OUTPUT, **PathManager.shared().get_settings("findler")}
+    # Проверяем формат заранее, чтобы не узнать об ошибке после долгого поиска
+    if output["output_format"] not in EXPORT_FORMATS:
+        print(f"\033[31mUnknown output_format in config.json: {output['output_format']}. "
+              f"Use one of: {', '.join(EXPORT_FORMATS)}\033[0m")
+        return
     pattern = enter() # 2
+    top = enter_top() # 2.1
     start = time.time() # Тут начинаем отсчёт работы программы
-    search_files(base_path, pattern) # 3
-    choosed = choise() # 4
-    save_to_file(base_path, choosed) # 5
+    base_path = collect(pattern, top) # 3
+    # Единицы измерения нужны только в текстовом формате, в остальных размер в байтах
+    choosed = choise() if output["output_format"] == "txt" else 1 # 4
+    save_to_file(base_path.sorted(), choosed, output["output_file"], output["output_format"], base_path.count) # 5
 # Тут мои созданные фунеции заканчиваются
     end = time.time() # Время, когда все функции прекратили работу
-    print("\033[92mEverything is saved in a file: saved_path.txt\033[0m")
+    print(f"\033[92mEverything is saved in a file: {output['output_file']}\033[0m")
 # Расчитываем время работы программы (именно самого расчёта), а не с момента запуска
     timer = round(end - start, 2)
     print(f"\033[92mThe program is completed in {timer} seconds!\033[0m")
 
+# Поиск без вопросов пользователю - для командной строки (python __main__.py find ...)
+# Возвращает количество сохранённых файлов
+def find(pattern: Query | str, top: int = 0, unit: int = 1, output_file: str | None = None,
+         output_format: str | None = None, use_index: bool = True) -> int:
+    output = {**DEFAULT_OUTPUT, **PathManager.shared().get_settings("findler")}
+    output_file = output_file or output["output_file"]
+    output_format = output_format or output["output_format"]
+    if output_format not in EXPORT_FORMATS: # Ошибку видно сразу, а не после поиска
+        raise ValueError(f"Unknown output format {output_format!r}, use one of: {', '.join(EXPORT_FORMATS)}")
+    if isinstance(pattern, str): # Строка из командной строки - это полный запрос с фильтрами
+        pattern = Query.parse(pattern)
+    base_path = collect(pattern, top, use_index)
+    return save_to_file(base_path.sorted(), unit, output_file, output_format, base_path.count)
+
+# Ищет файлы и собирает их в "сток"
+def collect(pattern: Query | str, top: int = 0, use_index: bool = True) -> ExternalSorter | TopN:
+# Вместо списка - "сток" для кортежей из двух элементов. Память не растёт, сколько бы файлов ни нашлось:
+# TopN держит в куче только N самых больших файлов,
+# ExternalSorter сбрасывает отсортированные куски на диск и потом сливает их
+    base_path = TopN(top) if top else ExternalSorter()
+    if use_index:
+        # Индекс файлов (как locate): диск обходим, только если индекс устарел
+        index = FileIndex.from_config()
+        if index.is_stale():
+            print("\033[33mThe file index is out of date, updating...\033[0m")
+            index.refresh()
+        stats = search_files(base_path, pattern, index=index)
+        index.close()
+    else:
+        stats = search_files(base_path, pattern)
+    # Сколько записей в секунду просмотрел сканер
+    print(f"\033[92mScanned {stats.entries} entries in {round(stats.elapsed, 2)} seconds "
+          f"({round(stats.rate)} entries/s)\033[0m")
+    return base_path
+
 # Приветствие для пользователя
 def welcome(): # 1
     print("\n\t_____________(ﾉಥ益ಥ)ﾉ______________")
@@ -32,26 +84,55 @@ def welcome(): # 1
     print("\t___________________________________\n")
 # Пользователь вводит название файла для поиска
 # Или нажимает Enter для поиска README по умолчанию
-def enter(): # 2
-    prompt = "Enter the name of the file to search for, or by default \033[33mREADME\033[0m\n>> "
-    return (input(prompt) or "README").lower().strip() # В нижний регистр и без пробелов. Возврат
-    # не создаю следующего вида код: x = int(inpit("Что-то")), а сразу пишу к return для экономии кода
+# Кроме части имени можно писать фильтры: *.py, re:^test_, ext:py,md, size>10M, since:7d
+def enter() -> Query: # 2
+    prompt = ("Enter the name of the file to search for, or by default \033[33mREADME\033[0m\n"
+              "Filters: \033[33m*.py re:^test_ ext:py,md size>10M since:7d\033[0m\n>> ")
+    # Запрос компилируется один раз и потом используется для всего обхода
+    while True:
+        try:
+            return Query.parse(input(prompt).strip() or "README")
+        except ValueError as e: # Неверный фильтр - спрашиваем ещё раз
+            print(f"\033[31m{e}\033[0m")
+
+# Сколько самых больших файлов сохранить. Enter - сохранить все
+def enter_top() -> int: # 2.1
+    while True:
+        top = input("How many of the largest files to keep? Press Enter to keep all\n>> ").strip()
+        if not top:
+            return 0
+        if top.isdigit() and int(top) > 0:
+            return int(top)
+        print("Enter a positive number or press Enter")
 
-# Функция, которая ищет файл. Аргументы: пустой список и название файла из функции enter
-def search_files(base_path: list[tuple[str, int]], pattern: str) -> None: # 3
-    # Далее как в лекции, только без count. Счёт будет вестись по-другому методу
-    for path, _ , files in os.walk("/"): # "_" вместо dirs. Не используется
-        for file in files:
-            if pattern in file.lower():
-                # полный путь в переменную для удобства
-                full_path = os.path.join(path, file)
-                # проверка на линки
-                if os.path.islink(full_path):
-                    continue # Тут заканчивается то, что было в лекции
-            # добавляем к пустому списку путь и размер
-                size = os.path.getsize(full_path) # запрашиваем размер файла по пути
+# Функция, которая ищет файл. Аргументы: список (или "сток" с методом append) и название файла из функции enter
+def search_files(base_path: list[tuple[str, int]] | ExternalSorter | TopN, pattern: Query | str, root: str = "/", index: FileIndex | None = None) -> ScanStats: # 3
+    # Строка - это просто часть имени файла, как раньше
+    if isinstance(pattern, str):
+        pattern = Query(substrings=(pattern,))
+    # Если есть индекс - это просто запрос к базе данных, диск не обходим
+    if index is not None:
+        base_path.extend(index.search(pattern))
+        return index.stats
+    # Вместо os.walk - Scanner: он обходит папки параллельно через os.scandir
+    # и пропускает /proc, /sys и /dev, в которых нет настоящих файлов.
+    scanner = Scanner(root)
+    # DirEntry уже знает, ссылка это или нет, и хранит размер файла,
+    # поэтому os.path.islink и os.path.getsize больше не нужны.
+    # pattern.match сначала проверяет имя и только потом, если нужно, вызывает stat
+    for full_path, size in scanner.scan(pattern.match):
 # base_path - список, в котором кортежи из двух значений full_path и size
-                base_path.append((full_path, size))
+        base_path.append((full_path, size))
+    return scanner.stats # Статистика: сколько записей просмотрено и за сколько секунд
+
+# Полная перестройка индекса (пункт меню "Обновить индекс файлов")
+def rebuild_index() -> None:
+    index = FileIndex.from_config()
+    print(f"\033[33mIndexing {index.root}...\033[0m")
+    stats = index.rebuild()
+    index.close()
+    print(f"\033[92mIndexed {stats.entries} entries in {stats.directories} directories "
+          f"in {round(stats.elapsed, 2)} seconds ({round(stats.rate)} entries/s)\033[0m")
 
 def choise(): # 4
     prompt = "Select the displayed size:\033[32m\n1 - KB\n2 - MB\n3 - GB\033[0m"
@@ -69,20 +150,21 @@ def choise(): # 4
             print("Enter a valid number: 1, 2 or 3")
 
 # Функция для сохранения пути в файл
-def save_to_file(base_path: list[tuple[str, int]], choosed: int) -> None: # 5
-    # Создаю два словаря со значениями и единицами измерения. Словарь (dict) - изменяемый, контейнерный тип данных. Ключ: значение
-    scale = {1: 1024, 2: 1024**2, 3: 1024**3}
-    units = {1: "KB", 2: "MB", 3: "GB"}
-    # Анонимная функция для сортировки. Благодаря ей - меньше кода
-    base_path.sort(key=lambda x: x[1], reverse=False) # Мы вызываем метод sort, поэтому можно менять сортировку. Как в лекциях. Специально оставил reverse
+# Принимает уже отсортированные кортежи и пишет их по одному, не собирая в памяти
+# found - сколько файлов нашлось всего: с TopN сохраняются не все
+def save_to_file(base_path: Iterable[tuple[str, int]], choosed: int, output_file: str = "saved_path.txt", output_format: str = "txt", found: int | None = None) -> int: # 5
+    # Если передали обычный список - сортируем его, как раньше
+    if isinstance(base_path, list):
+        base_path.sort(key=lambda x: x[1], reverse=False) # Мы вызываем метод sort, поэтому можно менять сортировку. Как в лекциях. Специально оставил reverse
     # Менеджер контекста для работы с файлами. Сразу закрывает файл
-    with open("saved_path.txt", "w", encoding="utf-8") as f: # Задаю кодировку UTF-8. w - перезаписывать файл и f -  переменная
-        # Распаковываю base_path, в котором хранится путь и размер (напоминаю, что это список внутри которого кортежи, в которых в свою очередь 2 элемента)
-        for path, size in base_path:
-            total_size = round(size / scale[choosed], 2) # Сюда пишу размер из функции choise и округляю
-            # Метод для записи строки в файл
-            f.write(f"{path} — {total_size} {units[choosed]}\n") # Путь - (тире) размер и обозначение величины - так будет в файле
-    print(f"\033[92mIt's done! Files found: {len(base_path)}\033[0m")
+    # Писатель зависит от формата: txt ("путь — размер KB"), csv, jsonl или бинарный columnar (см. exporters.py)
+    with open_writer(output_format, output_file, choosed) as writer:
+        count = writer.write_all(base_path) # Пишем по одной строке, len() у потока нет
+    if found is None or found == count:
+        print(f"\033[92mIt's done! Files found: {count}\033[0m")
+    else:
+        print(f"\033[92mIt's done! Files found: {found}, saved the {count} largest\033[0m")
+    return count
 
 # Для импорта
 if __name__ == "__main__":
@@ -0,0 +1,165 @@
+"""
+A module containing the compiled search query used by findler.
+
+A query is written as space separated terms:
+
+    readme              the name contains "readme" (case-insensitive)
+    *.py  report_??.csv the name matches the glob
+    re:^test_.*\\.py$    the name matches the regular expression
+    ext:py,md           the name ends with one of the extensions
+    size>10M  size<=1G  the size limits (B, K, M, G, T; powers of 1024)
+    since:2024-01-31    modified on or after the date
+    since:7d            modified during the last 7 days (s, m, h, d, w)
+
+All terms must match. The name terms are checked first, so a file rejected by
+its name never costs a `stat` call.
+"""
+
+import fnmatch
+import os
+import re
+import time
+from datetime import datetime
+from typing import Callable
+
+_SIZE_UNITS = {"": 1, "B": 1, "K": 1024, "M": 1024**2, "G": 1024**3, "T": 1024**4}
+_AGE_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400, "w": 604800}
+
+_SIZE_TERM = re.compile(r"size(>=|<=|>|<|=)(\d+(?:\.\d+)?)([BKMGT]?)B?", re.IGNORECASE)
+_AGE_TERM = re.compile(r"(\d+)([smhdw])")
+
+
+class Query:
+    """A search query compiled once and reused for every file of the walk.
+
+    Args:
+        substrings (tuple[str, ...], optional): Parts of the name. Defaults to ().
+        globs (tuple[str, ...], optional): Shell patterns for the whole name. Defaults to ().
+        regexes (tuple[str, ...], optional): Regular expressions searched in the name. Defaults to ().
+        extensions (tuple[str, ...], optional): Allowed extensions, with or without the dot. Defaults to ().
+        min_size (int | None, optional): Minimal size in bytes. Defaults to None.
+        max_size (int | None, optional): Maximal size in bytes. Defaults to None.
+        modified_since (float | None, optional): Minimal mtime as a timestamp. Defaults to None.
+    """
+
+    def __init__(
+        self,
+        *,
+        substrings: tuple[str, ...] = (),
+        globs: tuple[str, ...] = (),
+        regexes: tuple[str, ...] = (),
+        extensions: tuple[str, ...] = (),
+        min_size: int | None = None,
+        max_size: int | None = None,
+        modified_since: float | None = None,
+    ) -> None:
+        self.substrings = tuple(s.lower() for s in substrings)
+        self.extensions = frozenset("." + ext.lower().lstrip(".") for ext in extensions)
+        self.min_size = min_size
+        self.max_size = max_size
+        self.modified_since = modified_since
+
+        # Names are lowered once, so the patterns are compiled for lower case.
+        self.__name_patterns: tuple[Callable[[str], object], ...] = tuple(
+            re.compile(fnmatch.translate(glob.lower())).match for glob in globs
+        ) + tuple(re.compile(regex, re.IGNORECASE).search for regex in regexes)
+        self.__extensions = tuple(self.extensions)  # str.endswith needs a tuple
+        self.needs_stat = (
+            min_size is not None or max_size is not None or modified_since is not None
+        )
+
+    @classmethod
+    def parse(cls, text: str) -> "Query":
+        """Compiles the query text.
+
+        Raises:
+            ValueError: If a term cannot be understood.
+        """
+        substrings: list[str] = []
+        globs: list[str] = []
+        regexes: list[str] = []
+        extensions: list[str] = []
+        min_size = max_size = None
+        modified_since = None
+
+        for term in text.split():
+            lowered = term.lower()
+            if lowered.startswith("re:"):
+                try:
+                    re.compile(term[3:])
+                except re.error as e:
+                    raise ValueError(f"Invalid regular expression {term[3:]!r}: {e}") from None
+                regexes.append(term[3:])
+            elif lowered.startswith("ext:"):
+                extensions.extend(ext for ext in term[4:].split(",") if ext)
+            elif lowered.startswith("since:"):
+                modified_since = cls.__parse_since(term[6:])
+            elif lowered.startswith(("size>", "size<", "size=")):
+                match = _SIZE_TERM.fullmatch(term)
+                if match is None:
+                    raise ValueError(f"Invalid size filter {term!r}, for example: size>10M")
+                op, number, unit = match.groups()
+                value = int(float(number) * _SIZE_UNITS[unit.upper()])
+                if op in (">", ">="):
+                    min_size = value + (op == ">")
+                elif op in ("<", "<="):
+                    max_size = value - (op == "<")
+                else:
+                    min_size = max_size = value
+            elif any(char in term for char in "*?["):
+                globs.append(term)
+            else:
+                substrings.append(term)
+
+        return cls(
+            substrings=tuple(substrings),
+            globs=tuple(globs),
+            regexes=tuple(regexes),
+            extensions=tuple(extensions),
+            min_size=min_size,
+            max_size=max_size,
+            modified_since=modified_since,
+        )
+
+    @staticmethod
+    def __parse_since(value: str) -> float:
+        """Turns "7d" or "2024-01-31" into a timestamp."""
+        match = _AGE_TERM.fullmatch(value.lower())
+        if match:
+            return time.time() - int(match.group(1)) * _AGE_UNITS[match.group(2)]
+        try:
+            return datetime.fromisoformat(value).timestamp()
+        except ValueError:
+            raise ValueError(f"Invalid date {value!r}, for example: since:2024-01-31 or since:7d") from None
+
+    def match_name(self, name: str) -> bool:
+        """Checks the cheap name filters."""
+        name = name.lower()
+        for substring in self.substrings:
+            if substring not in name:
+                return False
+        if self.__extensions and not name.endswith(self.__extensions):
+            return False
+        for pattern in self.__name_patterns:
+            if not pattern(name):
+                return False
+        return True
+
+    def match_stat(self, size: int, mtime: float) -> bool:
+        """Checks the filters that need the file metadata."""
+        if self.min_size is not None and size < self.min_size:
+            return False
+        if self.max_size is not None and size > self.max_size:
+            return False
+        if self.modified_since is not None and mtime < self.modified_since:
+            return False
+        return True
+
+    def match(self, entry: os.DirEntry[str]) -> bool:
+        """Checks a directory entry. `stat` is called only if the name matched."""
+        if not self.match_name(entry.name):
+            return False
+        if not self.needs_stat:
+            return True
+        st = entry.stat(follow_symlinks=False)  # Cached by DirEntry, reused for the size
+        return self.match_stat(st.st_size, st.st_mtime)
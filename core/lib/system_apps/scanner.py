@@ -0,0 +1,166 @@
+"""
+A module containing the file system scanner used by findler.
+
+The scanner walks directories with `os.scandir`, so the file type and the
+`stat` result come from the cached `DirEntry` instead of separate
+`os.path.islink`/`os.path.getsize` calls. Subtrees are scanned in parallel on
+a thread pool and the matches are streamed back to the caller.
+"""
+
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterator
+
+# Virtual file systems that contain no real files, only kernel objects.
+PSEUDO_FILESYSTEMS: tuple[str, ...] = ("/proc", "/sys", "/dev")
+
+# The end-of-scan marker placed in the result queue.
+_DONE = object()
+
+
+class ScanStats:
+    """Counters collected during a single scan."""
+
+    def __init__(self) -> None:
+        self.entries = 0  # Every directory entry that was looked at
+        self.directories = 0  # Directories that were opened
+        self.matches = 0
+        self.errors = 0  # Directories or entries we had no access to
+        self.elapsed = 0.0
+
+    @property
+    def rate(self) -> float:
+        """Scanned entries per second."""
+        if self.elapsed <= 0:
+            return float(self.entries)
+        return self.entries / self.elapsed
+
+
+class Scanner:
+    """Parallel, pruned directory walker.
+
+    Args:
+        root (str, optional): The directory to start from. Defaults to "/".
+        workers (int | None, optional): Number of threads. Defaults to the `ThreadPoolExecutor` default.
+        skip_paths (tuple[str, ...], optional): Directories that are never entered. Defaults to PSEUDO_FILESYSTEMS.
+        same_filesystem (bool, optional): Do not cross mount points (like `find -xdev`). Defaults to False.
+    """
+
+    def __init__(
+        self,
+        root: str = "/",
+        *,
+        workers: int | None = None,
+        skip_paths: tuple[str, ...] = PSEUDO_FILESYSTEMS,
+        same_filesystem: bool = False,
+    ) -> None:
+        self.root = os.path.abspath(root)
+        self.workers = workers or min(32, (os.cpu_count() or 1) + 4)
+        # The root itself is always scanned, even if it is in the list.
+        self.skip_paths = frozenset(
+            os.path.abspath(path) for path in skip_paths
+        ) - {self.root}
+        self.same_filesystem = same_filesystem
+        self.stats = ScanStats()
+
+        self.__lock = threading.Lock()
+        self.__stop = threading.Event()
+        self.__pending = 0
+        self.__root_dev: int | None = None
+
+    def scan(self, match: Callable[[os.DirEntry[str]], bool]) -> Iterator[tuple[str, int]]:
+        """Walks the tree and yields `(path, size)` of regular files accepted by `match`.
+
+        Symbolic links are neither followed nor reported.
+
+        Args:
+            match (Callable[[os.DirEntry[str]], bool]): A filter for file entries.
+
+        Yields:
+            Iterator[tuple[str, int]]: The full path and the size in bytes.
+        """
+        self.stats = ScanStats()
+        self.__stop.clear()
+        if self.same_filesystem:
+            self.__root_dev = os.stat(self.root).st_dev
+
+        # Bounded, so that a slow consumer does not let the matches pile up in memory.
+        results: queue.Queue = queue.Queue(maxsize=self.workers * 4)
+        start = time.perf_counter()
+        executor = ThreadPoolExecutor(max_workers=self.workers)
+        self.__pending = 1
+        executor.submit(self.__scan_dir, executor, results, self.root, match)
+
+        finished = False
+        try:
+            while True:
+                batch = results.get()
+                if batch is _DONE:
+                    finished = True
+                    break
+                yield from batch
+        finally:
+            # The consumer stopped early: cancel the walk and unblock the workers.
+            if not finished:
+                self.__stop.set()
+                while results.get() is not _DONE:
+                    pass
+            executor.shutdown(wait=True)
+            self.stats.elapsed = time.perf_counter() - start
+
+    def __descend(self, entry: os.DirEntry[str]) -> bool:
+        """Checks whether the scanner should enter the directory."""
+        if entry.path in self.skip_paths:
+            return False
+        if self.__root_dev is not None:
+            # DirEntry caches the result, no extra syscall for the same entry.
+            return entry.stat(follow_symlinks=False).st_dev == self.__root_dev
+        return True
+
+    def __scan_dir(
+        self,
+        executor: ThreadPoolExecutor,
+        results: queue.Queue,
+        path: str,
+        match: Callable[[os.DirEntry[str]], bool],
+    ) -> None:
+        """Scans one directory and schedules its subdirectories."""
+        found: list[tuple[str, int]] = []
+        entries = errors = 0
+        try:
+            if self.__stop.is_set():
+                return
+            with os.scandir(path) as it:
+                for entry in it:
+                    entries += 1
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if self.__descend(entry):
+                                with self.__lock:
+                                    self.__pending += 1
+                                executor.submit(
+                                    self.__scan_dir, executor, results, entry.path, match
+                                )
+                        elif entry.is_file(follow_symlinks=False) and match(entry):
+                            found.append(
+                                (entry.path, entry.stat(follow_symlinks=False).st_size)
+                            )
+                    except OSError:
+                        errors += 1
+        except OSError:
+            errors += 1
+        finally:
+            if found:
+                results.put(found)
+            with self.__lock:
+                self.stats.entries += entries
+                self.stats.directories += 1
+                self.stats.matches += len(found)
+                self.stats.errors += errors
+                self.__pending -= 1
+                done = self.__pending == 0
+            if done:
+                results.put(_DONE)
@@ -0,0 +1,153 @@
+"""
+A module containing bounded-memory sinks for findler results.
+
+`ExternalSorter` writes the results to sorted run files on disk as they are
+found and merges the runs at the end (external merge sort). `TopN` keeps only
+the N largest files in a heap. Both have `append`, so they can be used
+anywhere findler used a plain list.
+"""
+
+import heapq
+import os
+import shutil
+import struct
+import tempfile
+from typing import BinaryIO, Iterator
+
+# One record of a run file: size (8 bytes), path length (4 bytes), then the path.
+_RECORD = struct.Struct("<QI")
+
+
+def _encode(path: str) -> bytes:
+    # surrogateescape keeps file names that are not valid UTF-8
+    return path.encode("utf-8", "surrogateescape")
+
+
+def _decode(raw: bytes) -> str:
+    return raw.decode("utf-8", "surrogateescape")
+
+
+class ExternalSorter:
+    """Sorts `(path, size)` pairs by size using a fixed amount of memory.
+
+    Args:
+        chunk_size (int, optional): How many pairs are kept in memory before a run is written to disk. Defaults to 100_000.
+        reverse (bool, optional): Largest files first. Defaults to False.
+        tmp_dir (str | None, optional): Where the run files are created. Defaults to the system temp directory.
+    """
+
+    def __init__(
+        self, chunk_size: int = 100_000, *, reverse: bool = False, tmp_dir: str | None = None
+    ) -> None:
+        self.chunk_size = chunk_size
+        self.reverse = reverse
+        self.count = 0
+        self.__tmp_dir = tmp_dir
+        self.__workdir: str | None = None
+        self.__buffer: list[tuple[str, int]] = []
+        self.__runs: list[str] = []
+
+    def __len__(self) -> int:
+        return self.count
+
+    def append(self, item: tuple[str, int]) -> None:
+        """Adds a result. Spills a sorted run to disk when the buffer is full."""
+        self.__buffer.append(item)
+        self.count += 1
+        if len(self.__buffer) >= self.chunk_size:
+            self.__spill()
+
+    def extend(self, items: "Iterator[tuple[str, int]] | list[tuple[str, int]]") -> None:
+        """Adds several results."""
+        for item in items:
+            self.append(item)
+
+    def __key(self, item: tuple[str, int]) -> int:
+        return item[1]
+
+    def __spill(self) -> None:
+        """Writes the sorted buffer as a new run file."""
+        if self.__workdir is None:
+            self.__workdir = tempfile.mkdtemp(prefix="findler_", dir=self.__tmp_dir)
+        self.__buffer.sort(key=self.__key, reverse=self.reverse)
+        run_path = os.path.join(self.__workdir, f"run_{len(self.__runs)}.bin")
+        with open(run_path, "wb") as f:
+            for path, size in self.__buffer:
+                raw = _encode(path)
+                f.write(_RECORD.pack(size, len(raw)))
+                f.write(raw)
+        self.__runs.append(run_path)
+        self.__buffer = []
+
+    @staticmethod
+    def __read_run(f: BinaryIO) -> Iterator[tuple[str, int]]:
+        """Reads the records of one run file."""
+        while True:
+            header = f.read(_RECORD.size)
+            if not header:
+                return
+            size, length = _RECORD.unpack(header)
+            yield _decode(f.read(length)), size
+
+    def sorted(self) -> Iterator[tuple[str, int]]:
+        """Yields all results in size order, then removes the run files."""
+        self.__buffer.sort(key=self.__key, reverse=self.reverse)
+        if not self.__runs:
+            yield from self.__buffer
+            return
+
+        files = [open(run_path, "rb", buffering=64 * 1024) for run_path in self.__runs]
+        try:
+            runs = [self.__read_run(f) for f in files]
+            yield from heapq.merge(*runs, self.__buffer, key=self.__key, reverse=self.reverse)
+        finally:
+            for f in files:
+                f.close()
+            self.close()
+
+    def close(self) -> None:
+        """Deletes the temporary run files."""
+        if self.__workdir is not None:
+            shutil.rmtree(self.__workdir, ignore_errors=True)
+            self.__workdir = None
+        self.__runs = []
+        self.__buffer = []
+
+
+class TopN:
+    """Keeps the `n` largest `(path, size)` pairs in a min-heap.
+
+    Args:
+        n (int): How many files to keep.
+    """
+
+    def __init__(self, n: int) -> None:
+        self.n = n
+        self.count = 0  # All the results that were offered, not only the kept ones
+        self.__heap: list[tuple[int, str]] = []
+
+    def __len__(self) -> int:
+        return len(self.__heap)
+
+    def append(self, item: tuple[str, int]) -> None:
+        """Offers a result. It is kept only if it is among the `n` largest."""
+        path, size = item
+        self.count += 1
+        if len(self.__heap) < self.n:
+            heapq.heappush(self.__heap, (size, path))
+        elif size > self.__heap[0][0]:
+            heapq.heapreplace(self.__heap, (size, path))
+
+    def extend(self, items: "Iterator[tuple[str, int]] | list[tuple[str, int]]") -> None:
+        """Offers several results."""
+        for item in items:
+            self.append(item)
+
+    def sorted(self) -> Iterator[tuple[str, int]]:
+        """Yields the kept results, largest first."""
+        for size, path in sorted(self.__heap, reverse=True):
+            yield path, size
+
+    def close(self) -> None:
+        """Nothing is stored on disk. Present for symmetry with ExternalSorter."""
+        self.__heap = []
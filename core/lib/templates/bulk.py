@@ -0,0 +1,208 @@
+"""
+A module that creates many notes at once from a manifest file.
+
+A manifest is a CSV file with a header row, a JSON array of objects or
+a JSON Lines file (.jsonl). Every row is one note:
+
+    type,title,tags,doc_number,year,law_type,short_name,path
+    law,Гражданский кодекс,право;кодекс,51-ФЗ,1994,civil,ГК РФ,
+
+"title" is required. "type" is a key of TEMPLATE_TYPES or the name of a
+template in configs/templates (the default type is used if it is missing);
+such a template is saved to the path with its name in config.json. "tags" is a list or a string separated by
+";", "," or spaces, "path" works like in `TemplatesHandler.build_item`.
+The other fields are passed to the template class as arguments.
+Nothing is asked: every row ends up in the report as saved or failed, a row
+that cannot be parsed (a broken JSON line) included.
+The files are written to temporary files and appear together at the end
+(see atomic_write.py).
+"""
+
+import csv
+import json
+import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Iterable, Iterator, NamedTuple
+
+from core.lib.templates.patterns import LawTopic, TemplateMd, Topic, template_class
+from core.utilits.atomic_write import BatchCommitError, FsyncBatch
+
+# Type name -> (template class, key of the default path in config.json)
+TEMPLATE_TYPES: dict[str, tuple[type[TemplateMd], str]] = {
+    "topic": (Topic, "topic"),
+    "law": (LawTopic, "law"),
+}
+
+_TAG_SEPARATORS = re.compile(r"[;,\s]+")
+
+
+def register_template(name: str, cls: type[TemplateMd], path_key: str) -> None:
+    """Makes a template class available to the manifests as `type: name`."""
+    TEMPLATE_TYPES[name] = (cls, path_key)
+
+
+class ManifestRow(NamedTuple):
+    """One row of a manifest."""
+
+    line: int  # The line of the file (.csv, .jsonl) or the number of the object in the array (.json), from 1
+    data: Any  # The parsed row, None if it could not be parsed
+    error: str | None = None  # Why the row could not be parsed
+
+
+class BulkResult(NamedTuple):
+    """The outcome of one manifest row."""
+
+    line: int  # See ManifestRow.line
+    title: str
+    path: str | None  # The saved file
+    error: str | None  # Why the note was not created
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def read_manifest(path: str) -> Iterator[ManifestRow]:
+    """Reads the rows of a .csv, .json or .jsonl manifest.
+
+    A line of a .jsonl file that is not valid JSON becomes a row with an error,
+    the other rows are still read.
+
+    Raises:
+        ValueError: If the format is unknown or the JSON is not a list of objects.
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".csv":
+        with open(path, "r", encoding="utf-8-sig", newline="") as f:
+            reader = csv.DictReader(f)
+            for row in reader:
+                yield ManifestRow(reader.line_num, row)
+    elif extension == ".jsonl":
+        with open(path, "r", encoding="utf-8") as f:
+            for number, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    yield ManifestRow(number, json.loads(line))
+                except ValueError as e:
+                    yield ManifestRow(number, None, f"{type(e).__name__}: {e}")
+    elif extension == ".json":
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if not isinstance(data, list):
+            raise ValueError(f"{path}: expected a JSON array of objects")
+        for number, row in enumerate(data, 1):
+            yield ManifestRow(number, row)
+    else:
+        raise ValueError(f"{path}: unknown manifest format, use .csv, .json or .jsonl")
+
+
+class BulkGenerator:
+    """Creates the notes of a manifest with a pool of worker threads.
+
+    Args:
+        paths (dict[str, str]): The default directories (`PathManager.paths`).
+        default_type (str, optional): The type of the rows without "type". Defaults to "topic".
+        workers (int | None, optional): The number of threads. Defaults to min(8, CPUs + 4).
+        overwrite (bool, optional): Replace the existing files instead of reporting them. Defaults to False.
+    """
+
+    def __init__(
+        self,
+        paths: dict[str, str],
+        *,
+        default_type: str = "topic",
+        workers: int | None = None,
+        overwrite: bool = False,
+    ) -> None:
+        self.__template(default_type)  # Fails early on an unknown type
+        self.paths = paths
+        self.default_type = default_type
+        self.workers = workers or min(8, (os.cpu_count() or 1) + 4)
+        self.overwrite = overwrite
+        self.__lock = threading.Lock()
+        self.__targets: set[str] = set()  # The files taken by the rows of this run
+
+    def generate(self, rows: Iterable[ManifestRow | dict[str, Any]]) -> list[BulkResult]:
+        """Creates a note for every row.
+
+        Args:
+            rows (Iterable[ManifestRow | dict[str, Any]]): The rows of `read_manifest`, or plain dicts numbered from 1.
+
+        Returns:
+            list[BulkResult]: One result per row, in the order of the manifest.
+        """
+        # The whole manifest is read before any note is rendered: an unreadable
+        # file fails here and does not throw away the notes already written
+        numbered = [
+            row if isinstance(row, ManifestRow) else ManifestRow(number, row)
+            for number, row in enumerate(rows, 1)
+        ]
+        self.__targets.clear()
+        with FsyncBatch() as batch:
+            with ThreadPoolExecutor(max_workers=self.workers) as executor:
+                results = list(executor.map(lambda row: self.__create(row, batch), numbered))
+            try:
+                batch.commit()
+            except BatchCommitError as e:  # The other files of the batch are in place
+                return [
+                    result._replace(path=None, error=f"{type(e.failed[result.path]).__name__}: {e.failed[result.path]}")
+                    if result.path in e.failed else result
+                    for result in results
+                ]
+        return results
+
+    def __create(self, manifest_row: ManifestRow, batch: FsyncBatch) -> BulkResult:
+        """Creates one note. Runs in a worker thread and never raises."""
+        line, row, error = manifest_row
+        if error is not None:
+            return BulkResult(line, "", None, error)
+        title = ""
+        try:
+            if not isinstance(row, dict):
+                raise ValueError("the row is not an object")
+            fields = {
+                key.strip(): value for key, value in row.items()
+                if key and value not in (None, "")
+            }
+            title = str(fields.pop("title", "")).strip()
+            if not title:
+                raise ValueError("no title")
+            cls, path_key = self.__template(str(fields.pop("type", self.default_type)))
+            tags = self.__tags(fields.pop("tags", None))
+            path = fields.pop("path", None)
+            # The CSV and JSON numbers become strings, the templates expect text
+            extra = {key: str(value) for key, value in fields.items()}
+
+            item = cls(title=title, tags=tags, **extra)
+            if path is None:
+                if path_key not in self.paths:
+                    raise ValueError(f"no {path_key!r} in the paths of config.json, give the row a path")
+                item.set_default_path(self.paths[path_key])
+            target = os.path.abspath(item.prepare(path))
+            with self.__lock:
+                if target in self.__targets:
+                    raise ValueError(f"{target} is created by another row")
+                if os.path.exists(target) and not self.overwrite:
+                    raise ValueError(f"{target} already exists")
+                self.__targets.add(target)
+            item.start(quiet=True, batch=batch)
+            return BulkResult(line, title, target, None)
+        except Exception as e:  # One bad row must not stop the others
+            return BulkResult(line, title, None, f"{type(e).__name__}: {e}")
+
+    @staticmethod
+    def __template(name: str) -> tuple[type[TemplateMd], str]:
+        if name in TEMPLATE_TYPES:
+            return TEMPLATE_TYPES[name]
+        return template_class(name), name
+
+    @staticmethod
+    def __tags(value: Any) -> list[str] | None:
+        if value is None:
+            return None
+        if isinstance(value, str):
+            value = _TAG_SEPARATORS.split(value)
+        return [str(tag).strip().lstrip("#") for tag in value if str(tag).strip()] or None
@@ -0,0 +1,181 @@
+"""
+A module that loads the templates described as data.
+
+A template is a JSON file named after it in user/configs/templates or
+core/configs/templates (the user's file wins):
+
+    {
+      "description": "Создает шаблон для тем по праву",
+      "title": "Название темы/документа",     the default title
+      "emoticon": "⚖️",
+      "suffix": "_law",                       the end of the file names
+      "fields": {"doc_number": null, "author": "Автор"},
+      "sections": [
+        {"title": "😸 Общая информация", "items": ["Номер документа: {doc_number}"]},
+        {"title": "😼 Синтаксис", "code": "print()", "language": "python"}
+      ]
+    }
+
+"fields" are the extra arguments of the template with their default values.
+An item with `{field}` is shown only if the field has a value; use `{{` and `}}`
+for literal braces. Only the requested file is read, and it is compiled into a
+`TemplatePlan` once and reused until the file changes.
+"""
+
+import os
+from string import Formatter
+from typing import TYPE_CHECKING, Any, Mapping, NamedTuple
+
+from core.lib.path_manager import PathManager, read_json
+
+if TYPE_CHECKING:
+    from core.lib.templates.patterns import TemplateMd
+
+_formatter = Formatter()
+
+
+class PlanItem(NamedTuple):
+    text: str
+    fields: tuple[str, ...]  # The placeholders; empty - the text is used as it is
+
+
+class PlanSection(NamedTuple):
+    title: str
+    items: tuple[PlanItem, ...]
+    code: str | None = None  # Not None - a block of code instead of the items
+    language: str = "python"
+
+
+class TemplatePlan(NamedTuple):
+    """A compiled template definition."""
+
+    name: str
+    description: str
+    title: str
+    emoticon: str
+    suffix: str
+    fields: dict[str, str | None]
+    sections: tuple[PlanSection, ...]
+
+    def render(self, note: "TemplateMd", values: Mapping[str, Any]) -> None:
+        """Adds the sections of the template to the note.
+
+        Args:
+            note (TemplateMd): The note being built.
+            values (Mapping[str, Any]): The values of the fields, missing ones take their defaults.
+        """
+        fields = {key: values.get(key, default) for key, default in self.fields.items()}
+        for section in self.sections:
+            if section.code is not None:
+                note.add_code_section(section.title, section.code, section.language)
+                continue
+            items = []
+            for item in section.items:
+                if not item.fields:
+                    items.append(item.text)
+                elif all(fields[field] not in (None, "") for field in item.fields):
+                    items.append(item.text.format_map(fields))
+            note.add_section(section.title, items)
+
+
+# path -> (the parsed JSON the plan was compiled from, the plan)
+_plans: dict[str, tuple[Any, TemplatePlan]] = {}
+
+
+def available_templates() -> list[str]:
+    """The names of all the templates, the user's and the core ones."""
+    names: set[str] = set()
+    for directory in PathManager.shared().get_template_dirs():
+        try:
+            names.update(file[:-5] for file in os.listdir(directory) if file.endswith(".json"))
+        except OSError:
+            continue
+    return sorted(names)
+
+
+def template_suffixes() -> set[str]:
+    """The file name endings of all the templates, e.g. "_topic". A definition that cannot be read is skipped."""
+    suffixes: set[str] = set()
+    for name in available_templates():
+        try:
+            suffixes.add(load_plan(name).suffix)
+        except ValueError:
+            continue
+    suffixes.discard("")
+    return suffixes
+
+
+def load_plan(name: str) -> TemplatePlan:
+    """Returns the compiled template. The file is compiled again only after it changes.
+
+    Raises:
+        ValueError: If there is no such template or its definition is invalid.
+    """
+    path = PathManager.shared().get_template_path(name)
+    if path is None:
+        raise ValueError(f"Unknown template {name!r}, use one of: {', '.join(available_templates())}")
+    try:
+        data = read_json(path)
+    except (OSError, ValueError) as e:
+        raise ValueError(f"{path}: {e}") from None
+    cached = _plans.get(path)
+    if cached is not None and cached[0] is data:  # read_json returns the same object until the file changes
+        return cached[1]
+    plan = compile_plan(name, data, path)
+    _plans[path] = (data, plan)
+    return plan
+
+
+def compile_plan(name: str, data: Any, source: str = "<template>") -> TemplatePlan:
+    """Checks a definition and turns it into a plan.
+
+    Raises:
+        ValueError: If the definition is invalid. The message names the source and the section.
+    """
+    if not isinstance(data, dict):
+        raise ValueError(f"{source}: the template must be a JSON object")
+    fields = data.get("fields") or {}
+    if not isinstance(fields, dict):
+        raise ValueError(f"{source}: \"fields\" must be an object")
+    raw_sections = data.get("sections")
+    if not isinstance(raw_sections, list):
+        raise ValueError(f"{source}: \"sections\" must be a list")
+
+    sections = []
+    for number, raw in enumerate(raw_sections, 1):
+        where = f"{source}: section {number}"
+        if not isinstance(raw, dict) or not isinstance(raw.get("title"), str):
+            raise ValueError(f"{where}: a section must be an object with a \"title\"")
+        if "code" in raw:
+            if not isinstance(raw["code"], str):
+                raise ValueError(f"{where}: \"code\" must be a string")
+            sections.append(PlanSection(raw["title"], (), raw["code"], str(raw.get("language", "python"))))
+            continue
+        items = raw.get("items", [])
+        if not isinstance(items, list):
+            raise ValueError(f"{where}: \"items\" must be a list")
+        sections.append(PlanSection(raw["title"], tuple(_compile_item(str(item), fields, where) for item in items)))
+
+    return TemplatePlan(
+        name=name,
+        description=str(data.get("description", "")),
+        title=str(data.get("title", "Название титульника")),
+        emoticon=str(data.get("emoticon", "📝")),
+        suffix=str(data.get("suffix", f"_{name}")),
+        fields=fields,
+        sections=tuple(sections),
+    )
+
+
+def _compile_item(text: str, fields: dict[str, Any], where: str) -> PlanItem:
+    try:
+        parts = list(_formatter.parse(text))
+    except ValueError as e:
+        raise ValueError(f"{where}: {text!r}: {e}") from None
+    names = tuple(field for _, field, _, _ in parts if field is not None)
+    unknown = [field for field in names if field not in fields]
+    if unknown:
+        raise ValueError(f"{where}: {text!r} uses unknown fields: {', '.join(unknown)}")
+    if names:
+        return PlanItem(text, names)
+    return PlanItem("".join(literal for literal, _, _, _ in parts), ())
@@ -0,0 +1,491 @@
+"""
+A module containing the persistent index of the notes created from templates.
+
+The title, tags, creation date and size of every .md file under the storage
+directories (`PathManager.paths`, nested folders included) are kept in an
+SQLite database, together with an inverted index of the words for the
+full-text search. A refresh parses only the files whose mtime or size has
+changed, so listing and searching thousands of notes does not read them again.
+"""
+
+import math
+import os
+import re
+import sqlite3
+import time
+from collections import Counter
+from typing import Any, Iterable, NamedTuple
+
+from core.lib.path_manager import PathManager
+from core.lib.templates.definitions import template_suffixes
+from core.lib.templates.tag_query import evaluate, parse_tag_query
+from core.lib.templates.text_search import tokenize
+
+# "# 🐍 Генераторы" - the emoticon is optional
+_TITLE_LINE = re.compile(r"#\s+(?:[^\w\s]\S*\s+)?(.+)")
+_DATE_LINE = re.compile(r"####\s+Дата создания:\s*(\d{4}-\d{2}-\d{2})")
+_TAGS_LINE = re.compile(r"-\s+Теги:\s*(.+)")
+
+# The header (title, date, tags) is at the top of the file
+HEADER_LINES = 40
+
+# BM25 parameters: term frequency saturation and length normalization
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+
+class Note(NamedTuple):
+    """One indexed note."""
+
+    path: str
+    title: str
+    suffix: str  # "_topic", "_law" or "" - the template the file was created from
+    tags: tuple[str, ...]
+    created: str | None  # ISO date from the "Дата создания" line
+    size: int
+    mtime: float
+
+
+def parse_header(path: str, text: str) -> tuple[str, tuple[str, ...], str | None]:
+    """Finds the title, tags and creation date at the top of a note.
+
+    Files not created from a template get their first heading (or the file name) as the title.
+    """
+    title = None
+    created = None
+    tags: tuple[str, ...] = ()
+    for line in text.splitlines()[:HEADER_LINES]:
+        line = line.strip()
+        if title is None and (match := _TITLE_LINE.fullmatch(line)):
+            title = match.group(1).strip()
+        elif created is None and (match := _DATE_LINE.fullmatch(line)):
+            created = match.group(1)
+        elif not tags and (match := _TAGS_LINE.fullmatch(line)):
+            tags = tuple(tag.lstrip("#") for tag in match.group(1).split() if tag.lstrip("#"))
+    if title is None:
+        title = os.path.splitext(os.path.basename(path))[0].replace("_", " ")
+    return title, tags, created
+
+
+class NoteIndex:
+    """On-disk index of the notes.
+
+    Args:
+        db_path (str): Path to the SQLite database file.
+        full_refresh_after (float, optional): Seconds after which `refresh` checks every note again,
+            not only the changed directories. Defaults to 600.
+        suffixes (Iterable[str] | None, optional): The file name endings of the templates, e.g. "_topic".
+            A note whose name ends otherwise has no suffix. Defaults to the suffixes of all the template definitions.
+    """
+
+    DEFAULT_SETTINGS: dict[str, Any] = {
+        "index_file": os.path.join("Storage", "Index", "notes.db"),
+        "full_refresh_after": 600,
+    }
+    # Increase when the tables change: the old index is dropped and built again
+    SCHEMA_VERSION = 3
+    # Sorting of the pages: the key -> ORDER BY
+    SORT_ORDERS = {
+        "name": "casefold(name), path",
+        "mtime": "mtime DESC, path",
+        "size": "size DESC, path",
+    }
+
+    def __init__(
+        self, db_path: str, *, full_refresh_after: float = 600, suffixes: Iterable[str] | None = None
+    ) -> None:
+        self.db_path = db_path
+        self.full_refresh_after = full_refresh_after
+        self.suffixes = set(template_suffixes() if suffixes is None else suffixes) - {""}
+        # Only the known endings: "async_await.md" is a note without a template, not an "_await" one.
+        # The longest first, so that "_my_topic" wins over "_topic"
+        alternatives = "|".join(map(re.escape, sorted(self.suffixes, key=len, reverse=True)))
+        self.__suffix = re.compile(f"({alternatives})\\.md$") if alternatives else None
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.__db = sqlite3.connect(db_path)
+        # SQLite lower() only knows ASCII, the filter has to work for Russian too
+        self.__db.create_function("casefold", 1, str.casefold, deterministic=True)
+        self.__create_tables()
+        self.__update_suffixes()
+
+    @classmethod
+    def from_config(cls) -> "NoteIndex":
+        """Creates the index using the "notes" section of config.json."""
+        pm = PathManager.shared()
+        settings = {**cls.DEFAULT_SETTINGS, **pm.get_settings("notes")}
+        db_path = settings["index_file"]
+        if not os.path.isabs(db_path):
+            db_path = os.path.join(pm.base_path, db_path)
+        return cls(db_path, full_refresh_after=float(settings["full_refresh_after"]))
+
+    def __create_tables(self) -> None:
+        """Creates the database schema if it does not exist yet."""
+        (version,) = self.__db.execute("PRAGMA user_version").fetchone()
+        if version != self.SCHEMA_VERSION:
+            # The index is only a cache of the files, it is simply built again
+            self.__db.executescript(
+                """
+                DROP TABLE IF EXISTS notes;
+                DROP TABLE IF EXISTS note_tags;
+                DROP TABLE IF EXISTS postings;
+                DROP TABLE IF EXISTS note_dirs;
+                DROP TABLE IF EXISTS meta;
+                """
+            )
+            self.__db.execute(f"PRAGMA user_version = {self.SCHEMA_VERSION}")
+        self.__db.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS notes (
+                path TEXT PRIMARY KEY, dir TEXT, name TEXT, suffix TEXT, title TEXT,
+                tags TEXT, created TEXT, size INTEGER, mtime REAL, mtime_ns INTEGER,
+                length INTEGER
+            );
+            -- The same tags, one per row, for searching by tag
+            CREATE TABLE IF NOT EXISTS note_tags (path TEXT, tag TEXT);
+            -- The inverted index: how many times the term occurs in the note
+            CREATE TABLE IF NOT EXISTS postings (term TEXT, path TEXT, tf INTEGER);
+            -- The scanned directories: a directory with the same mtime is not listed again
+            CREATE TABLE IF NOT EXISTS note_dirs (path TEXT PRIMARY KEY, parent TEXT, mtime_ns INTEGER);
+            CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+            CREATE INDEX IF NOT EXISTS notes_dir ON notes (dir);
+            CREATE INDEX IF NOT EXISTS note_tags_path ON note_tags (path);
+            CREATE INDEX IF NOT EXISTS note_tags_tag ON note_tags (tag);
+            CREATE INDEX IF NOT EXISTS postings_term ON postings (term);
+            CREATE INDEX IF NOT EXISTS postings_path ON postings (path);
+            CREATE INDEX IF NOT EXISTS note_dirs_parent ON note_dirs (parent);
+            """
+        )
+
+    def __update_suffixes(self) -> None:
+        """Finds the suffixes of the indexed notes again if the set of the templates has changed"""
+        known = " ".join(sorted(self.suffixes))
+        if self.__get_meta("suffixes") == known:
+            return
+        with self.__db:
+            rows = self.__db.execute("SELECT path, name FROM notes").fetchall()
+            self.__db.executemany(
+                "UPDATE notes SET suffix = ? WHERE path = ?", ((self.suffix_of(name), path) for path, name in rows)
+            )
+            self.__set_meta("suffixes", known)
+
+    def suffix_of(self, name: str) -> str:
+        """The suffix of the template the file was created from, "" if it is not one of `suffixes`."""
+        match = self.__suffix.search(name) if self.__suffix else None
+        return match.group(1) if match else ""
+
+    @staticmethod
+    def __range(directory: str) -> tuple[str, str]:
+        """The bounds of the paths under the directory, for a range query."""
+        prefix = directory.rstrip(os.sep) + os.sep
+        return prefix, prefix + "\U0010ffff"
+
+    def refresh(self, roots: Iterable[str] | None = None, *, full: bool | None = None) -> tuple[int, int]:
+        """Brings the notes under the roots up to date.
+
+        Like `FileIndex.refresh`, a directory whose mtime did not change is not
+        listed again: its notes are kept and its subdirectories are taken from
+        the index, so a refresh costs one stat per directory. A note edited in
+        place does not change the mtime of its directory, so every
+        `full_refresh_after` seconds all the notes are checked.
+
+        Args:
+            roots (Iterable[str] | None, optional): The directories to scan. Defaults to all `PathManager.paths`.
+            full (bool | None, optional): Check every note, not only the changed directories.
+                Defaults to None - only when the last full check of the root is too old.
+
+        Returns:
+            tuple[int, int]: The number of (re)parsed and removed notes.
+        """
+        if roots is None:
+            roots = PathManager.shared().paths.values()
+        parsed = removed = 0
+        with self.__db:
+            for root in roots:
+                root = os.path.abspath(root)
+                full_check = self.__full_check_due(root) if full is None else full
+                stack = [root]
+                while stack:
+                    directory = stack.pop()
+                    known_mtime, known_subdirs = self.__known_dir(directory)
+                    try:
+                        mtime_ns = os.stat(directory).st_mtime_ns
+                    except OSError:  # Deleted, or the root does not exist yet
+                        removed += self.__forget(directory)
+                        continue
+                    if mtime_ns == known_mtime and not full_check:
+                        stack.extend(known_subdirs)
+                        continue
+                    dir_parsed, dir_removed, subdirs = self.__update_dir(directory, mtime_ns, known_subdirs)
+                    parsed += dir_parsed
+                    removed += dir_removed
+                    stack.extend(subdirs)
+                if full_check:
+                    self.__set_meta(f"full_check:{root}", time.time())
+        return parsed, removed
+
+    def __full_check_due(self, root: str) -> bool:
+        checked = self.__get_meta(f"full_check:{root}")
+        return checked is None or time.time() - float(checked) > self.full_refresh_after
+
+    def __known_dir(self, path: str) -> tuple[int | None, list[str]]:
+        """Returns the stored mtime and subdirectories of the directory."""
+        row = self.__db.execute("SELECT mtime_ns FROM note_dirs WHERE path = ?", (path,)).fetchone()
+        if row is None:
+            return None, []
+        children = [
+            child for (child,) in self.__db.execute("SELECT path FROM note_dirs WHERE parent = ?", (path,))
+        ]
+        return row[0], children
+
+    def __update_dir(self, directory: str, mtime_ns: int, known_subdirs: list[str]) -> tuple[int, int, list[str]]:
+        """Lists the directory and brings its own notes up to date.
+
+        Returns:
+            tuple[int, int, list[str]]: The number of (re)parsed and removed notes and the subdirectories.
+        """
+        known = {
+            path: (note_mtime, size)
+            for path, note_mtime, size in self.__db.execute(
+                "SELECT path, mtime_ns, size FROM notes WHERE dir = ?", (directory,)
+            )
+        }
+        parsed = removed = 0
+        seen: set[str] = set()
+        subdirs: list[str] = []
+        try:
+            with os.scandir(directory) as it:
+                for entry in it:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            subdirs.append(entry.path)
+                        elif entry.name.endswith(".md") and entry.is_file(follow_symlinks=False):
+                            st = entry.stat(follow_symlinks=False)
+                            seen.add(entry.path)
+                            if known.get(entry.path) != (st.st_mtime_ns, st.st_size):
+                                if self.__store(entry.path, st):
+                                    parsed += 1
+                    except OSError:  # Deleted during the listing
+                        continue
+        except OSError:
+            return parsed, removed + self.__forget(directory), []
+
+        for path in known.keys() - seen:
+            self.__remove(path)
+            removed += 1
+        for subdir in set(known_subdirs) - set(subdirs):
+            removed += self.__forget(subdir)
+        self.__db.execute(
+            "INSERT OR REPLACE INTO note_dirs (path, parent, mtime_ns) VALUES (?, ?, ?)",
+            (directory, os.path.dirname(directory), mtime_ns),
+        )
+        return parsed, removed, subdirs
+
+    def __forget(self, directory: str) -> int:
+        """Removes the directory and everything under it from the index. Returns the number of removed notes."""
+        lower, upper = self.__range(directory)
+        paths = [
+            path for (path,) in self.__db.execute(
+                "SELECT path FROM notes WHERE path >= ? AND path < ?", (lower, upper)
+            )
+        ]
+        for path in paths:
+            self.__remove(path)
+        self.__db.execute(
+            "DELETE FROM note_dirs WHERE path = ? OR (path >= ? AND path < ?)", (directory, lower, upper)
+        )
+        return len(paths)
+
+    def __get_meta(self, key: str) -> str | None:
+        row = self.__db.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def __set_meta(self, key: str, value: Any) -> None:
+        self.__db.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, str(value)))
+
+    def __store(self, path: str, st: os.stat_result) -> bool:
+        """Parses the note and replaces its rows. False if it cannot be read."""
+        try:
+            with open(path, "r", encoding="utf-8", errors="replace") as f:
+                text = f.read()
+        except OSError:
+            return False
+        title, tags, created = parse_header(path, text)
+        terms = Counter(tokenize(text))
+        name = os.path.basename(path)
+        tags = tuple(sorted({tag.casefold() for tag in tags}))
+        self.__remove(path)
+        self.__db.execute(
+            "INSERT INTO notes (path, dir, name, suffix, title, tags, created, size, mtime, mtime_ns, length)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                path, os.path.dirname(path), name, self.suffix_of(name),
+                title, " ".join(tags), created, st.st_size, st.st_mtime, st.st_mtime_ns,
+                sum(terms.values()),
+            ),
+        )
+        self.__db.executemany(
+            "INSERT INTO note_tags (path, tag) VALUES (?, ?)", ((path, tag) for tag in tags)
+        )
+        self.__db.executemany(
+            "INSERT INTO postings (term, path, tf) VALUES (?, ?, ?)",
+            ((term, path, tf) for term, tf in terms.items()),
+        )
+        return True
+
+    def __remove(self, path: str) -> None:
+        self.__db.execute("DELETE FROM notes WHERE path = ?", (path,))
+        self.__db.execute("DELETE FROM note_tags WHERE path = ?", (path,))
+        self.__db.execute("DELETE FROM postings WHERE path = ?", (path,))
+
+    def notes(self, directory: str, suffix: str | None = None) -> list[Note]:
+        """Returns the indexed notes under the directory, sorted by path.
+
+        Args:
+            directory (str): The directory, nested folders included.
+            suffix (str | None, optional): Only the notes of one template, e.g. "_topic". Defaults to all.
+        """
+        where, parameters = self.__where(directory, suffix)
+        return self.__select(f"{where} ORDER BY path", parameters)
+
+    def count(self, directory: str, suffix: str | None = None, text_filter: str = "") -> int:
+        """Counts the notes that `page` would go through."""
+        where, parameters = self.__where(directory, suffix, text_filter)
+        return self.__db.execute(f"SELECT COUNT(*) FROM notes {where}", parameters).fetchone()[0]
+
+    def page(
+        self,
+        directory: str,
+        suffix: str | None = None,
+        *,
+        sort: str = "name",
+        text_filter: str = "",
+        offset: int = 0,
+        limit: int = 20,
+    ) -> list[Note]:
+        """Returns one page of the notes under the directory. Only this page is read from the database.
+
+        Args:
+            directory (str): The directory, nested folders included.
+            suffix (str | None, optional): Only the notes of one template, e.g. "_topic". Defaults to all.
+            sort (str, optional): "name", "mtime" (newest first) or "size" (largest first). Defaults to "name".
+            text_filter (str, optional): A part of the file name or the title, case-insensitive. Defaults to "".
+            offset (int, optional): How many notes to skip. Defaults to 0.
+            limit (int, optional): The page size. Defaults to 20.
+
+        Raises:
+            ValueError: If the sort key is unknown.
+        """
+        if sort not in self.SORT_ORDERS:
+            raise ValueError(f"Unknown sort {sort!r}, use one of: {', '.join(self.SORT_ORDERS)}")
+        where, parameters = self.__where(directory, suffix, text_filter)
+        return self.__select(
+            f"{where} ORDER BY {self.SORT_ORDERS[sort]} LIMIT ? OFFSET ?", [*parameters, limit, offset]
+        )
+
+    def __where(
+        self, directory: str, suffix: str | None = None, text_filter: str = ""
+    ) -> tuple[str, list[object]]:
+        """Builds the WHERE clause shared by the listing methods."""
+        where = "WHERE path >= ? AND path < ?"
+        parameters: list[object] = list(self.__range(os.path.abspath(directory)))
+        if suffix is not None:
+            where += " AND suffix = ?"
+            parameters.append(suffix)
+        if text_filter:
+            where += " AND (instr(casefold(name), ?) > 0 OR instr(casefold(title), ?) > 0)"
+            parameters += [text_filter.casefold()] * 2
+        return where, parameters
+
+    def __select(self, clauses: str, parameters: list[object]) -> list[Note]:
+        return [
+            Note(path, title, suffix, tuple(tags.split()), created, size, mtime)
+            for path, title, suffix, tags, created, size, mtime in self.__db.execute(
+                f"SELECT path, title, suffix, tags, created, size, mtime FROM notes {clauses}",
+                parameters,
+            )
+        ]
+
+    def search(self, query: str, limit: int = 20) -> list[tuple[Note, float]]:
+        """Full-text search over all indexed notes, ranked by BM25.
+
+        The words of the query are stemmed like the notes, so "генераторы"
+        also finds "генератор". A note needs at least one of the words.
+
+        Args:
+            query (str): The words to find.
+            limit (int, optional): The maximal number of results. Defaults to 20.
+
+        Returns:
+            list[tuple[Note, float]]: The notes with their scores, the best first.
+        """
+        terms = list(dict.fromkeys(tokenize(query)))
+        total, average = self.__db.execute("SELECT COUNT(*), AVG(length) FROM notes").fetchone()
+        if not terms or not total:
+            return []
+        average = average or 1
+
+        scores: dict[str, float] = {}
+        for term in terms:
+            postings = self.__db.execute(
+                "SELECT p.path, p.tf, n.length FROM postings p JOIN notes n ON n.path = p.path"
+                " WHERE p.term = ?",
+                (term,),
+            ).fetchall()
+            if not postings:
+                continue
+            idf = math.log(1 + (total - len(postings) + 0.5) / (len(postings) + 0.5))
+            for path, tf, length in postings:
+                norm = BM25_K1 * (1 - BM25_B + BM25_B * length / average)
+                scores[path] = scores.get(path, 0.0) + idf * tf * (BM25_K1 + 1) / (tf + norm)
+
+        best = sorted(scores.items(), key=lambda item: item[1], reverse=True)[:limit]
+        notes = {note.path: note for note in self.__notes_by_path([path for path, _ in best])}
+        return [(notes[path], score) for path, score in best if path in notes]
+
+    def tag_counts(self) -> list[tuple[str, int]]:
+        """All tags with the number of their notes, the most used first."""
+        return self.__db.execute(
+            "SELECT tag, COUNT(*) FROM note_tags GROUP BY tag ORDER BY COUNT(*) DESC, tag"
+        ).fetchall()
+
+    def find_by_tags(self, query: str) -> list[Note]:
+        """Finds the notes by a boolean tag query, e.g. "#python AND #async NOT #draft".
+
+        Every tag is one indexed lookup, the query itself is computed with set operations.
+
+        Raises:
+            ValueError: If the query cannot be parsed (see tag_query.py).
+
+        Returns:
+            list[Note]: The notes sorted by path.
+        """
+        expr = parse_tag_query(query)
+        cache: dict[str, set[str]] = {}
+
+        def notes_with_tag(tag: str) -> set[str]:
+            if tag not in cache:
+                cache[tag] = {
+                    path for (path,) in self.__db.execute("SELECT path FROM note_tags WHERE tag = ?", (tag,))
+                }
+            return cache[tag]
+
+        def all_notes() -> set[str]:
+            return {path for (path,) in self.__db.execute("SELECT path FROM notes")}
+
+        paths = evaluate(expr, notes_with_tag, all_notes)
+        return sorted(self.__notes_by_path(list(paths)))
+
+    def __notes_by_path(self, paths: list[str]) -> list[Note]:
+        """Loads the notes with one query per 500 paths."""
+        notes: list[Note] = []
+        for start in range(0, len(paths), 500):
+            chunk = paths[start:start + 500]
+            marks = ", ".join("?" * len(chunk))
+            notes.extend(self.__select(f"WHERE path IN ({marks})", chunk))
+        return notes
+
+    def close(self) -> None:
+        """Closes the database."""
+        self.__db.close()
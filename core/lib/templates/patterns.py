@@ -5,19 +5,87 @@ It contains basic template classes, the text of which will be inserted into a fi
 
 import os
 from datetime import date
+from typing import Iterable, Iterator, TextIO
 from core.lib.prompts.prompts_system import Prompts
+from core.lib.templates.definitions import load_plan
+from core.utilits.atomic_write import FsyncBatch, atomic_write
+
+
+class Section:
+    """A `## title` block of a note with a list of items.
+
+    The items are kept as they are and turned into text only when the note is written,
+    so a section can be filled in any order and grow to any size.
+    """
+
+    __slots__ = ("title", "items")
+
+    def __init__(self, title: str, items: Iterable[str] = ()) -> None:
+        self.title = title
+        self.items = list(items)
+
+    def add(self, *items: str) -> "Section":
+        """Appends items to the end of the section"""
+        self.items.extend(items)
+        return self
+
+    def extend(self, items: Iterable[str]) -> "Section":
+        """Appends all the items of an iterable (a generator of glossary lines, for example)"""
+        self.items.extend(items)
+        return self
+
+    def fragments(self) -> Iterator[str]:
+        """The pieces of the text of the section, in order"""
+        yield f"## {self.title}\n\n"
+        for item in self.items:
+            yield f"- {item}\n"
+        yield "\n"
+
+
+class CodeSection(Section):
+    """A `## title` block of a note with a block of code"""
+
+    __slots__ = ("language",)
+
+    def __init__(self, title: str, code: str = "", language: str = "python") -> None:
+        super().__init__(title, [code] if code else ())
+        self.language = language
+
+    def fragments(self) -> Iterator[str]:
+        # python so that .md knows that the code is in this language
+        yield f"## {self.title}\n\n```{self.language}\n"
+        for index, chunk in enumerate(self.items):
+            if index:
+                yield "\n"
+            yield chunk
+        yield "\n```\n\n"
 
 
 class TemplateMd:
+    # The end of the file name before ".md", tells the notes of different templates apart.
+    # Empty - look_item shows all the notes of the directory.
+    FILE_SUFFIX = ""
+    # The name of the definition in configs/templates that gives the sections, the default title and emoticon.
+    # None - the template is described only by `structure`.
+    TEMPLATE: str | None = None
+
     def __init__(
         self,
         *,
-        title: str = "Название титульника",
+        title: str | None = None,
         tags: list[str] | None = None,
-        emoticon: str = "📝",
+        emoticon: str | None = None,
         suffix: str = "",
+        fields: dict[str, str | None] | None = None,
     ) -> None:
 
+        self.__plan = load_plan(self.TEMPLATE) if self.TEMPLATE else None
+        if title is None:
+            title = self.__plan.title if self.__plan else "Название титульника"
+        if emoticon is None:
+            emoticon = self.__plan.emoticon if self.__plan else "📝"
+        self.__fields = fields or {}
+
         self.__title = title  # It is possible to check for "valid" characters, but I did not do this.
         self.__tags = tags or []
         self.__emoticon = emoticon
@@ -27,7 +95,9 @@ class TemplateMd:
         self.__path_to_file = ""
         self.__dir_path: str | None = None
 
-        self.__content = ""
+        # The header lines and the sections in the order they appear in the file.
+        # The text is assembled only once: in `write` or `get_content`.
+        self.__parts: list[str | Section] = []
         self.structure()
 
     def structure(self) -> None:
@@ -44,28 +114,60 @@ class TemplateMd:
         ```
 
         This method is a container.
+        If the class has `TEMPLATE`, the sections come from its definition
+        (configs/templates/<TEMPLATE>.json), and this method is needed only
+        for what the data cannot describe.
         """
         # The title of the topic with a smiley face and the date of creation
-        self.__content += f"# {self.__emoticon} {self.__title}\n\n"
-        self.__content += f"#### Дата создания: {self.__date}\n\n"
+        self.__parts.append(f"# {self.__emoticon} {self.__title}\n\n")
+        self.__parts.append(f"#### Дата создания: {self.__date}\n\n")
 
         if self.__tags:
             self.add_section(
                 "🏷️ Теги", [f"Теги: #{' #'.join(sorted(set(self.__tags)))}"]
             )
+        # The sections of the definition, if the template has one
+        if self.__plan:
+            self.__plan.render(self, self.__fields)
+
+    def add_section(self, title: str, items: Iterable[str] = ()) -> Section:
+        """Adds a section with a list of items.
 
-    def add_section(self, title: str, items: list[str]) -> None:
-        """Adds a section with a list of items"""
-        self.__content += f"## {title}\n\n"  # Title page of the section
-        for item in items:  # If there is a list with "subsections"
-            # Then we put "-", a space and the name of the item from the list
-            self.__content += f"- {item}\n"
-        self.__content += "\n"  # Adding an empty line at the end
+        Returns:
+            Section: The added section, more items can be added to it later.
+        """
+        section = Section(title, items)
+        self.__parts.append(section)
+        return section
 
-    def add_code_section(self, title: str, code: str) -> None:
+    def add_code_section(self, title: str, code: str, language: str = "python") -> CodeSection:
         """Adds a section with a block of code"""
-        self.__content += f"## {title}\n\n"
-        self.__content += f"```python\n{code}\n```\n\n"  # Making a block with the code; python so that .md knows that the code is in this language
+        section = CodeSection(title, code, language)
+        self.__parts.append(section)
+        return section
+
+    def get_section(self, title: str) -> Section | None:
+        """Finds a section by its title, for example to add items after `super().structure()`"""
+        for part in self.__parts:
+            if isinstance(part, Section) and part.title == title:
+                return part
+        return None
+
+    def fragments(self) -> Iterator[str]:
+        """The pieces of the text of the note, in order"""
+        for part in self.__parts:
+            if isinstance(part, Section):
+                yield from part.fragments()
+            else:
+                yield part
+
+    def write(self, f: TextIO) -> None:
+        """Streams the note to an open text file without building the whole text in memory"""
+        f.writelines(self.fragments())
+
+    def get_content(self) -> str:
+        """The whole text of the note"""
+        return "".join(self.fragments())
 
     def __path(self, path: str | None = None) -> None:
         """Creates paths"""
@@ -98,11 +200,12 @@ class TemplateMd:
             self.__path_to_file = os.path.join(path, self.get_file_name())
             self.__dir_path = path
 
-    def __save(self, path: str) -> None:
-        """Writes it to a file"""
-        with open(path, "w", encoding="utf-8") as f:
-            f.write(self.__content)
-        print(Prompts.file_saved, os.path.abspath(path))
+    def __save(self, path: str, quiet: bool = False, batch: FsyncBatch | None = None) -> None:
+        """Writes it to a file. The old file is replaced only after the new one is fully written."""
+        with atomic_write(path, batch=batch) as f:
+            self.write(f)
+        if not quiet:
+            print(Prompts.file_saved, os.path.abspath(path))
 
     def get_available_files(
         self, directory: str | None = None, end: str = ".md"
@@ -147,160 +250,90 @@ class TemplateMd:
             return str(self.__file_name)
         return f"{self.__file_name}.md"
 
-    def start(self, path: str | None = None) -> None:
-        """Launch"""
+    def prepare(self, path: str | None = None) -> str:
+        """Works out the file path (and creates its directories) without writing the file.
+
+        Returns:
+            str: The path the file will be saved to.
+        """
+        self.__path(path)
+        return self.get_path()
+
+    def start(self, path: str | None = None, quiet: bool = False, batch: FsyncBatch | None = None) -> None:
+        """Launch
+
+        With `batch` the file appears only when the batch is committed (see atomic_write.py).
+        """
         self.__path(path)
         # After the whole procedure, we save
-        self.__save(self.get_path())
+        self.__save(self.get_path(), quiet, batch)
 
 
 class Topic(TemplateMd):
     """Creates a template for programming topics (python)"""
 
+    TEMPLATE = "topic"
+    FILE_SUFFIX = "_topic"
+
     def __init__(
         self,
-        title: str = "Название темы",
-        emoticon: str = "🐍",
+        title: str | None = None,
+        emoticon: str | None = None,
         tags: list[str] | None = None,
     ) -> None:
-        super().__init__(title=title, emoticon=emoticon, suffix="_topic", tags=tags)
-
-    def get_available_files(
-        self, directory: str | None = None, end: str = "_topic.md"
-    ) -> list[str]:
-        return super().get_available_files(directory, end)
-
-    def structure(self) -> None:
-        super().structure()
-        self.add_section(
-            "😸 Общее представление",
-            [
-                "Что это?",
-                "Для чего используется?",
-                "Где применяется?",
-                "Почему нужно знать?",
-            ],
-        )
-
-        self.add_section(
-            "😺 Понятия и термины", ["Термин 1 — определение", "Термин 2 — определение"]
-        )
-
-        # A block for adding code according to a template
-        self.add_code_section(
-            "😼 Структура & Синтаксис",
-            '# Пример кода\nwith open(\'file.txt\', "w", encoding="utf-8") as f:\n    data = f.write()',
-        )
-
-        self.add_section(
-            "😾 Примеры использования",
-            ["Простой пример", "Сложный пример", "Практический пример"],
-        )
-
-        self.add_section(
-            "🐯 Практика", ["Что стоит попробовать руками, чтобы закрепить?"]
-        )
-
-        self.add_section(
-            "😡 Подводные камни и ошибки",
-            [
-                "Что часто путается?",
-                "Где находятся частые ошибки?",
-                "Что нужно помнить?",
-            ],
-        )
-
-        self.add_section(
-            "🧐 Сравнение & аналоги", ["try/finally vs with", "генераторы vs итераторы"]
-        )
-
-        self.add_section(
-            "😶 Связанные темы",
-            ["Указать смежные темы: классы, итераторы, файловая система"],
-        )
-
-        self.add_section(
-            "🤓 Полезные ссылки и документация",
-            [
-                "Документация Python",
-                "PEP 343 — The 'with' Statement",
-                "Видео, статьи, конспекты",
-            ],
-        )
-
-        self.add_section("😤 Итоги", ["Краткое резюме", "3–5 главных выводов"])
+        super().__init__(title=title, emoticon=emoticon, suffix=self.FILE_SUFFIX, tags=tags)
 
 
 class LawTopic(TemplateMd):
     """Creates a template for topics by right with the ability to specify additional identifiers"""
 
+    TEMPLATE = "law"
+    FILE_SUFFIX = "_law"
+
     def __init__(
         self,
-        title: str = "Название темы/документа",
+        title: str | None = None,
         doc_number: str | None = None,
         year: str | None = None,
         law_type: str | None = None,
         short_name: str | None = None,
         tags: list[str] | None = None,
-        emoticon: str = "⚖️",
+        emoticon: str | None = None,
     ) -> None:
+        fields = {"doc_number": doc_number, "year": year, "law_type": law_type, "short_name": short_name}
+        super().__init__(title=title, emoticon=emoticon, suffix=self.FILE_SUFFIX, tags=tags, fields=fields)
 
-        self.__doc_number = doc_number
-        self.__year = year
-        self.__law_type = law_type
-        self.__short_name = short_name
-        super().__init__(title=title, emoticon=emoticon, suffix="_law", tags=tags)
 
-    def get_available_files(
-        self, directory: str | None = None, end: str = "_law.md"
-    ) -> list[str]:
-        return super().get_available_files(directory, end)
+class DataTemplate(TemplateMd):
+    """A template that exists only as a definition in configs/templates.
 
-    def structure(self) -> None:
-        super().structure()
-        # That's how you can do it too.
-        # Create a list right in the class and drop it into the section
-        general_info: list[str] = []
-        if self.__short_name:
-            general_info.append("Короткое название: " + self.__short_name)
-        if self.__doc_number:
-            general_info.append("Номер документа: " + self.__doc_number)
-        if self.__year:
-            general_info.append("Год принятия: " + self.__year)
-        if self.__law_type:
-            general_info.append("Область права: " + self.__law_type)
-
-        self.add_section("😸 Общая информация", general_info)
-
-        self.add_section(
-            "😺 Понятия и термины", ["Термин 1 — определение", "Термин 2 — определение"]
-        )
-
-        self.add_section(
-            "📃Структура документа",
-            [
-                "Основные статьи и разделы",
-                "Ключевые нормы и положения",
-                "Примечания и ссылки на смежные статьи/акты",
-            ],
-        )
-
-        self.add_section(
-            "😾 Примеры",
-            [
-                "Пример из практики",
-                "Применение нормы на реальном примере",
-            ],
-        )
-
-        self.add_section(
-            "🔍 Практический анализ",
-            ["Разбор спорных моментов", "Комментарии и выводы"],
-        )
-
-        self.add_section(
-            "😡 Подводные камни и ошибки",
-            ["Частые ошибки при толковании", "Особенности применения нормы"],
-        )
-
-        self.add_section("😤 Итоги", ["Краткое резюме документа", "Главные выводы"])
+    Do not use it directly, get the class of a template with `template_class(name)`.
+    """
+
+    def __init__(
+        self,
+        title: str | None = None,
+        tags: list[str] | None = None,
+        emoticon: str | None = None,
+        **fields: str | None,
+    ) -> None:
+        super().__init__(title=title, tags=tags, emoticon=emoticon, suffix=self.FILE_SUFFIX, fields=fields)
+
+
+# name -> the class made by template_class
+_data_templates: dict[str, type[DataTemplate]] = {}
+
+
+def template_class(name: str) -> type[TemplateMd]:
+    """Returns the class of a template described only as data (for example "book" or "recipe").
+
+    Raises:
+        ValueError: If there is no such template or its definition is invalid.
+    """
+    plan = load_plan(name)
+    cls = _data_templates.get(name)
+    if cls is None or cls.FILE_SUFFIX != plan.suffix:
+        class_name = "".join(part.capitalize() for part in name.split("_")) + "Template"
+        cls = type(class_name, (DataTemplate,), {"TEMPLATE": name, "FILE_SUFFIX": plan.suffix, "__doc__": plan.description})
+        _data_templates[name] = cls
+    return cls
@@ -0,0 +1,112 @@
+"""
+A module containing the boolean queries over the tags of the notes.
+
+    #python                     the notes with the tag
+    #python AND #async          both tags (AND may be omitted: "#python #async")
+    #python OR #rust            any of the tags
+    #python NOT #draft          the first tag without the second
+    (#python OR #rust) #async   parentheses group the terms
+
+NOT binds tighter than AND, AND tighter than OR. The "#" is optional,
+tags are compared case-insensitively.
+"""
+
+import re
+from typing import Callable, TypeAlias, Union
+
+# ("tag", name) | ("not", expr) | ("and", left, right) | ("or", left, right)
+TagExpr: TypeAlias = tuple[Union[str, "TagExpr"], ...]
+
+_TOKEN = re.compile(r"\(|\)|[^\s()]+")
+_KEYWORDS = ("AND", "OR", "NOT")
+
+
+def parse_tag_query(text: str) -> TagExpr:
+    """Compiles the query into an expression tree.
+
+    Raises:
+        ValueError: If the query is empty or the parentheses do not match.
+    """
+    tokens = _TOKEN.findall(text)
+    if not tokens:
+        raise ValueError("The tag query is empty")
+    position = 0
+
+    def peek() -> str | None:
+        return tokens[position] if position < len(tokens) else None
+
+    def take() -> str:
+        nonlocal position
+        position += 1
+        return tokens[position - 1]
+
+    def parse_or() -> TagExpr:
+        left = parse_and()
+        while (peek() or "").upper() == "OR":
+            take()
+            left = ("or", left, parse_and())
+        return left
+
+    def parse_and() -> TagExpr:
+        left = parse_not()
+        while True:
+            token = peek()
+            if token is None or token == ")" or token.upper() == "OR":
+                return left
+            if token.upper() == "AND":
+                take()
+            left = ("and", left, parse_not())
+
+    def parse_not() -> TagExpr:
+        token = peek()
+        if token is None:
+            raise ValueError(f"The tag query ends unexpectedly: {text!r}")
+        if token.upper() == "NOT":
+            take()
+            return ("not", parse_not())
+        if token == "(":
+            take()
+            expr = parse_or()
+            if peek() != ")":
+                raise ValueError(f"Missing ')' in the tag query: {text!r}")
+            take()
+            return expr
+        if token == ")" or token.upper() in _KEYWORDS:
+            raise ValueError(f"Unexpected {token!r} in the tag query: {text!r}")
+        tag = take().lstrip("#").casefold()
+        if not tag:
+            raise ValueError(f"Empty tag in the tag query: {text!r}")
+        return ("tag", tag)
+
+    expr = parse_or()
+    if peek() is not None:
+        raise ValueError(f"Unexpected {peek()!r} in the tag query: {text!r}")
+    return expr
+
+
+def evaluate(
+    expr: TagExpr,
+    notes_with_tag: Callable[[str], set[str]],
+    all_notes: Callable[[], set[str]],
+) -> set[str]:
+    """Computes the set of notes matching the expression.
+
+    Args:
+        expr (TagExpr): The compiled query.
+        notes_with_tag (Callable[[str], set[str]]): Returns the paths of the notes with the tag.
+        all_notes (Callable[[], set[str]]): Returns the paths of all notes, needed only for NOT.
+    """
+    kind = expr[0]
+    if kind == "tag":
+        return notes_with_tag(expr[1])
+    if kind == "not":
+        return all_notes() - evaluate(expr[1], notes_with_tag, all_notes)
+    left = evaluate(expr[1], notes_with_tag, all_notes)
+    if kind == "and":
+        if not left:  # Nothing to intersect with
+            return left
+        right = expr[2]
+        if right[0] == "not":  # "A NOT B" is a difference, all the notes are not needed
+            return left - evaluate(right[1], notes_with_tag, all_notes)
+        return left & evaluate(right, notes_with_tag, all_notes)
+    return left | evaluate(expr[2], notes_with_tag, all_notes)
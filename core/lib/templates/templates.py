@@ -1,13 +1,18 @@
 """
 A module containing basic methods for working with templates.
 """
-from typing import Any, TypeVar
+from typing import TYPE_CHECKING, Any, TypeVar
 
 from rich.text import Text
 from core.lib.path_manager import PathManager
 from core.lib.templates.patterns import *
 from core.lib.helper.helpers import Helper
-from core.lib.prompts.prompts_system import Prompts, main_color, support_color
+from core.lib.prompts import prompts_system as ps
+from core.lib.prompts.prompts_system import Prompts
+
+if TYPE_CHECKING:
+    from core.lib.templates.bulk import BulkResult
+    from core.lib.templates.note_index import Note, NoteIndex
 
 # For the annotation
 TemplateClass = TypeVar("TemplateClass", bound="TemplateMd")
@@ -19,18 +24,31 @@ class TemplatesHandler():
 
     These methods are present in the CLI class.
     """
+
+    PAGE_SIZE = 20  # Notes per page in look_item
     def __init__(self) -> None:
-        __pm = PathManager()
+        __pm = PathManager.shared()
         self.menu_path = __pm.get_menu_path()
         self.config_path = __pm.get_config_path()
         self.actions_path = __pm.get_actions_path()
         self.color_path = __pm.get_color_path()
-        self.__paths = __pm.paths
+        self.__pm = __pm
+
+        self.__notes: "NoteIndex | None" = None
 
         self.hp = Helper()
         # Output colored text
         self.console = self.hp.console
 
+    @property
+    def notes(self) -> "NoteIndex":
+        """The index of the created notes. Opened when it is used for the first time."""
+        if self.__notes is None:
+            from core.lib.templates.note_index import NoteIndex
+
+            self.__notes = NoteIndex.from_config()
+        return self.__notes
+
     def create_item(self, *, cls: type[TemplateClass], title_prompt: Text | str, path_key: str, extra_arguments: list[tuple[str, Text]] | None = None) -> None:
         """The method that creates the template
 
@@ -53,32 +71,183 @@ class TemplatesHandler():
                 value = self.console.input(Prompts.arrows).strip() or None
                 extra_args[field_name] = value
         
-        # Creating an object
-        item: TemplateClass = cls(title=title, tags=tags, **extra_args)
         # Default path and save
         self.console.print(Prompts.save, Prompts.file_name, Prompts.save_path, Prompts.enter, Prompts.default)
-        item.set_default_path(self.__paths[path_key])
         path_name = self.console.input(Prompts.arrows) or None
-        item.start(path_name)
-        file_path = item.get_path()
+        file_path = self.build_item(cls=cls, path_key=path_key, title=title, tags=tags, path=path_name, **extra_args)
         self.console.print("\nОткрыть файл сейчас (y/n)?")
         if self.console.input(Prompts.arrows).strip().lower() == "y":
             self.hp.support_open_app(file_path)
 
+    def build_item(self, *, cls: type[TemplateClass], path_key: str, title: str, tags: list[str] | None = None, path: str | None = None, **extra_args: Any) -> str:
+        """Creates the template without asking the user anything.
+
+        Args:
+            cls (type[TemplateClass]): The template class (from patterns.py )
+            path_key (str): The key used to search for the default path in the `config.json` file.
+            title (str): The title of the template.
+            tags (list[str] | None, optional): List of tags. Defaults to None.
+            path (str | None, optional): A directory or a .md file. Defaults to the path from `config.json`.
+
+        Returns:
+            str: The path of the created file.
+        """
+        item: TemplateClass = cls(title=title, tags=tags, **extra_args)
+        if path is None:
+            item.set_default_path(self.__pm.paths[path_key])
+        item.start(path)
+        return item.get_path()
+
+    def create_from_manifest(self, manifest: str, *, default_type: str = "topic", workers: int | None = None, overwrite: bool = False) -> list["BulkResult"]:
+        """Creates all the notes of a CSV, JSON or JSONL manifest without asking anything.
+
+        Args:
+            manifest (str): The path to the manifest, see `bulk.py` for the format.
+            default_type (str, optional): The template of the rows without "type". Defaults to "topic".
+            workers (int | None, optional): The number of threads writing the files. Defaults to None.
+            overwrite (bool, optional): Replace the existing notes. Defaults to False.
+
+        Returns:
+            list[BulkResult]: Saved or failed, one result per row.
+        """
+        from core.lib.templates.bulk import BulkGenerator, read_manifest
+
+        generator = BulkGenerator(self.__pm.paths, default_type=default_type, workers=workers, overwrite=overwrite)
+        return generator.generate(read_manifest(manifest))
+
     def look_item(self, *, cls: type[TemplateClass], path_key: str) -> None:
         """A method that looks through the contents in a directory with templates and outputs them to the terminal.
 
+        Nested folders are included. The list comes from the note index,
+        which re-reads only the files changed since the previous look.
+        The notes are shown page by page: only the current page is loaded,
+        it can be sorted by name, date or size and filtered by a part of the name.
+
         Args:
             cls (type[TemplateClass]): The template class (from patterns.py )
             path_key (str): The key used to search for the default path in the `config.json` file.
         """
-        item = cls() # Creating a new instance of the class.
-        directory = self.__paths[path_key]
-        md_files = item.get_available_files(directory) # The default path should also be added here.
-        if not md_files:
+        directory = self.__pm.paths[path_key]
+        suffix = cls.FILE_SUFFIX or None
+        self.notes.refresh([directory])
+        sorts = list(self.notes.SORT_ORDERS)
+        sort = sorts[0]
+        text_filter = ""
+        page = 0
+        while True:
+            total = self.notes.count(directory, suffix, text_filter)
+            if not total and not text_filter:
+                self.console.print("Файлы не найдены")
+                return
+            pages = max(1, -(-total // self.PAGE_SIZE))
+            page = min(page, pages - 1)
+            notes = self.notes.page(
+                directory, suffix, sort=sort, text_filter=text_filter,
+                offset=page * self.PAGE_SIZE, limit=self.PAGE_SIZE,
+            )
+            self.__display_page(directory, notes, page, pages, total, sort, text_filter)
+
+            choice = self.console.input(Prompts.arrows).strip().lower()
+            if choice in ("q", "0"):
+                break
+            elif choice == "n" and page + 1 < pages:
+                page += 1
+            elif choice == "p" and page > 0:
+                page -= 1
+            elif choice == "s":  # The next sorting
+                sort = sorts[(sorts.index(sort) + 1) % len(sorts)]
+                page = 0
+            elif choice == "f":
+                self.console.print(Prompts.notes_filter)
+                text_filter = self.console.input(Prompts.arrows).strip()
+                page = 0
+            elif choice.isdigit() and 1 <= int(choice) <= total:
+                # The number is shown across the pages, so any note can be opened
+                found = self.notes.page(
+                    directory, suffix, sort=sort, text_filter=text_filter, offset=int(choice) - 1, limit=1
+                )
+                self.hp.support_open_app(found[0].path)  # Open the selected file
+            else:
+                self.console.print("Неверный выбор")
+
+    def __display_page(
+        self, directory: str, notes: list["Note"], page: int, pages: int, total: int, sort: str, text_filter: str
+    ) -> None:
+        """Draws one page of the notes with a single write to the terminal."""
+        with self.console.capture() as capture:
+            header = f"\nСтраница {page + 1} из {pages}, всего {total} | сортировка: {sort}"
+            if text_filter:
+                header += f" | фильтр: {text_filter}"
+            self.console.print(Text(header, style=ps.main_color))
+            for number, note in enumerate(notes, page * self.PAGE_SIZE + 1):
+                self.console.print(
+                    Text(f"{number}. ", style=ps.support_color)
+                    + Text(os.path.relpath(note.path, directory), style=ps.main_color)
+                    + Text(f"  {note.title}")
+                )
+            self.console.print(Prompts.notes_pages)
+        self.console.file.write(capture.get())
+        self.console.file.flush()
+
+    def search_notes(self, query: str | None = None) -> None:
+        """Full-text search over the notes of all the paths from `config.json`.
+
+        Args:
+            query (str | None, optional): The words to find. Requested from the user if None.
+        """
+        if query is None:
+            self.console.print(Prompts.search_query)
+            query = self.console.input(Prompts.arrows).strip()
+        if not query:
+            return
+        self.notes.refresh()
+        found = self.notes.search(query)
+        if not found:
+            self.console.print("Файлы не найдены")
+            return
+        for number, (note, score) in enumerate(found, 1):
+            self.console.print(
+                Text(f"{number}. ", style=ps.support_color)
+                + Text(note.title, style=ps.main_color)
+                + Text(f"  {note.path}  ({score:.2f})")
+            )
+        self.__open_loop([note.path for note, _ in found])
+
+    def search_tags(self, query: str | None = None) -> None:
+        """Finds the notes of all the paths from `config.json` by their tags.
+
+        Args:
+            query (str | None, optional): A tag query, e.g. "#python AND #async NOT #draft". Requested from the user if None.
+        """
+        self.notes.refresh()
+        if query is None:
+            counts = self.notes.tag_counts()
+            if counts:
+                self.console.print(
+                    Text("  ".join(f"#{tag} ({count})" for tag, count in counts[:30]), style=ps.support_color)
+                )
+            self.console.print(Prompts.tag_query)
+            query = self.console.input(Prompts.arrows).strip()
+        if not query:
+            return
+        try:
+            found = self.notes.find_by_tags(query)
+        except ValueError as e:
+            self.console.print(str(e))
+            return
+        if not found:
             self.console.print("Файлы не найдены")
             return
-        self.__support_md_loop(md_files)
+        for number, note in enumerate(found, 1):
+            self.console.print(
+                Text(f"{number}. ", style=ps.support_color)
+                + Text(note.title, style=ps.main_color)
+                + Text(f"  {note.path}  #{' #'.join(note.tags)}")
+            )
+        self.__open_loop([note.path for note in found])
+
+    def __open_loop(self, paths: list[str]) -> None:
+        """Opens the files chosen by their numbers until the user enters '0'."""
         while True:
             self.console.print("\nВведите номер файла для открытия или '0' для выхода:")
             choice = self.console.input(Prompts.arrows).strip()
@@ -91,9 +260,8 @@ class TemplatesHandler():
                 continue
 
             choice = int(choice)
-            if 1 <= choice <= len(md_files):
-                filepath = os.path.join(directory, md_files[choice - 1])
-                self.hp.support_open_app(filepath)  # Open the selected file
+            if 1 <= choice <= len(paths):
+                self.hp.support_open_app(paths[choice - 1])  # Open the selected file
             else:
                 self.console.print("Неверный выбор")
 
@@ -116,8 +284,3 @@ class TemplatesHandler():
             tags.append(tag)
         
         return tags or None
-    
-    def __support_md_loop(self, md_files: list[str]) -> None:
-        """Colors the numbers in a loop."""
-        for item, names in enumerate(md_files, 1):
-            self.console.print(Text(f"{item}. ", style=support_color) + Text(names, style=main_color))
@@ -0,0 +1,103 @@
+"""
+A module that turns the text of the notes into search terms.
+
+Words are lowered and stemmed, so "генераторы", "генератора" and "генератор"
+become one term. Russian words go through the Snowball stemmer, Latin words
+through a light suffix stripper (English plurals, -ing, -ed, -ly).
+"""
+
+import re
+from functools import lru_cache
+
+_WORD = re.compile(r"\w+")
+_CYRILLIC = re.compile(r"[а-яё]")
+
+# Snowball (Porter) stemmer for Russian
+_PERFECTIVE_GERUND = re.compile(r"((ив|ивши|ившись|ыв|ывши|ывшись)|((?<=[ая])(в|вши|вшись)))$")
+_REFLEXIVE = re.compile(r"(с[яь])$")
+_ADJECTIVE = re.compile(
+    r"(ее|ие|ые|ое|ими|ыми|ей|ий|ый|ой|ем|им|ым|ом|его|ого|ему|ому|их|ых|ую|юю|ая|яя|ою|ею)$"
+)
+_PARTICIPLE = re.compile(r"((ивш|ывш|ующ)|((?<=[ая])(ем|нн|вш|ющ|щ)))$")
+_VERB = re.compile(
+    r"((ила|ыла|ена|ейте|уйте|ите|или|ыли|ей|уй|ил|ыл|им|ым|ен|ило|ыло|ено|ят|ует|уют|ит|ыт|ены|ить|ыть|ишь|ую|ю)"
+    r"|((?<=[ая])(ла|на|ете|йте|ли|й|л|ем|н|ло|но|ет|ют|ны|ть|ешь|нно)))$"
+)
+_NOUN = re.compile(
+    r"(а|ев|ов|ие|ье|е|иями|ями|ами|еи|ии|и|ией|ей|ой|ий|й|иям|ям|ием|ем|ам|ом|о|у|ах|иях|ях|ы|ь|ию|ью|ю|ия|ья|я)$"
+)
+_RV = re.compile(r"^(.*?[аеиоуыэюя])(.*)$")
+_DERIVATIONAL = re.compile(r".*[^аеиоуыэюя]+[аеиоуыэюя].*ость?$")
+_DER = re.compile(r"ость?$")
+_SUPERLATIVE = re.compile(r"(ейше|ейш)$")
+
+# Light English stemmer: (suffix, replacement, minimal length of the word)
+_ENGLISH_RULES = (
+    ("sses", "ss", 5),
+    ("ies", "y", 5),
+    ("ing", "", 6),
+    ("ed", "", 5),
+    ("ly", "", 5),
+    ("es", "", 5),
+    ("s", "", 4),
+)
+
+
+def stem_russian(word: str) -> str:
+    """Stems a lowercase Russian word (the Snowball algorithm)."""
+    word = word.replace("ё", "е")
+    match = _RV.match(word)
+    if not match:
+        return word
+    start, rv = match.groups()
+
+    # Step 1
+    temp = _PERFECTIVE_GERUND.sub("", rv, 1)
+    if temp == rv:
+        rv = _REFLEXIVE.sub("", rv, 1)
+        temp = _ADJECTIVE.sub("", rv, 1)
+        if temp != rv:
+            rv = _PARTICIPLE.sub("", temp, 1)
+        else:
+            temp = _VERB.sub("", rv, 1)
+            rv = _NOUN.sub("", rv, 1) if temp == rv else temp
+    else:
+        rv = temp
+
+    # Step 2
+    if rv.endswith("и"):
+        rv = rv[:-1]
+    # Step 3
+    if _DERIVATIONAL.match(rv):
+        rv = _DER.sub("", rv, 1)
+    # Step 4
+    if rv.endswith("ь"):
+        rv = rv[:-1]
+    else:
+        rv = _SUPERLATIVE.sub("", rv, 1)
+        if rv.endswith("нн"):
+            rv = rv[:-1]
+    return start + rv
+
+
+def stem_english(word: str) -> str:
+    """Strips the common endings of a lowercase English word."""
+    if word.endswith("ss"):
+        return word
+    for suffix, replacement, min_length in _ENGLISH_RULES:
+        if word.endswith(suffix) and len(word) >= min_length:
+            return word[: -len(suffix)] + replacement
+    return word
+
+
+@lru_cache(maxsize=65536)
+def stem(word: str) -> str:
+    """Stems a lowercase word in Russian or English."""
+    if _CYRILLIC.search(word):
+        return stem_russian(word)
+    return stem_english(word)
+
+
+def tokenize(text: str) -> list[str]:
+    """Splits the text into stemmed terms. Words of one character are skipped."""
+    return [stem(word) for word in _WORD.findall(text.casefold()) if len(word) > 1]
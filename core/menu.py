@@ -9,6 +9,7 @@ from typing import Callable, Union, TypeAlias
 from rich.text import Text
 from rich.console import Console
 from core.lib.prompts import prompts_system as ps
+from core.utilits.fuzzy import fuzzy_score
 
 from core import loader
 
@@ -27,15 +28,183 @@ MenuStructure: TypeAlias = dict[
 #  we'll check for its existence and try to call it using () such brackets (or via .__call__() ).
 
 
+class MenuConfigError(ValueError):
+    """Raised with every problem found in menu.json and actions.json at once.
+
+    Args:
+        errors (list[str]): One message per problem.
+    """
+
+    def __init__(self, errors: list[str]) -> None:
+        self.errors = errors
+        super().__init__("\n".join(errors))
+
+
+def bind_actions(owner: object, actions_config: dict[str, str]) -> dict[str, Callable[[], None]]:
+    """Binds the names from actions.json to the methods of `owner` (the CLI).
+
+    Raises:
+        MenuConfigError: If some methods do not exist or cannot be called.
+    """
+    actions: dict[str, Callable[[], None]] = {}
+    errors: list[str] = []
+    for key, method_name in actions_config.items():
+        method = getattr(owner, method_name, None) if isinstance(method_name, str) else None
+        if method is None:
+            errors.append(f"actions.json: {key!r} -> {type(owner).__name__} has no method {method_name!r}")
+        elif not callable(method):
+            errors.append(f"actions.json: {key!r} -> {method_name!r} is not a method")
+        else:
+            actions[key] = method
+    if errors:
+        raise MenuConfigError(errors)
+    return actions
+
+
+class MenuNode:
+    """One item of the compiled menu. Read-only, build it with `MenuNode.compile`.
+
+    A submenu has `children`, an action or a stub has `action_name`
+    (and `action` if the name is bound to a function).
+    """
+
+    __slots__ = ("__title", "__parent", "__children", "__by_title", "__action_name", "__action")
+
+    def __init__(self, title: str, parent: "MenuNode | None" = None) -> None:
+        self.__title = title
+        self.__parent = parent
+        self.__children: tuple[MenuNode, ...] | None = None
+        self.__by_title: dict[str, MenuNode] = {}
+        self.__action_name: str | None = None
+        self.__action: Callable[[], None] | None = None
+
+    @classmethod
+    def compile(
+        cls,
+        title: str,
+        structure: MenuStructure,
+        actions: dict[str, Callable[[], None]],
+    ) -> "MenuNode":
+        """Turns the menu structure into a graph of nodes and checks it.
+
+        Args:
+            title (str): The name of the main menu.
+            structure (MenuStructure): The menu structure (menu.json).
+            actions (dict[str, Callable[[], None]]): The action name -> function.
+
+        Raises:
+            MenuConfigError: With all invalid items, not only the first one.
+
+        Returns:
+            MenuNode: The main menu.
+        """
+        errors: list[str] = []
+        root = cls(title)
+        if isinstance(structure, dict):
+            root.__fill(structure, actions, errors)
+        else:
+            errors.append(f"menu.json: expected an object, got {type(structure).__name__}")
+        if errors:
+            raise MenuConfigError(errors)
+        return root
+
+    def __fill(
+        self,
+        structure: MenuStructure,
+        actions: dict[str, Callable[[], None]],
+        errors: list[str],
+    ) -> None:
+        """Creates the children of the submenu."""
+        children: list[MenuNode] = []
+        for title, value in structure.items():
+            child = MenuNode(title, self)
+            if isinstance(value, dict):
+                child.__fill(value, actions, errors)
+            elif isinstance(value, str):
+                child.__action_name = value
+                child.__action = actions.get(value)  # None - a stub
+                if child.__action is not None and not callable(child.__action):
+                    errors.append(f"menu.json: {child.path}: {value!r} is not a function")
+            else:
+                errors.append(
+                    f"menu.json: {child.path}: expected a submenu or an action name, got {type(value).__name__}"
+                )
+            children.append(child)
+        self.__children = tuple(children)
+        self.__by_title = {child.title: child for child in children}
+
+    @property
+    def title(self) -> str:
+        return self.__title
+
+    @property
+    def parent(self) -> "MenuNode | None":
+        """The submenu containing the item. None for the main menu."""
+        return self.__parent
+
+    @property
+    def children(self) -> tuple["MenuNode", ...]:
+        """The items of the submenu, in the order of menu.json. Empty for an action."""
+        return self.__children or ()
+
+    @property
+    def is_submenu(self) -> bool:
+        return self.__children is not None
+
+    @property
+    def action_name(self) -> str | None:
+        return self.__action_name
+
+    @property
+    def action(self) -> Callable[[], None] | None:
+        return self.__action
+
+    @property
+    def path(self) -> str:
+        """The titles leading to the item, e.g. "Работать > Учиться". The main menu is not included."""
+        titles = []
+        node: MenuNode | None = self
+        while node is not None and node.parent is not None:
+            titles.append(node.title)
+            node = node.parent
+        return " > ".join(reversed(titles)) or self.title
+
+    def child(self, title: str) -> "MenuNode | None":
+        """Finds an item of the submenu by its title."""
+        return self.__by_title.get(title)
+
+    def leaves(self) -> list["MenuNode"]:
+        """All actions and stubs under the item, in the menu order."""
+        leaves: list[MenuNode] = []
+        stack = list(reversed(self.children))
+        while stack:
+            node = stack.pop()
+            if node.is_submenu:
+                stack.extend(reversed(node.children))
+            else:
+                leaves.append(node)
+        return leaves
+
+
 class Menu:
     """Recursive menu
 
+    Besides the numbers, "/text" searches all actions of the menu by name.
+
+    The structure is compiled into `MenuNode`s when the menu is created,
+    so a broken config is reported before anything is drawn.
+
     Args:
         title (str | None, optional): Name for the menu title.. Defaults to None.
         structure (MenuStructure | None, optional): Menu structure. Can be nested at any depth.. Defaults to None.
         actions (dict[str, Callable[[], None]] | None, optional): A dictionary containing names of functions to call. Defaults to None.
+
+    Raises:
+        MenuConfigError: If the structure is invalid.
     """
 
+    SEARCH_LIMIT = 9  # How many search results are shown
+
     def __init__(
         self,
         title: str | None = None,
@@ -48,29 +217,70 @@ class Menu:
         self.__up = UserPrompts()
 
         self.__title = title if title is not None else "Menu name"
-        self.__history_title: list[str] = [self.__title]
         self.__structure: MenuStructure = (
             structure
             if structure is not None
             else {"Point 1": {}, "Point 2": {}, "Point 3": {}}
         )
-        self.__stack = [self.__structure]  # to go back
         self.__actions: dict[str, Callable[[], None]] = actions or {}
-        # self.stack will store the "history" of the menu or items we have selected.
-        # Thanks to this thing we can "go back".
+        self.__root = MenuNode.compile(self.__title, self.__structure, self.__actions)
+        # The submenu on the screen. Its parent is where "Back" leads.
+        self.__current = self.__root
+        # Rendered menus with the ANSI codes. Valid for one width and one set of colors.
+        self.__frames: dict[MenuNode, str] = {}
+        self.__frames_key: tuple[int, int] | None = None
+        # (leaf, its title, its path with the action name), built on the first search
+        self.__search_index: list[tuple[MenuNode, str, str]] | None = None
+
+    @classmethod
+    def from_config(
+        cls,
+        title: str,
+        structure: MenuStructure,
+        owner: object,
+        actions_config: dict[str, str],
+    ) -> "Menu":
+        """Creates the menu from menu.json and actions.json.
 
-    def __container(self) -> None:
+        Args:
+            title (str): Name for the menu title.
+            structure (MenuStructure): The menu structure (menu.json).
+            owner (object): The object with the actions (the CLI).
+            actions_config (dict[str, str]): The action name -> method name (actions.json).
+
+        Raises:
+            MenuConfigError: With the problems of both files.
+        """
+        errors: list[str] = []
+        try:
+            actions = bind_actions(owner, actions_config)
+        except MenuConfigError as e:
+            errors.extend(e.errors)
+            actions = {}
+        try:
+            return cls(title, structure, actions)
+        except MenuConfigError as e:
+            errors.extend(e.errors)
+        raise MenuConfigError(errors)
+
+    def __container(
+        self,
+        on_ready: Callable[[], None] | None = None,
+        on_iteration: Callable[[], None] | None = None,
+    ) -> None:
         """Contains the main menu of the cycle"""
-        # As long as we have any items on the menu:
-        while self.__stack:
-            self.__current = self.__stack[-1]  # current menu
-            options = list(self.__current.keys())
-            self.__display_menu(self.__title, options)
+        while True:
+            if on_iteration is not None:  # For example, applies the edited configs
+                on_iteration()
+            self.__display_menu(self.__current)
+            if on_ready is not None:  # The first menu is on the screen
+                on_ready()
+                on_ready = None
 
             # take user's choice
             self.__console.print(self.__up.choise)
             choice = self.__console.input(ps.Prompts.arrows)
-            exit_flag = self.__choice_handler(options, choice)  # Returns True if "Exit"
+            exit_flag = self.__choice_handler(choice)  # Returns True if "Exit"
             if exit_flag:  # Breaking the cycle
                 break
 
@@ -87,18 +297,20 @@ class Menu:
         if choice.lower() in ("q", "b"):
             return choice.lower()
 
+        if choice.startswith("/") and choice[1:].strip():  # Search
+            return choice
+
         if not choice.isdigit():
             return None
         index = int(choice)
-        if not self.__current or not (1 <= index <= len(self.__current)):
+        if not (1 <= index <= len(self.__current.children)):
             return None
         return index
 
-    def __choice_handler(self, options: list[str], choice: str) -> bool:
+    def __choice_handler(self, choice: str) -> bool:
         """Processes user selection.
 
         Args:
-            options (list[str]): List of menu items
             choice (str): User's choice.
 
         Returns:
@@ -111,37 +323,27 @@ class Menu:
             return False  # Incorrect input, the cycle continues
 
         if index == "b":  # If the user selected "Back":
-            if (
-                len(self.__stack) > 1
-            ):  # If there are any menus left in the menu history and we haven't reached the very first, main menu.
-                self.__stack.pop()
-                self.__history_title.pop()
-                self.__title = self.__history_title[-1]
+            if self.__current.parent is not None:  # We haven't reached the very first, main menu.
+                self.__current = self.__current.parent
             else:  # We are in the main menu, continuing the cycle
                 self.__console.print(ps.PromptsMenu.main_menu)
             return False
         elif index == "q":  # Exit - return True, the loop is broken
             self.__console.print(ps.PromptsMenu.exit)
             return True
+        elif isinstance(index, str):  # "/text" - search
+            self.__search(index[1:].strip())
+            return False
         else:  # In other cases (when selecting another menu or action/stub)
-            selected = options[
-                int(index) - 1
-            ]  # We coordinate the indices so that the correct option is selected, and not +1
-            sub = self.__current[
-                selected
-            ]  # In the dictionary we find a key named selected
-            if isinstance(sub, dict):  # If there is a dictionary inside:
-                self.__stack.append(sub)  # Add a new menu to the menu history (stack).
-                self.__history_title.append(selected)
-                self.__title = selected
-            # If the key inside is a string, and the value inside is a function reference.
-            else:
-                action = self.__actions.get(sub)
-                if action:  # Perform the action
-                    action()
-                else:  # If there is neither a dictionary nor a function, but a stub
-                    # We are simply notifying that the stub is working, but the function itself has not yet been implemented.
-                    self.__console.print(f"{ps.PromptsMenu.perform_action} {selected}")
+            # We coordinate the indices so that the correct option is selected, and not +1
+            selected = self.__current.children[int(index) - 1]
+            if selected.is_submenu:  # Open the submenu
+                self.__current = selected
+            elif selected.action is not None:  # Perform the action
+                selected.action()
+            else:  # If there is neither a submenu nor a function, but a stub
+                # We are simply notifying that the stub is working, but the function itself has not yet been implemented.
+                self.__console.print(f"{ps.PromptsMenu.perform_action} {selected.title}")
             return False  # We continue the cycle
 
     def __display_title(self, title: str) -> None:
@@ -155,26 +357,144 @@ class Menu:
             f"[{ps.main_color}]{title}[/{ps.main_color}]", style=ps.second_color
         )  # Let's draw the title card
 
-    def __display_menu(self, title: str, structure: list[str]) -> None:
+    def __display_menu(self, node: MenuNode) -> None:
         """Draws the menu.
 
+        The menu is rendered once per terminal width and colors,
+        then the ready text is sent to the terminal in a single write.
+
         Args:
-            title (str): Title page name.
-            structure (list[str]): List of menu keys.
+            node (MenuNode): The submenu to draw.
+        """
+        key = (self.__console.width, ps.colors_version)
+        if key != self.__frames_key:
+            self.__frames.clear()
+            self.__frames_key = key
+        frame = self.__frames.get(node)
+        if frame is None:
+            frame = self.__frames[node] = self.__render_menu(node)
+        self.__console.file.write(frame)
+        self.__console.file.flush()
+
+    def __render_menu(self, node: MenuNode) -> str:
+        """Returns the menu as text with the ANSI codes."""
+        with self.__console.capture() as empty:
+            if not node.children:
+                self.__console.print("Menu is empty")
+        with self.__support_console.capture() as title:
+            self.__display_title(node.title)
+        with self.__console.capture() as items:
+            for number, item in enumerate(node.children, 1):
+                self.__console.print(
+                    Text(f"{number}. ", style=f"{ps.support_color}")
+                    + Text(item.title, style=ps.main_color)
+                )
+
+            self.__console.print()
+            self.__console.print(ps.PromptsMenu.back, end=" | ")
+            self.__console.print(ps.PromptsMenu.exit, end=" | ")
+            self.__console.print(ps.PromptsMenu.search)
+        return empty.get() + title.get() + items.get()
+
+    def __find(self, query: str) -> list[MenuNode]:
+        """Returns the actions matching the query, the best first."""
+        if self.__search_index is None:
+            self.__search_index = [
+                (leaf, leaf.title, f"{leaf.path} {leaf.action_name}")
+                for leaf in self.__root.leaves()
+            ]
+        scored: list[tuple[int, int, MenuNode]] = []
+        for order, (leaf, title, path) in enumerate(self.__search_index):
+            title_score = fuzzy_score(query, title)
+            path_score = fuzzy_score(query, path)
+            if title_score is None and path_score is None:
+                continue
+            # A match in the item itself is worth more than in its submenus
+            score = max(2 * title_score if title_score is not None else 0, path_score or 0)
+            scored.append((-score, order, leaf))
+        scored.sort(key=lambda item: item[:2])
+        return [leaf for _, _, leaf in scored[: self.SEARCH_LIMIT]]
+
+    def __search(self, query: str) -> None:
+        """Finds the actions by a part of their name and runs the chosen one.
+
+        A single match is run at once. The menu of the action stays on the screen afterwards.
+        """
+        found = self.__find(query)
+        if not found:
+            self.__console.print(ps.PromptsMenu.not_found)
+            return
+        selected = found[0]
+        if len(found) > 1:
+            for number, leaf in enumerate(found, 1):
+                self.__console.print(
+                    Text(f"{number}. ", style=ps.support_color)
+                    + Text(leaf.path, style=ps.main_color)
+                )
+            self.__console.print(ps.PromptsMenu.search_choice)
+            choice = self.__console.input(ps.Prompts.arrows).strip()
+            if not choice.isdigit() or not (1 <= int(choice) <= len(found)):
+                return
+            selected = found[int(choice) - 1]
+
+        self.__current = selected.parent or self.__root  # Jump to the menu of the action
+        if selected.action is not None:
+            selected.action()
+        else:
+            self.__console.print(f"{ps.PromptsMenu.perform_action} {selected.title}")
+
+    def reload(
+        self,
+        structure: MenuStructure | None = None,
+        actions: dict[str, Callable[[], None]] | None = None,
+        colors: bool = False,
+    ) -> None:
+        """Replaces the structure, the actions or the colors of the running menu.
+
+        The user stays in the same submenu if it still exists,
+        otherwise in the closest parent that does.
+
+        Args:
+            structure (MenuStructure | None, optional): The new menu structure. Defaults to None.
+            actions (dict[str, Callable[[], None]] | None, optional): The new actions. Defaults to None.
+            colors (bool, optional): Re-read colors.json. Defaults to False.
+
+        Raises:
+            MenuConfigError: If the new structure is invalid. The menu is not changed then.
+        """
+        if structure is not None or actions is not None:
+            new_structure = self.__structure if structure is None else structure
+            new_actions = self.__actions if actions is None else actions
+            root = MenuNode.compile(self.__title, new_structure, new_actions)
+
+            titles: list[str] = []
+            node: MenuNode | None = self.__current
+            while node is not None and node.parent is not None:
+                titles.append(node.title)
+                node = node.parent
+            current = root
+            for title in reversed(titles):
+                child = current.child(title)
+                if child is None or not child.is_submenu:
+                    break
+                current = child
+
+            self.__structure, self.__actions = new_structure, new_actions
+            self.__root, self.__current = root, current
+            self.__frames.clear()
+            self.__search_index = None
+        if colors:
+            ps.reload_colors(self.__up)
+
+    def start(
+        self,
+        on_ready: Callable[[], None] | None = None,
+        on_iteration: Callable[[], None] | None = None,
+    ) -> None:
+        """Launches menu
+
+        Args:
+            on_ready (Callable[[], None] | None, optional): Called once, after the first menu is drawn. Defaults to None.
+            on_iteration (Callable[[], None] | None, optional): Called before the menu is drawn again. Defaults to None.
         """
-        if not structure:
-            self.__console.print("Menu is empty")
-        self.__display_title(title)
-        for number, item in enumerate(structure, 1):
-            self.__console.print(
-                Text(f"{number}. ", style=f"{ps.support_color}")
-                + Text(item, style=ps.main_color)
-            )
-
-        self.__console.print()
-        self.__console.print(ps.PromptsMenu.back, end=" | ")
-        self.__console.print(ps.PromptsMenu.exit)
-
-    def start(self) -> None:
-        """Launches menu"""
-        self.__container()
+        self.__container(on_ready, on_iteration)
@@ -0,0 +1,310 @@
+"""
+A module containing the atomic file writes.
+
+    with atomic_write("Storage/Law/закон_law.md") as f:
+        f.write(text)
+
+The data goes to a temporary file in the same directory, which is flushed,
+fsynced and then renamed over the target with `os.replace`. A crash or
+Ctrl+C in the middle leaves the old file as it was: the target is either
+the old file or the complete new one, never a truncated one.
+
+Writing many files, pass an `FsyncBatch`: the files are only flushed when they
+are written. When the batch ends their data is synced with one syncfs(2) per
+filesystem (one fsync per file where there is no syncfs), the files are renamed
+into place together and every directory is fsynced once.
+"""
+
+import os
+import sys
+import threading
+from contextlib import contextmanager
+from typing import IO, Any, Callable, Iterator
+
+_TEMP_SUFFIX = ".tmp"
+
+
+class AtomicFile:
+    """A temporary file that replaces `path` on `commit`.
+
+    Use `atomic_write` unless the file has to stay open across calls (the findler writers).
+
+    Args:
+        path (str): The target file. Its directory is created if needed.
+        mode (str, optional): "w" or "wb". Defaults to "w".
+        batch (FsyncBatch | None, optional): Postpone the fsync and the rename to the end of the batch.
+        **open_args: encoding, errors and newline for text files. Encoding defaults to UTF-8.
+    """
+
+    def __init__(self, path: str, mode: str = "w", batch: "FsyncBatch | None" = None, **open_args: Any) -> None:
+        if mode not in ("w", "wb"):
+            raise ValueError(f"AtomicFile supports only the 'w' and 'wb' modes, got {mode!r}")
+        if mode == "w":
+            open_args.setdefault("encoding", "utf-8")
+        self.path = os.path.abspath(path)
+        self.__batch = batch
+        directory = os.path.dirname(self.path)
+        os.makedirs(directory, exist_ok=True)
+
+        self.temp_path, fd = _create_temp(self.path)
+        try:
+            self.file: IO[Any] = os.fdopen(fd, mode, **open_args)
+        except BaseException:
+            os.close(fd)
+            os.unlink(self.temp_path)
+            raise
+        self.__done = False
+
+    def commit(self) -> None:
+        """Makes the written data the content of the target file."""
+        if self.__done:
+            return
+        self.__done = True
+        try:
+            self.file.flush()
+            if self.__batch is None:  # The batch syncs all its files at once
+                os.fsync(self.file.fileno())
+            self.file.close()
+            _copy_mode(self.path, self.temp_path)
+        except BaseException:
+            self.__remove_temp()
+            raise
+        if self.__batch is not None:
+            self.__batch.add(self.temp_path, self.path)
+            return
+        try:
+            os.replace(self.temp_path, self.path)
+        except BaseException:
+            self.__remove_temp()
+            raise
+        fsync_directory(os.path.dirname(self.path))
+
+    def discard(self) -> None:
+        """Throws the written data away, the target file stays as it was."""
+        if self.__done:
+            return
+        self.__done = True
+        self.__remove_temp()
+
+    def __remove_temp(self) -> None:
+        try:
+            self.file.close()
+        finally:
+            try:
+                os.unlink(self.temp_path)
+            except FileNotFoundError:
+                pass
+
+
+@contextmanager
+def atomic_write(path: str, mode: str = "w", *, batch: "FsyncBatch | None" = None, **open_args: Any) -> Iterator[IO[Any]]:
+    """Opens a file whose new content appears only if the `with` block succeeds.
+
+    Args:
+        path (str): The target file.
+        mode (str, optional): "w" or "wb". Defaults to "w".
+        batch (FsyncBatch | None, optional): Postpone the fsync and the rename to the end of the batch.
+        **open_args: encoding, errors and newline for text files. Encoding defaults to UTF-8.
+    """
+    target = AtomicFile(path, mode, batch, **open_args)
+    try:
+        yield target.file
+    except BaseException:
+        target.discard()
+        raise
+    target.commit()
+
+
+class BatchCommitError(OSError):
+    """Some files of a batch could not be put into place, the others were.
+
+    Attributes:
+        replaced (list[str]): The targets that now have the new content.
+        failed (dict[str, OSError]): The targets left as they were, with the reason.
+    """
+
+    def __init__(self, replaced: list[str], failed: dict[str, OSError]) -> None:
+        first = next(iter(failed.values()))
+        super().__init__(f"{len(failed)} of {len(replaced) + len(failed)} files were not saved: {first}")
+        self.replaced = replaced
+        self.failed = failed
+
+
+class FsyncBatch:
+    """Collects the atomic writes of many files and puts them into place at once.
+
+    The files appear when the batch is committed: their data is synced with one
+    syncfs per filesystem (Linux; elsewhere one fsync per file), then they are
+    renamed into place and every directory is fsynced once. If the `with` block
+    fails, the files of the batch are discarded. Thread-safe.
+    """
+
+    def __init__(self) -> None:
+        self.__lock = threading.Lock()
+        self.__pending: list[tuple[str, str]] = []  # (temporary file, target)
+
+    def __enter__(self) -> "FsyncBatch":
+        return self
+
+    def __exit__(self, exc_type: type[BaseException] | None, *exc: object) -> None:
+        if exc_type is None:
+            self.commit()
+        else:
+            self.discard()
+
+    def add(self, temp_path: str, path: str) -> None:
+        """Registers a written and closed temporary file that will replace `path`."""
+        with self.__lock:
+            self.__pending.append((temp_path, path))
+
+    def commit(self) -> list[str]:
+        """Puts all the files of the batch into place.
+
+        A file that cannot be synced or renamed does not stop the others.
+
+        Returns:
+            list[str]: The target files, in the order they were added.
+
+        Raises:
+            BatchCommitError: If some files were not put into place. It tells which ones were.
+        """
+        with self.__lock:
+            pending, self.__pending = self.__pending, []
+        replaced: list[str] = []
+        failed: dict[str, OSError] = {}
+        directories: set[str] = set()
+        # The data must be on the disk before a rename makes it the content of the target
+        unsynced = _sync_files([temp_path for temp_path, _ in pending])
+        for temp_path, path in pending:
+            if temp_path in unsynced:
+                failed[path] = unsynced[temp_path]
+                _remove(temp_path)
+                continue
+            try:
+                os.replace(temp_path, path)
+            except OSError as e:
+                failed[path] = e
+                _remove(temp_path)
+                continue
+            replaced.append(path)
+            directories.add(os.path.dirname(path))
+        for directory in directories:
+            fsync_directory(directory)
+        if failed:
+            raise BatchCommitError(replaced, failed)
+        return replaced
+
+    def discard(self) -> None:
+        """Removes the temporary files of the batch, the targets stay as they were."""
+        with self.__lock:
+            pending, self.__pending = self.__pending, []
+        for temp_path, _ in pending:
+            _remove(temp_path)
+
+
+def fsync_directory(directory: str) -> None:
+    """Makes a rename in the directory durable. Does nothing where directories cannot be opened (Windows)."""
+    try:
+        fd = os.open(directory or ".", os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def _sync_files(paths: list[str]) -> dict[str, OSError]:
+    """Writes the data of the files to the disk.
+
+    Returns:
+        dict[str, OSError]: The files that could not be synced, with the reason.
+    """
+    failed: dict[str, OSError] = {}
+    syncfs = _get_syncfs()
+    if syncfs is None:
+        for path in paths:
+            try:
+                fd = os.open(path, os.O_RDWR | getattr(os, "O_BINARY", 0))
+                try:
+                    os.fsync(fd)
+                finally:
+                    os.close(fd)
+            except OSError as e:
+                failed[path] = e
+        return failed
+    # st_dev of a file -> the files on that filesystem
+    filesystems: dict[int, list[str]] = {}
+    for path in paths:
+        try:
+            filesystems.setdefault(os.stat(path).st_dev, []).append(path)
+        except OSError as e:
+            failed[path] = e
+    for files in filesystems.values():
+        try:
+            fd = os.open(files[0], os.O_RDONLY)
+            try:
+                syncfs(fd)
+            finally:
+                os.close(fd)
+        except OSError as e:
+            failed.update(dict.fromkeys(files, e))
+    return failed
+
+
+_syncfs: Callable[[int], None] | None = None
+_syncfs_loaded = False
+
+
+def _get_syncfs() -> Callable[[int], None] | None:
+    """syncfs(2) of Linux: it flushes one filesystem, while os.sync flushes all of them. None elsewhere."""
+    global _syncfs, _syncfs_loaded
+    if _syncfs_loaded:
+        return _syncfs
+    _syncfs_loaded = True
+    if not sys.platform.startswith("linux"):
+        return None
+    import ctypes  # Only needed on Linux, so it is not imported at startup
+
+    try:
+        function = ctypes.CDLL(None, use_errno=True).syncfs
+    except (OSError, AttributeError):
+        return None
+    function.argtypes = [ctypes.c_int]
+
+    def syncfs(fd: int) -> None:
+        if function(fd) != 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno))
+
+    _syncfs = syncfs
+    return _syncfs
+
+
+def _create_temp(path: str) -> tuple[str, int]:
+    """Creates a new hidden file next to `path`. The mode follows the umask, unlike tempfile.mkstemp."""
+    directory, name = os.path.split(path)
+    flags = os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_BINARY", 0)
+    while True:
+        temp_path = os.path.join(directory, f".{name}.{os.urandom(4).hex()}{_TEMP_SUFFIX}")
+        try:
+            return temp_path, os.open(temp_path, flags, 0o666)
+        except FileExistsError:
+            continue
+
+
+def _copy_mode(source: str, destination: str) -> None:
+    """Keeps the permissions of the file being replaced"""
+    try:
+        os.chmod(destination, os.stat(source).st_mode & 0o7777)
+    except OSError:
+        pass
+
+
+def _remove(path: str) -> None:
+    try:
+        os.unlink(path)
+    except OSError:
+        pass
@@ -3,9 +3,11 @@
 Allows you to clear the terminal.
 """
 
-import os
 import sys
 
+# Erase the screen and the scrollback, then move the cursor to the top-left corner.
+CLEAR_SCREEN = "\033[2J\033[3J\033[H"
+
 
 def check_os() -> str:
     """Check user's OS
@@ -22,10 +24,14 @@ def check_os() -> str:
     return ""
 
 def clean() -> None:
-    """Clears the terminal of unnecessary text."""
-    clear_command = check_os()
-    if clear_command:
-        os.system(clear_command)
+    """Clears the terminal of unnecessary text.
+
+    Writes an ANSI escape sequence instead of starting a `clear`/`cls` process.
+    On Windows the sequences work after `install()` has enabled them.
+    """
+    if check_os():
+        sys.stdout.write(CLEAR_SCREEN)
+        sys.stdout.flush()
     else:
         print(
             "The full functionality of the program is supported only on: Linux, macOS, Windows."
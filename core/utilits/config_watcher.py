@@ -0,0 +1,42 @@
+"""
+A module that notices when the config files are edited.
+
+The menu asks the watcher between its iterations, so an edit made through
+"Настройки" applies without restarting the program.
+"""
+
+import os
+
+
+class ConfigWatcher:
+    """Polls the modification time and size of the files.
+
+    One `os.stat` per file and call, which is nothing next to waiting for the
+    user's input, so no inotify (not in the standard library) is needed.
+
+    Args:
+        paths (dict[str, str]): A name -> file path. The names are returned by `changed`.
+    """
+
+    def __init__(self, paths: dict[str, str]) -> None:
+        self.paths = dict(paths)
+        self.__stamps = {name: self.__stamp(path) for name, path in self.paths.items()}
+
+    @staticmethod
+    def __stamp(path: str) -> tuple[int, int] | None:
+        """The mtime and size of the file. None if it does not exist."""
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    def changed(self) -> set[str]:
+        """Returns the names of the files changed since the previous call."""
+        changed: set[str] = set()
+        for name, path in self.paths.items():
+            stamp = self.__stamp(path)
+            if stamp != self.__stamps[name]:
+                self.__stamps[name] = stamp
+                changed.add(name)
+        return changed
@@ -0,0 +1,46 @@
+"""
+A module containing a small fuzzy matcher.
+
+Used by the menu search: "/тема" finds "Создать тему", "/нсткцв" finds "Настройки цветов".
+"""
+
+
+def fuzzy_score(query: str, text: str) -> int | None:
+    """Scores how well `query` matches `text`. Case-insensitive.
+
+    A substring always scores higher than scattered letters. Letters that
+    follow each other or start a word are preferred, gaps are penalized.
+
+    Args:
+        query (str): What the user typed.
+        text (str): Where to search.
+
+    Returns:
+        int | None: The higher the better. None if the letters of `query` are not in `text` in the same order.
+    """
+    query = query.casefold()
+    text = text.casefold()
+    if not query:
+        return 0
+
+    position = text.find(query)
+    if position != -1:
+        word_start = position == 0 or not text[position - 1].isalnum()
+        return 100 * len(query) + (100 if word_start else 0) - min(position, 50)
+
+    score = 0
+    start = 0
+    previous = -2
+    for char in query:
+        index = text.find(char, start)
+        if index == -1:
+            return None
+        score += 10
+        if index == previous + 1:  # The letters follow each other
+            score += 15
+        if index == 0 or not text[index - 1].isalnum():  # The start of a word
+            score += 20
+        score -= index - start  # The gap since the previous letter
+        previous = index
+        start = index + 1
+    return score
@@ -3,11 +3,12 @@
 A module that installs colorama for Windows.
 """
 import sys
-import ctypes
 
 
 def ansi_code_fixer() -> None:
     """Allows displaying ANSI sequences using Windows API system resources."""
+    import ctypes  # Only needed on Windows, so it is not imported at startup
+
     # Загружаем библиотеку kernel32.dll (Windows API)
     kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)  
 
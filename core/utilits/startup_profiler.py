@@ -0,0 +1,55 @@
+"""
+A module that measures how long the program takes to show the first menu.
+
+Enabled with `python __main__.py --profile-startup`.
+"""
+
+import sys
+import time
+from contextlib import contextmanager
+from typing import Iterator
+
+# Time-to-first-menu we aim for, in milliseconds.
+STARTUP_BUDGET_MS = 100.0
+
+
+class StartupProfiler:
+    """Collects the duration of the named startup phases.
+
+    Args:
+        enabled (bool, optional): When False, `phase` only runs the code. Defaults to False.
+        start (float | None, optional): `time.perf_counter()` at the very beginning. Defaults to now.
+    """
+
+    def __init__(self, enabled: bool = False, start: float | None = None) -> None:
+        self.enabled = enabled
+        self.__start = time.perf_counter() if start is None else start
+        self.__phases: list[tuple[str, float]] = []
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Measures the code inside the `with` block."""
+        if not self.enabled:
+            yield
+            return
+        begin = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.__phases.append((name, time.perf_counter() - begin))
+
+    def report(self) -> None:
+        """Prints the phases, the total time and the budget."""
+        if not self.enabled:
+            return
+        total = (time.perf_counter() - self.__start) * 1000
+        width = max((len(name) for name, _ in self.__phases), default=0)
+        lines = ["Startup profile:"]
+        for name, seconds in self.__phases:
+            lines.append(f"  {name:<{width}}  {seconds * 1000:8.2f} ms")
+        verdict = "OK" if total <= STARTUP_BUDGET_MS else "over budget"
+        lines.append(f"  {'total':<{width}}  {total:8.2f} ms  ({verdict}, budget {STARTUP_BUDGET_MS:.0f} ms)")
+        # Without the interpreter start, which happens before any of our code runs.
+        lines.append("  (Python interpreter start-up is not included)")
+        sys.stdout.write("\n".join(lines) + "\n")
+        sys.stdout.flush()
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# The tests import the project as `core...` and `user...`, like __main__.py does
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,69 @@
+"""The journal of a markdown dictionary keeps the changes until they are saved or declined."""
+
+import os
+from io import StringIO
+
+from rich.console import Console
+
+from core.lib import dictionary as dictionary_module
+from core.lib.dictionary import Dictionary, Word
+
+
+class AnsweringConsole(Console):
+    """A console that answers every question with the same text"""
+
+    def __init__(self, answer: str) -> None:
+        super().__init__(file=StringIO())
+        self.answer = answer
+
+    def input(self, *args: object, **kwargs: object) -> str:
+        return self.answer
+
+
+def open_dictionary(path: str) -> Dictionary:
+    dictionary = Dictionary()
+    dictionary.console = Console(file=StringIO())
+    dictionary.open(path)
+    return dictionary
+
+
+def make_dictionary(path: str) -> None:
+    dictionary = open_dictionary(path)
+    word = Word("кошка")
+    word.translations["en"] = "cat"
+    dictionary.add_word(word)
+    dictionary.save()
+    dictionary.close()
+
+
+def test_edit_survives_reopen_without_save(tmp_path) -> None:
+    path = str(tmp_path / "dictionary.md")
+    make_dictionary(path)
+    dictionary = open_dictionary(path)
+    dictionary.edit_word("кошка", translation=("en", "kitty"))
+    dictionary.close()
+
+    assert open_dictionary(path).words["кошка"].translations["en"] == "kitty"
+
+
+def test_declined_save_drops_the_edit(tmp_path) -> None:
+    path = str(tmp_path / "dictionary.md")
+    make_dictionary(path)
+    dictionary = open_dictionary(path)
+    dictionary.edit_word("кошка", translation=("en", "kitty"))
+
+    dictionary_module.exit(AnsweringConsole("н"), dictionary)
+
+    assert not os.path.exists(path + ".journal")
+    assert open_dictionary(path).words["кошка"].translations["en"] == "cat"
+
+
+def test_accepted_save_keeps_the_edit(tmp_path) -> None:
+    path = str(tmp_path / "dictionary.md")
+    make_dictionary(path)
+    dictionary = open_dictionary(path)
+    dictionary.edit_word("кошка", translation=("en", "kitty"))
+
+    dictionary_module.exit(AnsweringConsole("д"), dictionary)
+
+    assert open_dictionary(path).words["кошка"].translations["en"] == "kitty"
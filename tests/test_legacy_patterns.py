@@ -0,0 +1,51 @@
+"""The legacy classes of core/lib/patterns.py write the same notes as before the templates became data."""
+
+import os
+from datetime import date
+
+import pytest
+
+from core.lib import patterns
+
+# The notes written by the classes of core/lib/patterns.py before they were replaced with definitions
+BASELINE_DIR = os.path.join(os.path.dirname(__file__), "data", "legacy_templates")
+# The only intended change: the code blocks are tagged with their own language instead of python
+LANGUAGES = {"HTMLTopic": "html", "CssTopic": "css", "JsTopic": "javascript"}
+
+
+def baseline(name: str, language: str | None = None) -> str:
+    with open(os.path.join(BASELINE_DIR, f"{name}.md"), "r", encoding="utf-8", newline="") as f:
+        text = f.read().replace("{date}", str(date.today()))
+    if language:
+        text = text.replace("```python\n", f"```{language}\n")
+    return text
+
+
+@pytest.mark.parametrize("name", [name for name in patterns.__all__ if name != "TemplateMd"])
+def test_default_note_matches_baseline(name: str) -> None:
+    note = getattr(patterns, name)()
+    assert note.get_content() == baseline(name, LANGUAGES.get(name))
+
+
+def test_book_arguments_match_baseline() -> None:
+    note = patterns.BookTemplate("Война и мир", "Толстой", tags=["книги", "классика"])
+    assert note.get_content() == baseline("BookTemplate_arguments")
+    assert note.get_file_name() == "война_и_мир_book.md"
+
+
+def test_legacy_classes_are_real_classes() -> None:
+    note = patterns.BookTemplate()
+    assert isinstance(note, patterns.BookTemplate)
+    assert isinstance(note, patterns.TemplateMd)
+
+
+def test_legacy_subclass_adds_sections() -> None:
+    class Review(patterns.BookTemplate):
+        def _structure(self) -> None:
+            super()._structure()
+            self._add_section("⭐ Оценка", ["Из 10:"])
+
+    content = Review("Книга").get_content()
+    assert content.startswith("# 📚 Книга\n")
+    assert "## 👤 Автор\n\n- Автор\n" in content
+    assert content.endswith("## ⭐ Оценка\n\n- Из 10:\n\n")
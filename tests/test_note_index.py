@@ -0,0 +1,47 @@
+"""The note index tells the notes of the templates apart by the ending of the file name."""
+
+import os
+
+from core.lib.templates.note_index import NoteIndex
+
+
+def write(path: str, title: str) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(f"# 🐍 {title}\n\n#### Дата создания: 2024-01-01\n\n")
+
+
+def suffixes(index: NoteIndex, directory: str) -> dict[str, str]:
+    return {os.path.basename(note.path): note.suffix for note in index.notes(directory)}
+
+
+def test_underscore_name_without_template_has_no_suffix(tmp_path) -> None:
+    notes = str(tmp_path / "notes")
+    os.makedirs(notes)
+    write(os.path.join(notes, "async_await.md"), "async await")
+    write(os.path.join(notes, "генераторы_topic.md"), "Генераторы")
+    write(os.path.join(notes, "конституция_law.md"), "Конституция")
+    index = NoteIndex(str(tmp_path / "notes.db"))
+    index.refresh([notes])
+
+    assert suffixes(index, notes) == {
+        "async_await.md": "",
+        "генераторы_topic.md": "_topic",
+        "конституция_law.md": "_law",
+    }
+    assert [os.path.basename(note.path) for note in index.notes(notes, "_topic")] == ["генераторы_topic.md"]
+    index.close()
+
+
+def test_suffixes_follow_the_templates(tmp_path) -> None:
+    notes = str(tmp_path / "notes")
+    os.makedirs(notes)
+    write(os.path.join(notes, "async_await.md"), "async await")
+    db_path = str(tmp_path / "notes.db")
+    index = NoteIndex(db_path, suffixes=["_topic"])
+    index.refresh([notes])
+    index.close()
+
+    # A new template with this ending: the indexed note is not parsed again, only its suffix changes
+    index = NoteIndex(db_path, suffixes=["_topic", "_await"])
+    assert suffixes(index, notes) == {"async_await.md": "_await"}
+    index.close()
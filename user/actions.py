@@ -1,6 +1,10 @@
 from core.lib.actions import CLI
+from core.lib.templates.bulk import register_template
 from user.patterns import *
 
+# "type: library" in the manifests of create-bulk
+register_template("library", Library, "lib")
+
 
 class MyCLI(CLI):
     def __init__(self) -> None: